@@ -0,0 +1,366 @@
+"""
+批量图像反向搜索命令行工具
+
+扫描目录或读取文件列表，以全局并发上限和分引擎速率限制调用各搜索引擎，
+每个(图像, 引擎)的结构化结果作为一行JSON追加写入输出文件。
+输出文件同时作为进度记录：重新运行时按图像内容的SHA-256跳过已成功搜索过的组合，
+中断后直接以相同参数重新运行即可继续；失败的结果不计入进度，会在下次运行时重试。
+
+用法:
+    python -m ImgRevSearcher ./archive -e saucenao,tineye -o results.jsonl
+    python -m ImgRevSearcher --list files.txt -e google --rate google=10/60 -c 4
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional, TextIO
+from .model import ENGINE_MAP, BaseSearchModel
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".avif", ".heic"}
+# 生产者每次在线程中从路径迭代器取出的路径数量，目录扫描与文件列表读取不阻塞事件循环
+SCAN_BATCH = 64
+
+
+class RateLimiter:
+    """
+    按固定间隔放行请求的速率限制器，per秒内最多放行rate次
+    """
+
+    def __init__(self, rate: int, per: float):
+        """
+        初始化速率限制器
+
+        参数:
+            rate: 时间窗口内允许的请求数
+            per: 时间窗口(秒)
+        """
+        self.interval: float = per / max(1, rate)
+        self._next: float = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        等待直到允许发出下一次请求
+        """
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def parse_rate(value: str) -> tuple[str, int, float]:
+    """
+    解析engine=N/秒数格式的速率限制参数
+
+    参数:
+        value: 参数值，如saucenao=4/30
+
+    返回:
+        tuple[str, int, float]: 引擎名、请求数与时间窗口(秒)
+
+    异常:
+        argparse.ArgumentTypeError: 格式错误时抛出
+    """
+    try:
+        engine, spec = value.split("=", 1)
+        rate, per = spec.split("/", 1)
+        return engine.strip().lower(), int(rate), float(per)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"速率限制格式应为 engine=N/秒数: {value}") from None
+
+
+def iter_images(paths: list[str], list_file: Optional[str], recursive: bool = True) -> Iterator[Path]:
+    """
+    按输入顺序列出所有待搜索的图像文件
+
+    参数:
+        paths: 文件或目录
+        list_file: 每行一个路径的文件列表，"-"表示标准输入
+        recursive: 是否递归扫描子目录
+
+    返回:
+        Iterator[Path]: 图像路径
+    """
+    for path in map(Path, paths):
+        if path.is_dir():
+            pattern = path.rglob("*") if recursive else path.glob("*")
+            for child in sorted(pattern):
+                if child.is_file() and child.suffix.lower() in IMAGE_SUFFIXES:
+                    yield child
+        elif path.is_file():
+            yield path
+        else:
+            print(f"跳过不存在的路径: {path}", file=sys.stderr)
+    if list_file:
+        stream = sys.stdin if list_file == "-" else open(list_file, encoding="utf-8")
+        with stream:
+            for line in stream:
+                if line.strip():
+                    yield Path(line.strip())
+
+
+def load_done(output: Path) -> set[tuple[str, str]]:
+    """
+    从已有的输出文件读取已成功完成的(SHA-256, 引擎)组合，忽略中断时写了一半的行
+
+    参数:
+        output: 输出文件
+
+    返回:
+        set[tuple[str, str]]: 已完成的组合
+    """
+    done: set[tuple[str, str]] = set()
+    if not output.exists():
+        return done
+    with output.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if not row.get("result", {}).get("error"):
+                done.add((row["sha256"], row["engine"]))
+    return done
+
+
+def _terminate_partial_line(output: Path) -> None:
+    """
+    中断时最后一行可能只写了一半，追加换行使其与新结果分隔
+
+    参数:
+        output: 输出文件
+    """
+    if not output.exists() or output.stat().st_size == 0:
+        return
+    with output.open("rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+class BatchRunner:
+    """
+    批量搜索调度器
+
+    读取图像的生产者与搜索任务之间使用有界队列，内存中只保留少量待搜索的图像；
+    全局并发上限由消费者数量决定，分引擎速率限制在每次搜索前等待
+    """
+
+    def __init__(self, model: BaseSearchModel, engines: list[str], output: TextIO,
+                 done: set[tuple[str, str]], concurrency: int = 4,
+                 rates: Optional[dict[str, RateLimiter]] = None, record_limit: Optional[int] = None):
+        """
+        初始化调度器
+
+        参数:
+            model: 搜索模型
+            engines: 要使用的引擎
+            output: 输出文件(追加模式)
+            done: 已完成的(SHA-256, 引擎)组合
+            concurrency: 全局最大并发搜索数
+            rates: 引擎名到速率限制器的映射
+            record_limit: 每次搜索最多输出的结果数量
+        """
+        self.model = model
+        self.engines = engines
+        self.output = output
+        self.done = done
+        self.concurrency = max(1, concurrency)
+        self.rates = rates or {}
+        self.record_limit = record_limit
+        self.stats: dict[str, int] = {"images": 0, "searched": 0, "failed": 0, "skipped": 0, "duplicates": 0}
+        self._seen: set[str] = set()
+        self._started = time.monotonic()
+
+    async def _jobs(self, images: Iterator[Path]) -> AsyncIterator[tuple[Path, str, bytes, str]]:
+        """
+        读取图像并按引擎展开为搜索任务，跳过已完成的组合与内容重复的图像
+
+        路径迭代器按批在线程中推进，扫描大目录时不阻塞事件循环
+
+        参数:
+            images: 图像路径
+
+        返回:
+            AsyncIterator[tuple[Path, str, bytes, str]]: (路径, SHA-256, 图像数据, 引擎)
+        """
+        while batch := await asyncio.to_thread(lambda: list(itertools.islice(images, SCAN_BATCH))):
+            for path in batch:
+                try:
+                    data = await asyncio.to_thread(path.read_bytes)
+                except OSError as e:
+                    print(f"读取失败: {path} {e}", file=sys.stderr)
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                self.stats["images"] += 1
+                if digest in self._seen:
+                    self.stats["duplicates"] += 1
+                    continue
+                self._seen.add(digest)
+                for engine in self.engines:
+                    if (digest, engine) in self.done:
+                        self.stats["skipped"] += 1
+                    else:
+                        yield path, digest, data, engine
+
+    async def _produce(self, images: Iterator[Path], queue: asyncio.Queue) -> None:
+        async for job in self._jobs(images):
+            await queue.put(job)
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        while (job := await queue.get()) is not None:
+            path, digest, data, engine = job
+            limiter = self.rates.get(engine)
+            if limiter:
+                await limiter.acquire()
+            result = await self.model.search_records(engine, file=data, record_limit=self.record_limit)
+            self._write({"path": str(path), "sha256": digest, "engine": engine, "result": result.to_dict()})
+            self.stats["failed" if result.error else "searched"] += 1
+            if not result.error:
+                self.done.add((digest, engine))
+            total = self.stats["searched"] + self.stats["failed"]
+            if total % 50 == 0:
+                self._report()
+
+    def _write(self, row: dict[str, Any]) -> None:
+        """
+        写入一行结果并立即刷新，保证中断时已完成的结果不会丢失
+        """
+        self.output.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.output.flush()
+
+    def _report(self) -> None:
+        elapsed = time.monotonic() - self._started
+        stats = " ".join(f"{k}={v}" for k, v in self.stats.items())
+        print(f"[{elapsed:.0f}s] {stats}", file=sys.stderr)
+
+    async def run(self, images: Iterator[Path]) -> dict[str, int]:
+        """
+        执行批量搜索
+
+        生产者与消费者并行运行，任一任务异常时取消其余任务并重新抛出该异常，
+        避免消费者全部退出后生产者在队列满时永久阻塞
+
+        参数:
+            images: 图像路径
+
+        返回:
+            dict[str, int]: 统计信息
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        tasks = [asyncio.create_task(self._produce(images, queue))]
+        tasks.extend(asyncio.create_task(self._consume(queue)) for _ in range(self.concurrency))
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if error := task.exception():
+                    raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._report()
+        return self.stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m ImgRevSearcher", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="*", help="图像文件或目录")
+    parser.add_argument("--list", dest="list_file", help="每行一个图像路径的文件，- 表示标准输入")
+    parser.add_argument("-e", "--engines", required=True,
+                        help=f"逗号分隔的引擎列表，可选: {', '.join(ENGINE_MAP)}")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="输出的JSONL文件，同时用作断点续跑的进度记录")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="全局最大并发搜索数")
+    parser.add_argument("--rate", action="append", type=parse_rate, default=[],
+                        help="分引擎速率限制，格式 engine=N/秒数，可重复指定，如 saucenao=4/30")
+    parser.add_argument("--limit", type=int, default=None, help="每次搜索最多输出的结果数量，0表示全部")
+    parser.add_argument("--config", help="JSON配置文件，格式与插件配置相同(proxies、default_params、default_cookies等)")
+    parser.add_argument("--no-recursive", action="store_true", help="不扫描子目录")
+    return parser
+
+
+def create_model(config_path: Optional[str]) -> BaseSearchModel:
+    """
+    按插件格式的配置文件创建搜索模型
+
+    参数:
+        config_path: 配置文件路径，为空时使用默认配置
+
+    返回:
+        BaseSearchModel: 搜索模型
+    """
+    config: dict[str, Any] = {}
+    if config_path:
+        with open(config_path, encoding="utf-8") as f:
+            config = json.load(f)
+    return BaseSearchModel(
+        proxies=config.get("proxies", ""),
+        timeout=60,
+        default_params=config.get("default_params", {}),
+        default_cookies=config.get("default_cookies", {}),
+        auto_google_config=config.get("auto_google_cookie", {}),
+        timeout_config=config.get("timeout", {}),
+        url_passthrough=config.get("url_passthrough", {}),
+        shared_backend=config.get("shared_backend", {}),
+        image_normalize=config.get("image_normalize", {}),
+        image_budget=config.get("image_budget", {}),
+        proxy_routing=config.get("proxy_routing", {}),
+        dns_cache=config.get("dns_cache", {}),
+        http2=config.get("http2", {}),
+    )
+
+
+async def run(args: argparse.Namespace) -> dict[str, int]:
+    """
+    按命令行参数执行批量搜索
+
+    参数:
+        args: 解析后的命令行参数
+
+    返回:
+        dict[str, int]: 统计信息
+    """
+    engines = [e.strip().lower() for e in args.engines.split(",") if e.strip()]
+    unknown = [e for e in engines if e not in ENGINE_MAP]
+    if unknown:
+        raise SystemExit(f"不支持的引擎: {', '.join(unknown)}，支持的引擎: {', '.join(ENGINE_MAP)}")
+    output = Path(args.output)
+    done = load_done(output)
+    _terminate_partial_line(output)
+    if done:
+        print(f"已有 {len(done)} 条完成记录，将跳过对应的图像与引擎", file=sys.stderr)
+    rates = {engine: RateLimiter(rate, per) for engine, rate, per in args.rate}
+    model = create_model(args.config)
+    images = iter_images(args.paths, args.list_file, recursive=not args.no_recursive)
+    try:
+        with output.open("a", encoding="utf-8") as f:
+            runner = BatchRunner(model, engines, f, done, args.concurrency, rates, args.limit)
+            return await runner.run(images)
+    finally:
+        await model.close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    命令行入口
+    """
+    args = build_parser().parse_args(argv)
+    if not args.paths and not args.list_file:
+        build_parser().error("请提供图像文件、目录或 --list")
+    try:
+        # 中断时asyncio.run取消run()，批量任务随之取消，输出文件在退出前关闭
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("已中断，重新运行相同命令即可继续", file=sys.stderr)
+        sys.exit(130)
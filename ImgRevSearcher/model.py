@@ -1,10 +1,27 @@
-import io
+import functools
+import hashlib
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Union
+from urllib.parse import urlsplit
+from httpx import ConnectError, ConnectTimeout, HTTPStatusError, ProxyError
 from PIL import Image, ImageDraw, ImageFont
 from .utils import Network
+from .utils.network import close_pooled_transports, http2_available
+from .utils.proxy_router import ProxyRouter, mask_proxy
+from .utils.dns_cache import DNSCache
+from .utils.ext_tools import is_public_url
+from .utils.image_budget import ImageBudget
+from .utils.image_normalizer import ImageNormalizer
+from .utils.response_parser.base_parser import BaseSearchResponse
+from .utils.result_pages import RenderedPage, encode_page, paginate_lines
+from .utils.result_record import SearchResult, format_lines
+from .utils.saucenao_key_pool import LONG_WINDOW, SauceNAOKeyPool
+from .utils.shared_backend import create_backend
+from .utils.thumbnail_fetcher import ThumbnailFetcher
+from .utils.timeout_policy import TimeoutPolicy
 from .utils.types import FileContent
 from .utils.api_request import AnimeTrace, BaiDu, Bing, Copyseeker, EHentai, GoogleLens, SauceNAO, Tineye
+from .utils.api_request.copyseeker_req import CopyseekerSession
 import time
 import asyncio
 
@@ -20,36 +37,183 @@ ENGINE_MAP = {
     "tineye": Tineye,
 }
 
+# 可以直接接收图像URL、由引擎服务端自行拉取图像的引擎
+URL_SEARCH_ENGINES = {"animetrace", "bing", "copyseeker", "google", "saucenao", "tineye"}
+
+# 共享后端中的键
+GOOGLE_COOKIE_KEY = "imgrev:cookie:google"
+GOOGLE_COOKIE_LOCK = "imgrev:lock:google_cookie"
+GOOGLE_COOKIE_LOCK_TTL = 90
+SAUCENAO_QUOTA_KEY = "imgrev:saucenao:{}"
+RESULT_CACHE_KEY = "imgrev:result:{}:{}"
+
+FONT_PATH = Path(__file__).parent / "resource/font/arialuni.ttf"
+
+DEFAULT_RESULT_CARD = {
+    "enabled": False,
+    "top_n": 6,
+    "columns": 3,
+    "thumbnail_size": 160,
+    "deadline": 3.0,
+    "per_host": 2,
+    "cache_size": 256,
+}
+
+DEFAULT_IMAGE_NORMALIZE = {
+    "max_side": 4096,
+    "quality": 90,
+    "cache_size": 32,
+}
+
+DEFAULT_RESULT_PAGES = {
+    "page_height": 2400,
+    "text_format": "png",
+    "palette_colors": 32,
+    "jpeg_quality": 85,
+}
+
+DEFAULT_PROXY_ROUTING = {
+    "routes": {},
+    "failure_threshold": 2,
+    "cooldown": 60,
+    "probe_timeout": 3,
+}
+
+DEFAULT_DNS_CACHE = {
+    "enabled": True,
+    "ttl": 300,
+    "min_ttl": 30,
+    "max_ttl": 3600,
+    "max_entries": 256,
+}
+
+# 代理连接失败的异常，发生时请求尚未到达引擎，可以切换代理重试
+ROUTE_ERRORS = (ConnectError, ConnectTimeout, ProxyError)
+
+DEFAULT_IMAGE_BUDGET = {
+    "max_mb": 32,
+    "max_megapixels": 64,
+    "soft_megapixels": 16,
+    "worker_memory_mb": 1024,
+    "worker_timeout": 20,
+}
+
+
+
+@functools.lru_cache(maxsize=8)
+def load_font(size: int) -> Any:
+    """
+    加载结果图字体并按字号缓存，字体文件只在首次使用时读取，缺失时使用默认字体
+
+    参数:
+        size: 字号
+
+    返回:
+        Any: 字体对象
+    """
+    try:
+        return ImageFont.truetype(str(FONT_PATH), size)
+    except IOError:
+        return ImageFont.load_default()
+
 
 class BaseSearchModel:
     """
     图像反向搜索基础模型类
 
     提供多种搜索引擎的统一接口，支持本地文件和URL搜索，
-    可以输出文本结果或生成可视化图像结果，支持GIF格式自动转换
+    可以输出文本结果或生成可视化图像结果，动图、WebP、HEIC等格式在提交前自动转换为JPEG
     """
 
     def __init__(self, proxies: Optional[str] = None, cookies: Optional[dict] = None,
                  timeout: int = 60, default_params: Optional[dict] = None, 
-                 default_cookies: Optional[dict] = None, auto_google_config: Optional[dict] = None):
+                 default_cookies: Optional[dict] = None, auto_google_config: Optional[dict] = None,
+                 timeout_config: Optional[dict] = None, url_passthrough: Optional[dict] = None,
+                 result_card: Optional[dict] = None, shared_backend: Optional[dict] = None,
+                 image_normalize: Optional[dict] = None, image_budget: Optional[dict] = None,
+                 result_pages: Optional[dict] = None, proxy_routing: Optional[dict] = None,
+                 dns_cache: Optional[dict] = None, http2: Optional[dict] = None):
         """
         初始化搜索模型
 
         参数:
             proxies: 代理服务器配置
             cookies: Cookie配置
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，未单独配置的阶段使用该值
             default_params: 各引擎的默认参数
             default_cookies: 各引擎的默认Cookie
+            auto_google_config: Google Cookie自动获取配置
+            timeout_config: 分引擎、分阶段及自适应超时配置
+            url_passthrough: URL透传配置，启用后支持URL搜索的引擎直接接收图像URL
+            result_card: 缩略图结果卡片配置
+            shared_backend: 共享状态后端配置，多个进程可通过SQLite或Redis共享结果缓存、Google Cookie与SauceNAO配额
+            image_normalize: 图像格式归一化配置(最长边上限、JPEG质量与缓存数量)
+            image_budget: 图像解码预算配置(字节与像素上限、隔离解码的内存上限与超时)
+            result_pages: 结果图分页与编码配置(单页高度、纯文本页格式、调色板颜色数与JPEG质量)
+            proxy_routing: 分引擎代理路由配置(各引擎的路由、代理池失败阈值、冷却与探测超时)
+            dns_cache: DNS缓存配置(是否启用、默认TTL、TTL上下限与缓存主机数)
+            http2: 各引擎是否启用HTTP/2，同一次搜索中发往同一主机的请求复用一条多路复用连接
         """
         self.proxies = proxies
         self.cookies = cookies
         self.timeout = timeout
+        self.timeout_policy = TimeoutPolicy(timeout_config, default=timeout)
+        routing_config = {**DEFAULT_PROXY_ROUTING, **(proxy_routing or {})}
+        self.router = ProxyRouter(
+            default=proxies,
+            routes=routing_config["routes"],
+            failure_threshold=routing_config["failure_threshold"],
+            cooldown=routing_config["cooldown"],
+            probe_timeout=routing_config["probe_timeout"],
+        )
+        dns_config = {**DEFAULT_DNS_CACHE, **(dns_cache or {})}
+        self.dns_cache: Optional[DNSCache] = None
+        if dns_config["enabled"]:
+            self.dns_cache = DNSCache(
+                ttl=dns_config["ttl"],
+                min_ttl=dns_config["min_ttl"],
+                max_ttl=dns_config["max_ttl"],
+                max_entries=dns_config["max_entries"],
+            )
+        self.http2_engines: set[str] = {engine for engine, enabled in (http2 or {}).items() if enabled}
+        if self.http2_engines and not http2_available():
+            print("未安装h2(pip install httpx[http2])，HTTP/2设置不生效")
+            self.http2_engines = set()
+        self.url_passthrough = url_passthrough or {}
         self.default_params = default_params or {}
         self.default_cookies = default_cookies or {}
         self.auto_google_config = auto_google_config or {}
         self._google_cookie = None
         self._google_cookie_timestamp = 0
+        self.copyseeker_sessions: dict[Optional[str], CopyseekerSession] = {}
+        self.saucenao_keys = SauceNAOKeyPool(self.default_params.get("saucenao", {}).get("api_key"))
+        self.result_card = {**DEFAULT_RESULT_CARD, **(result_card or {})}
+        self.shared_config = shared_backend or {}
+        self.backend = create_backend(self.shared_config)
+        self.result_cache_ttl = float(self.shared_config.get("result_cache_ttl", 0) or 0)
+        thumbnail_size = int(self.result_card["thumbnail_size"])
+        self.thumbnails = ThumbnailFetcher(
+            size=(thumbnail_size, thumbnail_size),
+            cache_size=self.result_card["cache_size"],
+            per_host=self.result_card["per_host"],
+            proxies=proxies,
+            timeout=float(self.result_card["deadline"]),
+        )
+        normalize_config = {**DEFAULT_IMAGE_NORMALIZE, **(image_normalize or {})}
+        self.normalizer = ImageNormalizer(
+            max_side=normalize_config["max_side"],
+            quality=normalize_config["quality"],
+            cache_size=normalize_config["cache_size"],
+        )
+        self.result_pages = {**DEFAULT_RESULT_PAGES, **(result_pages or {})}
+        budget_config = {**DEFAULT_IMAGE_BUDGET, **(image_budget or {})}
+        self.budget = ImageBudget(
+            max_bytes=int(budget_config["max_mb"] * 1024 * 1024),
+            max_pixels=int(budget_config["max_megapixels"] * 1_000_000),
+            soft_pixels=int(budget_config["soft_megapixels"] * 1_000_000),
+            worker_memory_mb=budget_config["worker_memory_mb"],
+            worker_timeout=budget_config["worker_timeout"],
+        )
 
     def _prepare_engine_params(self, api: str, search_params: dict) -> dict:
         """
@@ -74,11 +238,12 @@ class BaseSearchModel:
                 "is_ex": search_params.pop("is_ex", False),
                 "covers": search_params.pop("covers", False),
                 "similar": search_params.pop("similar", True),
-                "exp": search_params.pop("exp", False)
+                "exp": search_params.pop("exp", False),
+                "max_results": search_params.pop("max_results", 1)
             }
         elif api == "saucenao":
             engine_params = {
-                "api_key": search_params.pop("api_key"),
+                "api_key": search_params.pop("api_key", None),
                 "hide": search_params.pop("hide", 3),
                 "numres": search_params.pop("numres", 5),
                 "minsim": search_params.pop("minsim", 30),
@@ -97,6 +262,8 @@ class BaseSearchModel:
                 "q": search_params.get("q", None),
                 "max_results": search_params.pop("max_results", 50)
             }
+        if "limit" in search_params:
+            engine_params["limit"] = search_params.pop("limit")
 
         return engine_params
 
@@ -106,56 +273,184 @@ class BaseSearchModel:
         now = time.time()
         if now - self._google_cookie_timestamp < self.auto_google_config.get("update_interval", 43200):
             return self._google_cookie
-        from .utils.cookie_manager import GoogleImagesCookieExtractor
-        extractor = GoogleImagesCookieExtractor(
-            remote_addr=self.auto_google_config.get("remote_addr") if self.auto_google_config.get("use_remote") else None,
-            headless=True,
-            timeout=30
-        )
-        result = await asyncio.to_thread(extractor.quick_run)
+        update_interval = self.auto_google_config.get("update_interval", 43200)
+        shared = await self.backend.get_json(GOOGLE_COOKIE_KEY)
+        if shared and now - shared["timestamp"] < update_interval:
+            self._google_cookie, self._google_cookie_timestamp = shared["cookie"], shared["timestamp"]
+            return self._google_cookie
+        if not await self.backend.add(GOOGLE_COOKIE_LOCK, b"1", ttl=GOOGLE_COOKIE_LOCK_TTL):
+            return await self._wait_google_cookie(update_interval)
+        try:
+            from .utils.cookie_manager import GoogleImagesCookieExtractor
+            extractor = GoogleImagesCookieExtractor(
+                remote_addr=self.auto_google_config.get("remote_addr") if self.auto_google_config.get("use_remote") else None,
+                headless=True,
+                timeout=30
+            )
+            result = await asyncio.to_thread(extractor.quick_run)
+            if result:
+                # 在释放锁之前写入，等待中的进程看到锁消失时即可读到新Cookie
+                self._google_cookie = result["cookie"]
+                self._google_cookie_timestamp = time.time()
+                await self.backend.set_json(
+                    GOOGLE_COOKIE_KEY,
+                    {"cookie": self._google_cookie, "timestamp": self._google_cookie_timestamp},
+                    ttl=update_interval,
+                )
+        finally:
+            await self.backend.delete(GOOGLE_COOKIE_LOCK)
         if result:
-            self._google_cookie = result["cookie"]
-            self._google_cookie_timestamp = now
             return self._google_cookie
         else:
             return self.default_cookies.get("google")
 
-    def _is_gif(self, file: FileContent) -> bool:
+    async def _wait_google_cookie(self, update_interval: float):
         """
-        检查文件是否为GIF格式
+        其他进程正在获取Google Cookie时，轮询共享后端等待其结果，避免重复启动浏览器
 
         参数:
-            file: 待检查的文件内容
+            update_interval: Cookie有效期(秒)，共享后端中未过期的Cookie都可以直接使用
 
         返回:
-            bool: 如果是GIF格式返回True，否则返回False
+            Optional[str]: Cookie，获取方已结束或等待超时时返回当前可用的Cookie或默认Cookie
+        """
+        for _ in range(GOOGLE_COOKIE_LOCK_TTL):
+            await asyncio.sleep(1)
+            shared = await self.backend.get_json(GOOGLE_COOKIE_KEY)
+            if shared and time.time() - shared["timestamp"] < update_interval:
+                self._google_cookie, self._google_cookie_timestamp = shared["cookie"], shared["timestamp"]
+                return self._google_cookie
+            if await self.backend.get(GOOGLE_COOKIE_LOCK) is None:
+                break
+        return self._google_cookie or self.default_cookies.get("google")
+
+    async def _normalize_file(self, file: FileContent) -> FileContent:
+        """
+        提交前检查解码预算并按真实格式归一化图像，只有需要转换时才解码：
+        像素数超过软上限的图像在有内存限制的隔离进程中解码，其余在线程中解码，不阻塞事件循环
+
+        参数:
+            file: 本地文件内容或路径
+
+        返回:
+            FileContent: 归一化后的图像数据，无需转换时为原数据
+
+        异常:
+            ImageBudgetError: 图像超出字节或像素预算，或隔离解码失败时抛出
         """
         if isinstance(file, (str, Path)):
-            return str(file).lower().endswith('.gif')
-        elif isinstance(file, bytes):
-            return file.startswith((b'GIF87a', b'GIF89a'))
-        return False
+            self.budget.check_bytes(Path(file).stat().st_size)
+            file = await asyncio.to_thread(Path(file).read_bytes)
+        size = self.budget.inspect(file)
+        if not self.normalizer.needs_conversion(file):
+            return file
+        if self.budget.needs_isolation(size):
+            return await self.budget.decode_isolated(file, self.normalizer.max_side, self.normalizer.quality)
+        return await asyncio.to_thread(self.normalizer.normalize, file)
 
-    def _convert_gif_to_jpeg(self, file: FileContent) -> bytes:
+    async def _search_response(self, api: str, file: FileContent = None,
+                               url: Optional[str] = None, **kwargs: Any) -> BaseSearchResponse:
         """
-        将GIF图像转换为JPEG格式
+        执行图像反向搜索并返回引擎的原始响应对象
+
+        按代理路由为引擎选择代理，代理连接失败时切换到代理池中的下一个健康代理重试
 
         参数:
-            file: GIF格式的文件内容
+            api: 搜索引擎API名称
+            file: 本地文件内容
+            url: 图像URL
+            **kwargs: 其他搜索参数
 
         返回:
-            bytes: 转换后的JPEG格式图像数据
+            BaseSearchResponse: 引擎响应对象
+
+        异常:
+            TimeoutError: 超过自适应截止时间时抛出
+            RuntimeError: 所有SauceNAO密钥配额均已耗尽时抛出
+            Exception: 网络或解析错误会原样抛出
         """
-        if isinstance(file, bytes):
-            img_data = file
-        else:
-            with open(file, 'rb') as f:
-                img_data = f.read()
-        img = Image.open(io.BytesIO(img_data))
-        img.seek(0)
-        jpeg_io = io.BytesIO()
-        img.convert('RGB').save(jpeg_io, 'JPEG', quality=85)
-        return jpeg_io.getvalue()
+        if file and not url:
+            file = await self._normalize_file(file)
+        failed: list[Optional[str]] = []
+        while True:
+            proxy = await self.router.select(api, exclude=failed)
+            try:
+                response = await self._search_once(api, proxy, file, url, **kwargs)
+            except ROUTE_ERRORS as e:
+                self.router.report_failure(proxy, e)
+                failed.append(proxy)
+                if not self.router.has_fallback(api, failed):
+                    raise
+                print(f"{api} 通过代理 {mask_proxy(proxy)} 连接失败({type(e).__name__})，切换到下一个代理")
+                continue
+            self.router.report_success(proxy)
+            return response
+
+    async def _search_once(self, api: str, proxy: Optional[str], file: FileContent = None,
+                           url: Optional[str] = None, **kwargs: Any) -> BaseSearchResponse:
+        """
+        通过指定代理执行一次搜索
+
+        参数:
+            api: 搜索引擎API名称
+            proxy: 本次使用的代理，"direct"表示直连，None表示未配置代理
+            file: 已归一化的文件内容
+            url: 图像URL
+            **kwargs: 其他搜索参数
+
+        返回:
+            BaseSearchResponse: 引擎响应对象
+        """
+        engine_class = ENGINE_MAP[api]
+        default_params = self.default_params.get(api, {})
+        search_params = {**default_params, **kwargs}
+        network_kwargs = {"resolver": self.dns_cache, "http2": api in self.http2_engines}
+        if proxy:
+            network_kwargs["proxies"] = proxy
+        effective_cookies = None
+        if api == "google":
+            effective_cookies = await self._get_google_cookie()
+        elif api in self.default_cookies:
+            effective_cookies = self.default_cookies.get(api)
+        elif self.cookies:
+            effective_cookies = self.cookies
+        if effective_cookies:
+            network_kwargs["cookies"] = effective_cookies
+        if self.timeout:
+            network_kwargs["timeout"] = self.timeout_policy.get_timeout(api)
+        deadline = self.timeout_policy.get_deadline(api)
+        start_time = time.monotonic()
+        async with Network(pooled=True, **network_kwargs) as client:
+            engine_params = self._prepare_engine_params(api, search_params)
+            saucenao_key = None
+            if api == "saucenao" and "api_key" not in kwargs and len(self.saucenao_keys):
+                await self._sync_saucenao_keys()
+                saucenao_key = engine_params["api_key"] = self.saucenao_keys.acquire()
+            if api == "copyseeker":
+                engine_params["session"] = self.copyseeker_sessions.setdefault(proxy, CopyseekerSession())
+            engine_instance = engine_class(client=client, **engine_params)
+            if api == "animetrace" and search_params.get("base64"):
+                search_coro = engine_instance.search(
+                    base64=search_params.pop("base64"),
+                    model=search_params.pop("model", None),
+                    **search_params
+                )
+            else:
+                search_coro = engine_instance.search(file=file, url=url, **search_params)
+            response = None
+            try:
+                response = await asyncio.wait_for(search_coro, deadline)
+            except asyncio.TimeoutError:
+                if deadline is None:
+                    raise
+                self.timeout_policy.record_timeout(api, deadline)
+                raise TimeoutError(f"搜索超时（超过 {deadline:.1f} 秒）") from None
+            finally:
+                if saucenao_key:
+                    self.saucenao_keys.release(saucenao_key, response)
+                    await self._publish_saucenao_key(saucenao_key)
+            self.timeout_policy.record(api, time.monotonic() - start_time)
+            return response
 
     async def search(self, api: str, file: FileContent = None,
                      url: Optional[str] = None, **kwargs: Any) -> str:
@@ -181,41 +476,380 @@ class BaseSearchModel:
             raise ValueError("必须提供 file 或 url 参数")
         if file and url:
             raise ValueError("file 和 url 参数不能同时提供")
-        if file and not url and self._is_gif(file):
-            file = self._convert_gif_to_jpeg(file)
         try:
-            engine_class = ENGINE_MAP[api]
-            default_params = self.default_params.get(api, {})
-            search_params = {**default_params, **kwargs}
-            network_kwargs = {}
-            if self.proxies:
-                network_kwargs["proxies"] = self.proxies
-            effective_cookies = None
-            if api == "google":
-                effective_cookies = await self._get_google_cookie()
-            elif api in self.default_cookies:
-                effective_cookies = self.default_cookies.get(api)
-            elif self.cookies:
-                effective_cookies = self.cookies
-            if effective_cookies:
-                network_kwargs["cookies"] = effective_cookies
-            if self.timeout:
-                network_kwargs["timeout"] = self.timeout
-            async with Network(**network_kwargs) as client:
-                engine_params = self._prepare_engine_params(api, search_params)
-                engine_instance = engine_class(client=client, **engine_params)
-                if api == "animetrace" and search_params.get("base64"):
-                    response = await engine_instance.search(
-                        base64=search_params.pop("base64"),
-                        model=search_params.pop("model", None),
-                        **search_params
-                    )
-                else:
-                    response = await engine_instance.search(file=file, url=url, **search_params)
-                return response.show_result()
+            response = await self._search_response(api, file=file, url=url, **kwargs)
+            return response.show_result()
+        except Exception as e:
+            return self._format_error(api, str(e))
+
+    @staticmethod
+    def _shared_key_name(key: str) -> str:
+        """
+        将SauceNAO密钥转换为共享后端中的键名，避免明文保存密钥
+        """
+        return SAUCENAO_QUOTA_KEY.format(hashlib.sha1(key.encode()).hexdigest()[:16])
+
+    async def _sync_saucenao_keys(self) -> None:
+        """
+        从共享后端合并其他进程记录的SauceNAO配额
+        """
+        try:
+            for key in self.saucenao_keys.states:
+                self.saucenao_keys.merge(key, await self.backend.get_json(self._shared_key_name(key)))
+        except Exception as e:
+            print(f"读取共享SauceNAO配额失败: {e}")
+
+    async def _publish_saucenao_key(self, key: str) -> None:
+        """
+        将本进程最新的SauceNAO配额写入共享后端
+
+        参数:
+            key: API密钥
+        """
+        snapshot = self.saucenao_keys.snapshot(key)
+        if snapshot is None:
+            return
+        try:
+            await self.backend.set_json(self._shared_key_name(key), snapshot, ttl=LONG_WINDOW)
+        except Exception as e:
+            print(f"写入共享SauceNAO配额失败: {e}")
+
+    def saucenao_quota(self) -> dict[str, Any]:
+        """
+        获取SauceNAO密钥池的配额汇总
+
+        返回:
+            dict[str, Any]: 密钥总数、可用数、暂停数以及短/长窗口的剩余与上限合计
+        """
+        return self.saucenao_keys.quota()
+
+    def can_pass_url(self, api: str, url: Optional[str]) -> bool:
+        """
+        判断是否可以直接把图像URL交给引擎搜索，而不经本机下载再上传
+
+        参数:
+            api: 搜索引擎API名称
+            url: 图像URL
+
+        返回:
+            bool: 已启用URL透传、引擎支持URL搜索且URL可被公网访问时返回True
+        """
+        if not url or not self.url_passthrough.get("enabled", False):
+            return False
+        return api in URL_SEARCH_ENGINES and is_public_url(url)
+
+    @staticmethod
+    def _url_search_failed(response: BaseSearchResponse) -> bool:
+        """
+        判断URL搜索是否因引擎无法获取图像而失败
+
+        参数:
+            response: 引擎响应对象
+
+        返回:
+            bool: 响应带有HTTP错误码或引擎错误状态时返回True
+        """
+        if (getattr(response, "status_code", None) or 200) >= 400:
+            return True
+        return bool(getattr(response, "status", None) or getattr(response, "code", None))
+
+    async def search_url(self, api: str, url: str,
+                         file_loader: Optional[Callable[[], Awaitable[Optional[bytes]]]] = None,
+                         **kwargs: Any) -> str:
+        """
+        按路由策略搜索URL图像
+
+        引擎支持URL搜索且URL可公开访问时直接发送URL；否则或引擎无法获取该URL时，
+        通过file_loader(未提供时由本机下载)取得图像数据并以文件方式上传
+
+        参数:
+            api: 搜索引擎API名称
+            url: 图像URL
+            file_loader: 获取图像数据的异步函数，仅在需要上传文件时调用
+            **kwargs: 其他搜索参数
+
+        返回:
+            str: 搜索结果文本
+
+        异常:
+            ValueError: 当API不支持时抛出
+        """
+        if api not in ENGINE_MAP:
+            available = ", ".join(ENGINE_MAP.keys())
+            raise ValueError(f"不支持的引擎: {api}，支持的引擎: {available}")
+        try:
+            response = await self._url_search_response(api, url, file_loader, **kwargs)
+            return response.show_result()
         except Exception as e:
             return self._format_error(api, str(e))
 
+    async def _url_search_response(self, api: str, url: str,
+                                   file_loader: Optional[Callable[[], Awaitable[Optional[bytes]]]] = None,
+                                   **kwargs: Any) -> BaseSearchResponse:
+        """
+        按URL透传策略搜索URL图像并返回引擎的原始响应对象
+
+        参数:
+            api: 搜索引擎API名称
+            url: 图像URL
+            file_loader: 获取图像数据的异步函数，仅在需要上传文件时调用
+            **kwargs: 其他搜索参数
+
+        返回:
+            BaseSearchResponse: 引擎响应对象
+
+        异常:
+            ValueError: 图片下载失败时抛出
+            Exception: URL搜索中HTTP错误码以外的错误与上传文件搜索的错误会原样抛出
+        """
+        if self.can_pass_url(api, url):
+            # 只有引擎无法获取该URL(HTTP错误码或引擎错误状态)时才改为上传；超时、配额耗尽等错误
+            # 上传同样会失败，直接抛出，避免再执行一次完整搜索
+            try:
+                response = await self._search_response(api, url=url, **kwargs)
+                if not self._url_search_failed(response):
+                    return response
+            except HTTPStatusError:
+                pass
+        file = await file_loader() if file_loader else await self._download(url)
+        if not file:
+            raise ValueError("图片下载失败")
+        return await self._search_response(api, file=file, **kwargs)
+
+    async def search_records(self, api: str, file: FileContent = None, url: Optional[str] = None,
+                             file_loader: Optional[Callable[[], Awaitable[Optional[bytes]]]] = None,
+                             record_limit: Optional[int] = None, **kwargs: Any) -> SearchResult:
+        """
+        执行图像反向搜索并返回结构化结果
+
+        只提供url时按URL透传策略搜索，与search_url一致；结果不经过文本格式化，
+        可直接用于缓存、跨引擎去重或由调用方自行渲染；配置了result_cache_ttl时，
+        成功的结果按引擎、图像内容(或URL)与参数缓存在共享后端中
+
+        参数:
+            api: 搜索引擎API名称
+            file: 本地文件内容
+            url: 图像URL
+            file_loader: 获取图像数据的异步函数，仅在只提供url且需要上传文件时调用
+            record_limit: 最多输出的结果数量，None表示使用引擎默认值，0表示全部
+            **kwargs: 其他搜索参数
+
+        返回:
+            SearchResult: 搜索结果，失败时error为错误信息
+
+        异常:
+            ValueError: 当API不支持或参数错误时抛出
+        """
+        if api not in ENGINE_MAP:
+            available = ", ".join(ENGINE_MAP.keys())
+            raise ValueError(f"不支持的引擎: {api}，支持的引擎: {available}")
+        if not file and not url:
+            raise ValueError("必须提供 file 或 url 参数")
+        if file and url:
+            raise ValueError("file 和 url 参数不能同时提供")
+        cache_key = self._result_cache_key(api, file, url, record_limit, kwargs)
+        if cache_key:
+            try:
+                cached = await self.backend.get_json(cache_key)
+                if cached:
+                    return SearchResult.from_dict(cached)
+            except Exception as e:
+                print(f"读取结果缓存失败: {e}")
+        try:
+            if file:
+                response = await self._search_response(api, file=file, **kwargs)
+            else:
+                response = await self._url_search_response(api, url, file_loader, **kwargs)
+            result = response.to_result(record_limit)
+        except Exception as e:
+            return SearchResult(api, error=self._friendly_error(str(e)))
+        if cache_key:
+            try:
+                await self.backend.set_json(cache_key, result.to_dict(), ttl=self.result_cache_ttl)
+            except Exception as e:
+                print(f"写入结果缓存失败: {e}")
+        return result
+
+    async def search_batch(self, api: str, sources: list[Union[bytes, str, None]], concurrency: int = 3,
+                           record_limit: Optional[int] = None, **kwargs: Any) -> list[SearchResult]:
+        """
+        并发搜索多张图像，同时进行的搜索不超过concurrency个
+
+        参数:
+            api: 搜索引擎API名称
+            sources: 图像列表，bytes为图像数据，str为图像URL，None表示该图像获取失败
+            concurrency: 最大并发搜索数
+            record_limit: 每张图像最多输出的结果数量
+            **kwargs: 其他搜索参数
+
+        返回:
+            list[SearchResult]: 与sources顺序一致的结果列表，单张图像失败时对应结果的error为错误信息
+
+        异常:
+            ValueError: 当API不支持时抛出
+        """
+        results: list[Optional[SearchResult]] = [None] * len(sources)
+        async for index, result in self.search_batch_stream(api, sources, concurrency, record_limit, **kwargs):
+            results[index] = result
+        return results
+
+    async def search_batch_stream(self, api: str, sources: list[Union[bytes, str, None]], concurrency: int = 3,
+                                  record_limit: Optional[int] = None,
+                                  **kwargs: Any) -> AsyncIterator[tuple[int, SearchResult]]:
+        """
+        并发搜索多张图像，每张图像搜索完成后立即产出其结果，产出顺序为完成顺序
+
+        参数:
+            api: 搜索引擎API名称
+            sources: 图像列表，格式同search_batch
+            concurrency: 最大并发搜索数
+            record_limit: 每张图像最多输出的结果数量
+            **kwargs: 其他搜索参数
+
+        返回:
+            AsyncIterator[tuple[int, SearchResult]]: (图像在sources中的序号, 结果)
+
+        异常:
+            ValueError: 当API不支持时抛出
+        """
+        if api not in ENGINE_MAP:
+            available = ", ".join(ENGINE_MAP.keys())
+            raise ValueError(f"不支持的引擎: {api}，支持的引擎: {available}")
+        limit = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def run(index: int, source: Union[bytes, str, None]) -> tuple[int, SearchResult]:
+            if not source:
+                return index, SearchResult(api, error="图片下载失败")
+            async with limit:
+                if isinstance(source, bytes):
+                    return index, await self.search_records(api, file=source, record_limit=record_limit, **kwargs)
+                return index, await self.search_records(api, url=source, record_limit=record_limit, **kwargs)
+
+        tasks = [asyncio.create_task(run(index, source)) for index, source in enumerate(sources)]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_stream(self, apis: Union[str, list[str]], file: FileContent = None, url: Optional[str] = None,
+                            file_loader: Optional[Callable[[], Awaitable[Optional[bytes]]]] = None,
+                            record_limit: Optional[int] = None, **kwargs: Any) -> AsyncIterator[SearchResult]:
+        """
+        使用一个或多个引擎同时搜索同一张图像，每个引擎完成后立即产出其结果，
+        调用方可以先发送较快引擎的结果或文本预览，再等待较慢的引擎与结果图渲染
+
+        提前结束迭代时，尚未完成的搜索会被取消
+
+        参数:
+            apis: 搜索引擎API名称或名称列表
+            file: 本地文件内容
+            url: 图像URL
+            file_loader: 获取图像数据的异步函数，多个引擎共用，应自行保证只下载一次
+            record_limit: 最多输出的结果数量
+            **kwargs: 其他搜索参数，对所有引擎生效
+
+        返回:
+            AsyncIterator[SearchResult]: 按完成顺序产出的各引擎结果
+
+        异常:
+            ValueError: 当API不支持或参数错误时抛出
+        """
+        apis = [apis] if isinstance(apis, str) else list(apis)
+        unknown = [api for api in apis if api not in ENGINE_MAP]
+        if unknown:
+            available = ", ".join(ENGINE_MAP.keys())
+            raise ValueError(f"不支持的引擎: {', '.join(unknown)}，支持的引擎: {available}")
+        tasks = [
+            asyncio.create_task(self.search_records(
+                api, file=file, url=url, file_loader=file_loader, record_limit=record_limit, **kwargs
+            ))
+            for api in apis
+        ]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _result_cache_key(self, api: str, file: FileContent, url: Optional[str],
+                          record_limit: Optional[int], kwargs: dict) -> Optional[str]:
+        """
+        计算结果缓存键，图像数据按内容哈希，只有URL时按URL哈希
+
+        参数:
+            api: 搜索引擎API名称
+            file: 本地文件内容
+            url: 图像URL
+            record_limit: 最多输出的结果数量
+            kwargs: 其他搜索参数
+
+        返回:
+            Optional[str]: 缓存键，未启用缓存或文件不是bytes时为None
+        """
+        if not self.result_cache_ttl:
+            return None
+        if isinstance(file, bytes):
+            digest = hashlib.sha1(file)
+        elif url:
+            digest = hashlib.sha1(url.encode())
+        else:
+            return None
+        digest.update(repr((record_limit, sorted(kwargs.items()))).encode())
+        return RESULT_CACHE_KEY.format(api, digest.hexdigest())
+
+    async def close(self) -> None:
+        """
+        关闭缩略图客户端、共享后端连接与共享连接池
+        """
+        await self.thumbnails.close()
+        await self.backend.close()
+        await close_pooled_transports()
+
+    def network_metrics(self) -> dict[str, Any]:
+        """
+        导出网络统计
+
+        返回:
+            dict[str, Any]: routing为代理路由统计(各引擎的路由方式、选择次数与故障切换，各代理的健康状态)，
+                dns为DNS缓存统计(未启用时为None)
+        """
+        return {
+            "routing": self.router.metrics(),
+            "dns": self.dns_cache.metrics() if self.dns_cache else None,
+        }
+
+    async def _download(self, url: str) -> bytes:
+        """
+        使用模型的代理和超时设置下载图像，超过字节预算时中止
+
+        参数:
+            url: 图像URL
+
+        返回:
+            bytes: 图像数据
+
+        异常:
+            ImageBudgetError: 图像超过字节预算时抛出
+        """
+        network_kwargs = {"resolver": self.dns_cache}
+        if self.proxies:
+            network_kwargs["proxies"] = self.proxies
+        if self.timeout:
+            network_kwargs["timeout"] = self.timeout
+        async with Network(pooled=True, **network_kwargs) as client:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    self.budget.check_bytes(received)
+                    chunks.append(chunk)
+                return b"".join(chunks)
+
     async def search_and_print(self, api: str, file: FileContent = None,
                                url: Optional[str] = None, **kwargs: Any) -> None:
         """
@@ -255,19 +889,12 @@ class BaseSearchModel:
             source_image = None
             if file is not None:
                 if isinstance(file, (str, Path)):
-                    source_image = Image.open(file)
-                elif isinstance(file, bytes):
-                    source_image = Image.open(io.BytesIO(file))
+                    self.budget.check_bytes(Path(file).stat().st_size)
+                    file = await asyncio.to_thread(Path(file).read_bytes)
+                if isinstance(file, bytes):
+                    source_image = await self.budget.open_image(file)
             elif url is not None:
-                network_kwargs = {}
-                if self.proxies:
-                    network_kwargs["proxies"] = self.proxies
-                if self.timeout:
-                    network_kwargs["timeout"] = self.timeout
-                async with Network(**network_kwargs) as client:
-                    response = await client.get(url)
-                    img_data = await response.aread()
-                    source_image = Image.open(io.BytesIO(img_data))
+                source_image = await self.budget.open_image(await self._download(url))
             return self.draw_results(api, result, source_image)
         except Exception as e:
             return self.draw_error(api, str(e))
@@ -283,13 +910,26 @@ class BaseSearchModel:
         返回:
             str: 格式化后的错误信息
         """
-        friendly_msg = "未搜索到相关信息" if "list index out of range" in error_msg.lower() else error_msg
+        friendly_msg = self._friendly_error(error_msg)
         return f"""{'=' * 50}
 {api.upper()} 搜索失败
 {'=' * 50}
 错误信息: {friendly_msg}
 {'=' * 50}"""
 
+    @staticmethod
+    def _friendly_error(error_msg: str) -> str:
+        """
+        将解析空结果时的索引错误转换为友好提示
+
+        参数:
+            error_msg: 原始错误信息
+
+        返回:
+            str: 错误信息
+        """
+        return "未搜索到相关信息" if "list index out of range" in error_msg.lower() else error_msg
+
     @classmethod
     def get_supported_engines(cls) -> list[str]:
         """
@@ -314,49 +954,396 @@ class BaseSearchModel:
         返回:
             Image.Image: 渲染后的结果图像
         """
-        margin = 20
-        lines = result.split('\n')
-        base_dir = Path(__file__).parent
-        font_path = str(base_dir / "resource/font/arialuni.ttf")
+        lines = [None if line.startswith('=') else line for line in result.split('\n')]
+        return self._draw_lines(api, lines, source_image)
+
+    def draw_records(self, result: SearchResult, source_image: Optional[Image.Image] = None) -> Image.Image:
+        """
+        将结构化搜索结果渲染为图像
+
+        参数:
+            result: 结构化搜索结果
+            source_image: 源图像（可选）
+
+        返回:
+            Image.Image: 渲染后的结果图像
+        """
+        return self._draw_lines(result.engine, format_lines(result), source_image)
+
+    async def render_result(self, result: SearchResult, source_image: Optional[Image.Image] = None) -> Image.Image:
+        """
+        按配置将结构化搜索结果渲染为缩略图卡片或文本图像，渲染出错时返回错误图像
+
+        参数:
+            result: 结构化搜索结果
+            source_image: 源图像（可选）
+
+        返回:
+            Image.Image: 渲染后的结果图像
+        """
         try:
-            font = ImageFont.truetype(font_path, 18)
-            title_font = ImageFont.truetype(font_path, 24)
-        except IOError:
-            font = ImageFont.load_default()
-            title_font = ImageFont.load_default()
-        title_text = f"{api.upper()} 搜索结果"
-        if hasattr(title_font, "getbbox"):
-            title_width = title_font.getbbox(title_text)[2] + margin * 2
-        else:
-            title_width = title_font.getsize(title_text)[0] + margin * 2
-        max_text_width = 0
-        for line in lines:
-            if hasattr(font, "getbbox"):
-                line_width = font.getbbox(line)[2] + margin * 2
+            if self.result_card.get("enabled", False):
+                return await self.render_card(result, source_image)
+            return self.draw_records(result, source_image)
+        except Exception as e:
+            return self.draw_error(result.engine, str(e))
+
+    def encode_page(self, image: Image.Image, photo: bool = False) -> RenderedPage:
+        """
+        按分页配置编码一页结果图
+
+        参数:
+            image: 页面图像
+            photo: 页面是否包含照片
+
+        返回:
+            RenderedPage: 编码后的页面
+        """
+        return encode_page(
+            image, photo,
+            text_format=self.result_pages["text_format"],
+            palette_colors=int(self.result_pages["palette_colors"]),
+            jpeg_quality=int(self.result_pages["jpeg_quality"]),
+        )
+
+    async def render_pages(self, result: SearchResult, source_image: Optional[Image.Image] = None) -> list[RenderedPage]:
+        """
+        将结构化搜索结果渲染并编码为一页或多页结果图
+
+        缩略图卡片高度固定，编码为一页JPEG；文本结果按单页高度分页，每页渲染后立即编码并释放，
+        峰值内存只与单页大小有关；插件发送每页时通过RenderedPage.describe()记录其编码格式与大小
+
+        参数:
+            result: 结构化搜索结果
+            source_image: 源图像（可选），绘制在第一页
+
+        返回:
+            list[RenderedPage]: 编码后的页面，渲染出错时为一页错误图像
+        """
+        pages = []
+        try:
+            if self.result_card.get("enabled", False):
+                pages.append(self.encode_page(await self.render_card(result, source_image), photo=True))
             else:
-                line_width = font.getsize(line)[0] + margin * 2
-            max_text_width = max(max_text_width, line_width)
-        source_img_height = 0
-        source_img_width = 0
+                for page, photo in self.iter_record_pages(result, source_image):
+                    pages.append(self.encode_page(page, photo))
+                    page.close()
+                    await asyncio.sleep(0)
+        except Exception as e:
+            pages = [self.encode_page(self.draw_error(result.engine, str(e)))]
+        return pages
+
+    def iter_record_pages(self, result: SearchResult,
+                          source_image: Optional[Image.Image] = None) -> Iterator[tuple[Image.Image, bool]]:
+        """
+        逐页绘制文本结果，所有页面宽度一致，标题中标注页码
+
+        参数:
+            result: 结构化搜索结果
+            source_image: 源图像（可选），绘制在第一页
+
+        返回:
+            Iterator[tuple[Image.Image, bool]]: 页面图像与该页是否包含照片
+        """
+        lines = format_lines(result)
+        page_height = int(self.result_pages["page_height"])
+        font, title_font = self._load_fonts()
+        line_height = self._line_height(font)
+        source_image = self._fit_source(source_image, max_height=page_height // 2)
+        width = self._canvas_width(font, title_font, f"{result.engine.upper()} 搜索结果 (0/0)", lines, source_image)
+        # 标题栏高度与正文上边距
+        chrome = 60 + 20
+        source_area = source_image.height + 40 if source_image else 0
+        chunks = paginate_lines(
+            lines,
+            (page_height - chrome - source_area) // line_height,
+            (page_height - chrome) // line_height,
+        )
+        for index, chunk in enumerate(chunks):
+            title = f"{result.engine.upper()} 搜索结果"
+            if len(chunks) > 1:
+                title += f" ({index + 1}/{len(chunks)})"
+            page_source = source_image if index == 0 else None
+            yield self._draw_lines(result.engine, chunk, page_source, title_text=title, width=width), bool(page_source)
+
+    async def render_card(self, result: SearchResult, source_image: Optional[Image.Image] = None) -> Image.Image:
+        """
+        将结构化搜索结果渲染为缩略图卡片
+
+        在result_card.deadline秒内并发获取前top_n条结果的缩略图，未能按时获取的缩略图
+        显示为占位框；搜索失败或结果均无缩略图时退回文本图像
+
+        参数:
+            result: 结构化搜索结果
+            source_image: 源图像（可选）
+
+        返回:
+            Image.Image: 渲染后的结果图像
+        """
+        records = result.records[:max(1, int(self.result_card["top_n"]))]
+        if result.error or not any(record.thumbnail for record in records):
+            return self.draw_records(result, source_image)
+        thumbnails = await self.thumbnails.fetch_many(
+            [record.thumbnail for record in records], float(self.result_card["deadline"])
+        )
+        return self.draw_card(result, thumbnails, source_image)
+
+    def draw_card(self, result: SearchResult, thumbnails: dict[str, Optional[Image.Image]],
+                  source_image: Optional[Image.Image] = None) -> Image.Image:
+        """
+        绘制缩略图网格卡片，每格包含缩略图、序号与相似度、标题和来源域名
+
+        参数:
+            result: 结构化搜索结果
+            thumbnails: 缩略图URL到图像的映射，缺失或为None时绘制占位框
+            source_image: 源图像（可选）
+
+        返回:
+            Image.Image: 渲染后的结果图像
+        """
+        margin = 20
+        padding = 10
+        font, title_font = load_font(16), load_font(24)
+
+        def text_width(text: str) -> int:
+            if hasattr(font, "getbbox"):
+                return font.getbbox(text)[2]
+            return font.getsize(text)[0]
+
+        def fit(text: str, width: int) -> str:
+            if text_width(text) <= width:
+                return text
+            while text and text_width(text + "…") > width:
+                text = text[:-1]
+            return text + "…"
+
+        records = result.records[:max(1, int(self.result_card["top_n"]))]
+        columns = max(1, min(int(self.result_card["columns"]), len(records)))
+        thumb_size = int(self.result_card["thumbnail_size"])
+        cell_width = thumb_size + padding * 2
+        line_height = max(22, (font.getbbox("Ay")[3] if hasattr(font, "getbbox") else font.getsize("Ay")[1]) + 6)
+        cell_height = thumb_size + padding * 2 + line_height * 3
+        rows = (len(records) + columns - 1) // columns
+        notes = []
+        if best_guess := result.extra.get("best_guess"):
+            notes.append(f"最佳结果: {best_guess}")
+        if "ai" in result.extra:
+            notes.append(f"是否为 AI 生成: {'是' if result.extra['ai'] else '否'}")
+        if failed_pages := result.extra.get("failed_pages"):
+            notes.append(f"有 {failed_pages} 页结果获取失败，结果不完整")
+        if len(result.records) > len(records):
+            notes.append(f"共 {len(result.records)} 条结果，此处显示前 {len(records)} 条")
+        source_img_width = source_img_height = 0
+        if source_image:
+            source_image = source_image.copy()
+            source_image.thumbnail((columns * cell_width, 400))
+            source_img_width, source_img_height = source_image.size
+        header_height = 60
+        width = max(columns * cell_width + margin * 2, 480)
+        source_area_height = source_img_height + margin * 2 if source_image else 0
+        notes_height = line_height * len(notes) + (margin if notes else 0)
+        total_height = header_height + source_area_height + notes_height + rows * cell_height + margin * 2
+        img = Image.new('RGB', (width, total_height), color='white')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([(0, 0), (width, header_height)], fill='#4a6ea9')
+        draw.text((margin, margin), f"{result.engine.upper()} 搜索结果", font=title_font, fill='white')
+        y_offset = header_height
         if source_image:
-            max_source_width = 800
-            orig_width, orig_height = source_image.size
-            if orig_width > max_source_width:
-                ratio = max_source_width / orig_width
-                source_img_width = max_source_width
-                source_img_height = int(orig_height * ratio)
-                source_image = source_image.resize((source_img_width, source_img_height), Image.LANCZOS)
+            img.paste(source_image, ((width - source_img_width) // 2, y_offset + margin))
+            y_offset += source_img_height + margin * 2
+            draw.line([(margin, y_offset - margin // 2), (width - margin, y_offset - margin // 2)], fill='#cccccc', width=2)
+        if notes:
+            y_offset += margin // 2
+            for note in notes:
+                draw.text((margin, y_offset), fit(note, width - margin * 2), font=font, fill='black')
+                y_offset += line_height
+            y_offset += margin // 2
+        y_offset += margin
+        grid_left = (width - columns * cell_width) // 2
+        for index, record in enumerate(records):
+            x = grid_left + (index % columns) * cell_width
+            y = y_offset + (index // columns) * cell_height
+            box = (x + padding, y + padding, x + padding + thumb_size, y + padding + thumb_size)
+            thumbnail = thumbnails.get(record.thumbnail) if record.thumbnail else None
+            if thumbnail is None:
+                draw.rectangle(box, fill='#eeeeee', outline='#cccccc')
+                placeholder = "无缩略图"
+                draw.text((box[0] + (thumb_size - text_width(placeholder)) // 2, box[1] + thumb_size // 2 - line_height // 2),
+                          placeholder, font=font, fill='#999999')
             else:
-                source_img_width = orig_width
-                source_img_height = orig_height
-        width = max(800, title_width, max_text_width, source_img_width + margin * 2)
+                img.paste(thumbnail, (box[0] + (thumb_size - thumbnail.width) // 2,
+                                      box[1] + (thumb_size - thumbnail.height) // 2))
+            text_y = box[3] + padding // 2
+            heading = f"#{index + 1}"
+            if record.similarity is not None:
+                heading += f"  {record.similarity}%"
+            draw.text((box[0], text_y), heading, font=font, fill='#4a6ea9')
+            draw.text((box[0], text_y + line_height), fit(record.title or record.author, thumb_size), font=font, fill='black')
+            domain = urlsplit(record.url).netloc if record.url else ""
+            draw.text((box[0], text_y + line_height * 2), fit(domain, thumb_size), font=font, fill='#666666')
+        return img
+
+    def draw_batch(self, results: list[SearchResult], sources: list[Optional[Image.Image]],
+                   top_n: int = 3) -> Image.Image:
+        """
+        将多张图像的搜索结果绘制为一张汇总图，每张图像一栏：左侧为原图缩略图，右侧为前top_n条结果或错误信息
+
+        参数:
+            results: 各图像的结构化搜索结果
+            sources: 与results顺序一致的原图，缺失时为None
+            top_n: 每张图像展示的结果数量
+
+        返回:
+            Image.Image: 渲染后的汇总图像
+        """
+        margin = 20
+        thumb_size = 160
+        font, title_font = load_font(16), load_font(24)
+
+        def text_width(text: str) -> int:
+            if hasattr(font, "getbbox"):
+                return font.getbbox(text)[2]
+            return font.getsize(text)[0]
+
         if hasattr(font, "getbbox"):
-            line_height = max(25, font.getbbox("Ay")[3] + 7)
+            line_height = max(22, font.getbbox("Ay")[3] + 6)
         else:
-            line_height = max(25, font.getsize("Ay")[1] + 7)
+            line_height = max(22, font.getsize("Ay")[1] + 6)
+        sections = []
+        for index, result in enumerate(results, 1):
+            if result.error:
+                lines = [f"图片 #{index}  搜索失败", f"错误信息: {result.error}"]
+            elif not result.records:
+                lines = [f"图片 #{index}", "未找到匹配结果"]
+            else:
+                lines = [f"图片 #{index}  共 {len(result.records)} 条结果"]
+                for number, record in enumerate(result.records[:top_n], 1):
+                    parts = [f"#{number}"]
+                    if record.similarity is not None:
+                        parts.append(f"相似度: {record.similarity}%")
+                    if record.title or record.author:
+                        parts.append((record.title or record.author)[:60])
+                    lines.append("  ".join(parts))
+                    if record.url:
+                        lines.append(f"    {record.url}")
+            sections.append(lines)
+        text_left = margin * 2 + thumb_size
+        max_text_width = max((text_width(line) for lines in sections for line in lines), default=0)
+        width = min(max(800, text_left + max_text_width + margin), 1600)
+        header_height = 60
+        section_heights = [max(thumb_size, line_height * len(lines)) + margin * 2 for lines in sections]
+        img = Image.new('RGB', (width, header_height + sum(section_heights)), color='white')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([(0, 0), (width, header_height)], fill='#4a6ea9')
+        engine = results[0].engine if results else ""
+        draw.text((margin, margin), f"{engine.upper()} 批量搜索结果（{len(results)} 张）", font=title_font, fill='white')
+        y_offset = header_height
+        for lines, height, source in zip(sections, section_heights, sources):
+            if source is not None:
+                thumbnail = source.convert("RGB")
+                thumbnail.thumbnail((thumb_size, thumb_size))
+                img.paste(thumbnail, (margin, y_offset + margin))
+            else:
+                draw.rectangle([margin, y_offset + margin, margin + thumb_size, y_offset + margin + thumb_size],
+                               fill='#eeeeee', outline='#cccccc')
+            for i, line in enumerate(lines):
+                draw.text((text_left, y_offset + margin + i * line_height), line, font=font,
+                          fill='#4a6ea9' if i == 0 else 'black')
+            y_offset += height
+            draw.line([(margin, y_offset - 1), (width - margin, y_offset - 1)], fill='#cccccc', width=1)
+        return img
+
+    @staticmethod
+    def _load_fonts() -> tuple[Any, Any]:
+        """
+        加载正文与标题字体，字体文件缺失时使用默认字体
+
+        返回:
+            tuple[Any, Any]: 正文字体与标题字体
+        """
+        return load_font(18), load_font(24)
+
+    @staticmethod
+    def _text_width(font: Any, text: str) -> int:
+        if hasattr(font, "getbbox"):
+            return font.getbbox(text)[2]
+        return font.getsize(text)[0]
+
+    @staticmethod
+    def _line_height(font: Any) -> int:
+        if hasattr(font, "getbbox"):
+            return max(25, font.getbbox("Ay")[3] + 7)
+        return max(25, font.getsize("Ay")[1] + 7)
+
+    @staticmethod
+    def _fit_source(source_image: Optional[Image.Image], max_width: int = 800,
+                    max_height: Optional[int] = None) -> Optional[Image.Image]:
+        """
+        按比例缩小源图像，使其不超过最大宽度(及最大高度)
+
+        参数:
+            source_image: 源图像
+            max_width: 最大宽度
+            max_height: 最大高度，为空时不限制
+
+        返回:
+            Optional[Image.Image]: 缩小后的源图像，未提供源图像时为None
+        """
+        if not source_image:
+            return None
+        orig_width, orig_height = source_image.size
+        ratio = min(1.0, max_width / orig_width, (max_height / orig_height) if max_height else 1.0)
+        if ratio < 1:
+            return source_image.resize((max(1, int(orig_width * ratio)), max(1, int(orig_height * ratio))), Image.LANCZOS)
+        return source_image
+
+    def _canvas_width(self, font: Any, title_font: Any, title_text: str, lines: list[Optional[str]],
+                      source_image: Optional[Image.Image], margin: int = 20) -> int:
+        """
+        计算容纳标题、所有文本行与源图像所需的画布宽度
+
+        参数:
+            font: 正文字体
+            title_font: 标题字体
+            title_text: 标题
+            lines: 文本行，None表示分隔线
+            source_image: 已缩小的源图像
+            margin: 左右边距
+
+        返回:
+            int: 画布宽度
+        """
+        title_width = self._text_width(title_font, title_text) + margin * 2
+        max_text_width = max((self._text_width(font, line) + margin * 2 for line in lines if line is not None), default=0)
+        source_width = source_image.width + margin * 2 if source_image else 0
+        return max(800, title_width, max_text_width, source_width)
+
+    def _draw_lines(self, api: str, lines: list[Optional[str]],
+                    source_image: Optional[Image.Image] = None, title_text: Optional[str] = None,
+                    width: Optional[int] = None) -> Image.Image:
+        """
+        将文本行绘制为结果图像
+
+        参数:
+            api: 搜索引擎API名称
+            lines: 文本行，None表示分隔线
+            source_image: 源图像（可选）
+            title_text: 标题，为空时为"<引擎> 搜索结果"
+            width: 画布宽度，为空时按内容计算
+
+        返回:
+            Image.Image: 渲染后的结果图像
+        """
+        margin = 20
+        font, title_font = self._load_fonts()
+        title_text = title_text or f"{api.upper()} 搜索结果"
+        source_image = self._fit_source(source_image)
+        if width is None:
+            width = self._canvas_width(font, title_font, title_text, lines, source_image, margin)
+        line_height = self._line_height(font)
         header_height = 60
         content_height = margin + line_height * len(lines)
-        source_area_height = source_img_height + margin * 2 if source_image else 0
+        source_area_height = source_image.height + margin * 2 if source_image else 0
         total_height = header_height + content_height + source_area_height
         img = Image.new('RGB', (width, total_height), color='white')
         draw = ImageDraw.Draw(img)
@@ -364,13 +1351,13 @@ class BaseSearchModel:
         draw.text((margin, margin), title_text, font=title_font, fill='white')
         y_offset = header_height
         if source_image:
-            x_center = (width - source_img_width) // 2
+            x_center = (width - source_image.width) // 2
             img.paste(source_image, (x_center, y_offset + margin))
-            y_offset += source_img_height + margin * 2
+            y_offset += source_image.height + margin * 2
             draw.line([(margin, y_offset - margin // 2), (width - margin, y_offset - margin // 2)], fill='#cccccc', width=2)
         y_position = y_offset
         for line in lines:
-            if line.startswith('='):
+            if line is None:
                 draw.line([(margin, y_position), (width - margin, y_position)], fill='#cccccc', width=1)
             else:
                 draw.text((margin, y_position), line, font=font, fill='black')
@@ -394,14 +1381,7 @@ class BaseSearchModel:
         img = Image.new('RGB', (width, height), color='white')
         draw = ImageDraw.Draw(img)
         draw.rectangle([(0, 0), (width, 60)], fill='#e74c3c')
-        try:
-            base_dir = Path(__file__).parent
-            font_path = str(base_dir / "resource/font/arialuni.ttf")
-            font = ImageFont.truetype(font_path, 18)
-            title_font = ImageFont.truetype(font_path, 24)
-        except IOError:
-            font = ImageFont.load_default()
-            title_font = ImageFont.load_default()
+        font, title_font = load_font(18), load_font(24)
         margin = 20
         draw.text((margin, margin), f"{api.upper()} 搜索失败", font=title_font, fill='white')
         draw.text((margin, 80), f"错误信息: {error_msg}", font=font, fill='black')
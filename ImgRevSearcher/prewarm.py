@@ -0,0 +1,167 @@
+"""
+启动预热
+
+在第一次搜索之前于后台完成冷启动开销：加载字体与E-Hentai标签翻译、初始化Pillow编解码器、
+用极小的样例数据运行一次各引擎的解析器(导入PyQuery/lxml等依赖并编译正则)，
+并通过共享连接池与各启用引擎的主机建立连接(DNS解析、TCP与TLS握手)，
+第一次搜索可直接复用这些连接。各步骤的耗时会打印并返回
+"""
+import asyncio
+import io
+import time
+from typing import Any, Callable, Optional
+from PIL import Image
+from .model import ROUTE_ERRORS, BaseSearchModel, load_font
+from .utils import Network
+from .utils.response_parser import (AnimeTraceResponse, BaiDuResponse, BingResponse, CopyseekerResponse,
+                                    EHentaiResponse, GoogleLensResponse, SauceNAOResponse, TineyeResponse)
+
+# 各引擎搜索时访问的主机
+ENGINE_ORIGINS = {
+    "animetrace": ["https://api.animetrace.com"],
+    "baidu": ["https://graph.baidu.com"],
+    "bing": ["https://www.bing.com"],
+    "copyseeker": ["https://copyseeker.net"],
+    "ehentai": ["https://upld.e-hentai.org"],
+    "google": ["https://lens.google.com", "https://www.google.com"],
+    "saucenao": ["https://saucenao.com"],
+    "tineye": ["https://tineye.com"],
+}
+
+# 各引擎解析器的最小样例，只需能走完一次解析流程
+PARSER_FIXTURES: dict[str, Callable[[], Any]] = {
+    "animetrace": lambda: AnimeTraceResponse({"code": 0, "trace_id": "", "data": []}, ""),
+    "baidu": lambda: BaiDuResponse({}, ""),
+    "bing": lambda: BingResponse({}, ""),
+    "copyseeker": lambda: CopyseekerResponse({"id": "", "imageUrl": "", "totalLinksFound": 0}, ""),
+    "ehentai": lambda: EHentaiResponse("<html><body><table class='itg'></table></body></html>", ""),
+    "google": lambda: GoogleLensResponse("<html><body></body></html>", ""),
+    "saucenao": lambda: SauceNAOResponse({"status_code": 0, "header": {}, "results": []}, ""),
+    "tineye": lambda: TineyeResponse(
+        {"query_hash": "", "status_code": 200, "total_pages": 0, "matches": []}, "", []
+    ),
+}
+
+# 结果图渲染使用的字号
+FONT_SIZES = (16, 18, 24)
+
+
+async def _timed(timings: dict[str, float], name: str, coro: Any) -> Any:
+    """
+    执行一个预热步骤并记录耗时，失败时只打印原因，不影响其他步骤
+
+    参数:
+        timings: 步骤名到耗时(秒)的映射
+        name: 步骤名
+        coro: 步骤协程
+
+    返回:
+        Any: 步骤的返回值，失败时为None
+    """
+    start = time.perf_counter()
+    try:
+        return await coro
+    except Exception as e:
+        print(f"预热步骤 {name} 失败: {e}")
+        return None
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def _warm_pillow() -> None:
+    """
+    编解码一张极小的图像，初始化JPEG与PNG编解码器
+    """
+    image = Image.new("RGB", (8, 8), (255, 255, 255))
+    for fmt in ("JPEG", "PNG"):
+        with io.BytesIO() as output:
+            image.save(output, fmt)
+            output.seek(0)
+            Image.open(output).load()
+
+
+def _warm_fonts() -> None:
+    for size in FONT_SIZES:
+        load_font(size)
+
+
+def _warm_parsers(engines: list[str]) -> None:
+    """
+    用样例数据运行各引擎的解析器与记录转换
+
+    参数:
+        engines: 启用的引擎
+    """
+    for engine in engines:
+        fixture = PARSER_FIXTURES.get(engine)
+        if fixture is None:
+            continue
+        try:
+            fixture().to_records()
+        except Exception as e:
+            print(f"预热解析器 {engine} 失败: {e}")
+
+
+async def _connect(model: BaseSearchModel, engine: str, origin: str) -> None:
+    """
+    按引擎的代理路由向主机发送HEAD请求，连接在共享连接池中保持供后续搜索复用，主机地址同时写入DNS缓存，
+    代理连接失败计入代理的健康状态
+
+    参数:
+        model: 搜索模型，使用其代理路由、DNS缓存、HTTP/2与超时设置
+        engine: 引擎名
+        origin: 主机地址
+    """
+    proxy = await model.router.select(engine)
+    async with Network(pooled=True, proxies=proxy, resolver=model.dns_cache,
+                       http2=engine in model.http2_engines, timeout=model.timeout or 30) as client:
+        try:
+            await client.head(origin)
+        except ROUTE_ERRORS as e:
+            model.router.report_failure(proxy, e)
+            raise
+    model.router.report_success(proxy)
+
+
+async def prewarm(model: BaseSearchModel, engines: list[str], connect: bool = True,
+                  connect_timeout: Optional[float] = 10) -> dict[str, float]:
+    """
+    执行启动预热并打印各步骤耗时
+
+    连接预热在调用方的事件循环中进行，连接只对同一事件循环中的后续搜索有效
+
+    参数:
+        model: 搜索模型
+        engines: 启用的引擎
+        connect: 是否预先建立到各引擎主机的连接
+        connect_timeout: 连接预热的总超时时间(秒)，为空时不限制
+
+    返回:
+        dict[str, float]: 步骤名到耗时(秒)的映射，连接步骤以"connect:引擎"命名
+    """
+    start = time.perf_counter()
+    timings: dict[str, float] = {}
+    steps = [
+        _timed(timings, "fonts", asyncio.to_thread(_warm_fonts)),
+        _timed(timings, "pillow", asyncio.to_thread(_warm_pillow)),
+    ]
+    if "ehentai" in engines:
+        steps.append(_timed(timings, "translations", EHentaiResponse.load_translations_async()))
+    await asyncio.gather(*steps)
+    # 解析器预热依赖已加载的翻译，放在资源加载之后
+    await _timed(timings, "parsers", asyncio.to_thread(_warm_parsers, engines))
+    if connect:
+        async def connect_engine(engine: str) -> None:
+            await asyncio.gather(*(_connect(model, engine, origin) for origin in ENGINE_ORIGINS.get(engine, [])))
+
+        connections = asyncio.gather(
+            *(_timed(timings, f"connect:{engine}", connect_engine(engine)) for engine in engines)
+        )
+        try:
+            await asyncio.wait_for(connections, connect_timeout)
+        except asyncio.TimeoutError:
+            print(f"预热连接超时（超过 {connect_timeout:.0f} 秒）")
+    timings["total"] = time.perf_counter() - start
+    report = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in timings.items())
+    print(f"启动预热完成: {report}")
+    return timings
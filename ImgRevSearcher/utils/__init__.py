@@ -1,5 +1,6 @@
 from .api_request import AnimeTrace, BaiDu, Bing, Copyseeker, EHentai, GoogleLens, SauceNAO, Tineye
 from .network import Network
+from .result_record import ResultRecord, SearchResult
 
 __all__ = [
     "AnimeTrace",
@@ -9,6 +10,8 @@ __all__ = [
     "EHentai",
     "GoogleLens",
     "Network",
+    "ResultRecord",
     "SauceNAO",
+    "SearchResult",
     "Tineye",
 ]
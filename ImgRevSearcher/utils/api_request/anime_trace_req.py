@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import AnimeTraceResponse
-from ..ext_tools import read_file
+from ..ext_tools import read_file_async
 from .base_req import BaseSearchReq
 
 
@@ -76,7 +76,7 @@ class AnimeTrace(BaseSearchReq[AnimeTraceResponse]):
                 json=data,
             )
         elif file:
-            files = {"file": read_file(file)}
+            files = {"file": await read_file_async(file)}
             resp = await self._send_request(
                 method="post",
                 files=files,
@@ -90,4 +90,4 @@ class AnimeTrace(BaseSearchReq[AnimeTraceResponse]):
             )
         else:
             raise ValueError("One of 'url', 'file', or 'base64' must be provided")
-        return AnimeTraceResponse(json_loads(resp.text), resp.url)
+        return AnimeTraceResponse(json_loads(resp.text), resp.url, limit=self.limit)
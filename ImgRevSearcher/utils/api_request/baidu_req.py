@@ -1,13 +1,17 @@
+import asyncio
+import re
 from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
-from lxml.html import HTMLParser, fromstring
-from pyquery import PyQuery
 from typing_extensions import override
 from ..response_parser import BaiDuResponse
-from ..ext_tools import deep_get, read_file
+from ..network import RESP
+from ..ext_tools import JSON_TOKEN_PATTERN, deep_get, read_file_async, slice_json_block
 from .base_req import BaseSearchReq
 
+SIMIPIC_CARD_PATTERN = re.compile(r'"cardName"\s*:\s*"simipic"')
+FIRST_URL_VALUE_PATTERN = re.compile(r'\s*:\s*"((?:[^"\\]|\\.)*)"')
+
 
 class BaiDu(BaseSearchReq[BaiDuResponse]):
     """
@@ -27,23 +31,49 @@ class BaiDu(BaseSearchReq[BaiDuResponse]):
         super().__init__(base_url, **request_kwargs)
 
     @staticmethod
-    def _extract_card_data(data: PyQuery) -> list[dict[str, Any]]:
+    def _extract_card_data(html: str) -> list[dict[str, Any]]:
         """
-        从页面中提取卡片数据
+        从页面源码中提取卡片数据
+        
+        直接在原始文本中定位并截取 window.cardData 的JSON数组，不构建DOM
         
         参数:
-            data: PyQuery对象，包含页面HTML
+            html: 页面HTML源码
             
         返回:
             list[dict[str, Any]]: 提取的卡片数据列表
         """
-        for script in data("script").items():
-            script_text = script.text()
-            if script_text and "window.cardData" in script_text:
-                start = script_text.find("[")
-                end = script_text.rfind("]") + 1
-                return json_loads(script_text[start:end])
-        return []
+        card_json = slice_json_block(html, "window.cardData")
+        return json_loads(card_json) if card_json else []
+
+    @staticmethod
+    def _find_first_url(html: str) -> Optional[str]:
+        """
+        在页面源码中预先查找simipic卡片的firstUrl，用于提前发起相似图片请求
+        
+        从卡片名之后按括号深度扫描到该卡片对象结束为止，不会匹配到后续卡片的firstUrl
+        
+        参数:
+            html: 页面HTML源码
+            
+        返回:
+            Optional[str]: firstUrl，未找到时返回None
+        """
+        match = SIMIPIC_CARD_PATTERN.search(html)
+        if not match:
+            return None
+        depth = 1
+        for token in JSON_TOKEN_PATTERN.finditer(html, match.end()):
+            text = token.group()
+            if text in ("{", "["):
+                depth += 1
+            elif text in ("}", "]"):
+                depth -= 1
+                if depth == 0:
+                    return None
+            elif text == '"firstUrl"' and (value := FIRST_URL_VALUE_PATTERN.match(html, token.end())):
+                return json_loads(f'"{value[1]}"')
+        return None
 
     @override
     async def search(
@@ -70,7 +100,7 @@ class BaiDu(BaseSearchReq[BaiDuResponse]):
         if url:
             files = {"image": await self.download(url)}
         elif file:
-            files = {"image": read_file(file)}
+            files = {"image": await read_file_async(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         resp = await self._send_request(
@@ -82,22 +112,36 @@ class BaiDu(BaseSearchReq[BaiDuResponse]):
         )
         data_url = deep_get(json_loads(resp.text), "data.url")
         if not data_url:
-            return BaiDuResponse({}, resp.url)
+            return BaiDuResponse({}, resp.url, limit=self.limit)
         resp = await self._send_request(method="get", url=data_url)
-        utf8_parser = HTMLParser(encoding="utf-8")
-        data = PyQuery(fromstring(resp.text, parser=utf8_parser))
-        card_data = self._extract_card_data(data)
-        same_data = None
-        for card in card_data:
-            if card.get("cardName") == "noresult":
-                return BaiDuResponse({}, data_url)
-            if card.get("cardName") == "same":
-                same_data = card["tplData"]
-            if card.get("cardName") == "simipic":
-                next_url = card["tplData"]["firstUrl"]
-                resp = await self._send_request(method="get", url=next_url)
-                resp_data = json_loads(resp.text)
-                if same_data:
-                    resp_data["same"] = same_data
-                return BaiDuResponse(resp_data, data_url)
-        return BaiDuResponse({}, data_url)
+        prefetch_url = self._find_first_url(resp.text)
+        prefetch_task: Optional[asyncio.Task[RESP]] = None
+        if prefetch_url:
+            prefetch_task = asyncio.create_task(self._send_request(method="get", url=prefetch_url))
+        try:
+            card_data = await asyncio.to_thread(self._extract_card_data, resp.text)
+            same_data = None
+            for card in card_data:
+                if card.get("cardName") == "noresult":
+                    return BaiDuResponse({}, data_url, limit=self.limit)
+                if card.get("cardName") == "same":
+                    same_data = card["tplData"]
+                if card.get("cardName") == "simipic":
+                    next_url = card["tplData"]["firstUrl"]
+                    if prefetch_task and next_url == prefetch_url:
+                        next_resp, prefetch_task = await prefetch_task, None
+                    else:
+                        next_resp = await self._send_request(method="get", url=next_url)
+                    resp_data = json_loads(next_resp.text)
+                    if same_data:
+                        resp_data["same"] = same_data
+                    return BaiDuResponse(resp_data, data_url, limit=self.limit)
+            return BaiDuResponse({}, data_url, limit=self.limit)
+        finally:
+            if prefetch_task:
+                # 已结束的预取任务取出其异常，避免事件循环报告未获取的异常
+                if prefetch_task.done():
+                    if not prefetch_task.cancelled():
+                        prefetch_task.exception()
+                else:
+                    prefetch_task.cancel()
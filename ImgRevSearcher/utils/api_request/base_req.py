@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Optional, TypeVar
+from typing import Any, AsyncContextManager, Generic, Optional, TypeVar
+from httpx import Response
 from ..response_parser.base_parser import BaseSearchResponse
 from ..network import RESP, HandOver
 from ..types import FileContent
@@ -17,16 +18,18 @@ class BaseSearchReq(HandOver, ABC, Generic[T]):
     """
     base_url: str
 
-    def __init__(self, base_url: str, **request_kwargs: Any):
+    def __init__(self, base_url: str, limit: int = 0, **request_kwargs: Any):
         """
         初始化搜索请求基类
         
         参数:
             base_url: 搜索引擎API的基础URL
+            limit: 响应中最多解析的结果项数量，0表示不限制
             **request_kwargs: 请求参数，传递给HandOver类
         """
         super().__init__(**request_kwargs)
         self.base_url = base_url
+        self.limit = limit
 
     @abstractmethod
     async def search(
@@ -76,3 +79,19 @@ class BaseSearchReq(HandOver, ABC, Generic[T]):
             return await self.post(request_url, **kwargs)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
+
+    def _stream_request(self, method: str, endpoint: str = "", url: str = "", **kwargs: Any) -> AsyncContextManager[Response]:
+        """
+        以流式方式发送HTTP请求，适用于只需读取响应体开头部分的场景
+        
+        参数:
+            method: HTTP方法(get/post)
+            endpoint: API端点路径
+            url: 完整的请求URL，如果提供则忽略base_url和endpoint
+            **kwargs: 其他请求参数
+            
+        返回:
+            AsyncContextManager[Response]: 产出未读取响应体的httpx响应对象的上下文管理器
+        """
+        request_url = url or (f"{self.base_url}/{endpoint}" if endpoint else self.base_url)
+        return self.stream(method, request_url, **kwargs)
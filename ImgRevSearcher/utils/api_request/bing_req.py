@@ -7,7 +7,7 @@ from typing import Any, Optional, Union
 from urllib.parse import quote_plus
 from typing_extensions import override
 from ..response_parser import BingResponse
-from ..ext_tools import read_file
+from ..ext_tools import read_file_async
 from .base_req import BaseSearchReq
 
 
@@ -42,7 +42,7 @@ class Bing(BaseSearchReq[BingResponse]):
             ValueError: 当无法从响应中提取BCID时抛出
         """
         endpoint = "images/search?view=detailv2&iss=sbiupload"
-        image_base64 = b64encode(read_file(file)).decode("utf-8")
+        image_base64 = b64encode(await read_file_async(file)).decode("utf-8")
         files = {
             "cbir": "sbi",
             "imageBin": image_base64,
@@ -134,4 +134,4 @@ class Bing(BaseSearchReq[BingResponse]):
             resp_json = await self._get_insights(bcid=bcid)
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
-        return BingResponse(resp_json, resp_url)
+        return BingResponse(resp_json, resp_url, limit=self.limit)
@@ -1,9 +1,12 @@
+import asyncio
+import time
 from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
+from httpx import AsyncClient
 from typing_extensions import override
 from ..response_parser import CopyseekerResponse
-from ..ext_tools import read_file
+from ..ext_tools import read_file_async
 from .base_req import BaseSearchReq
 
 COPYSEEKER_CONSTANTS = {
@@ -14,6 +17,77 @@ COPYSEEKER_CONSTANTS = {
 }
 
 
+class CopyseekerSession:
+    """
+    Copyseeker会话Cookie缓存类
+    
+    在多次搜索之间共享SET_COOKIE步骤得到的Cookie，只有在过期或失效后才重新获取；
+    会话由搜索模型按代理线路分别持有，不同线路之间互不共享
+    """
+    
+    def __init__(self, ttl: float = 1800):
+        """
+        初始化会话缓存
+        
+        参数:
+            ttl: Cookie未声明过期时间时的默认有效期(秒)
+        """
+        self.ttl: float = ttl
+        self.cookies: dict[str, str] = {}
+        self.expires_at: float = 0
+        self.lock = asyncio.Lock()
+
+    def is_valid(self) -> bool:
+        """
+        判断缓存的Cookie是否仍然有效
+        
+        返回:
+            bool: 有效返回True，否则返回False
+        """
+        return bool(self.cookies) and time.time() < self.expires_at
+
+    @staticmethod
+    def snapshot(client: AsyncClient) -> set[tuple[str, str, Optional[str]]]:
+        """
+        记录客户端当前持有的Cookie
+        
+        参数:
+            client: HTTP客户端
+            
+        返回:
+            set[tuple[str, str, Optional[str]]]: (域名, 名称, 值)集合
+        """
+        return {(cookie.domain, cookie.name, cookie.value) for cookie in client.cookies.jar}
+
+    def store(self, client: AsyncClient, before: set[tuple[str, str, Optional[str]]]) -> None:
+        """
+        保存SET_COOKIE请求新设置的Cookie，过期时间取各Cookie过期时间与默认有效期中的最小值
+        
+        请求前客户端已有的Cookie(如用户配置的默认Cookie)不会被保存
+        
+        参数:
+            client: 刚完成SET_COOKIE请求的HTTP客户端
+            before: 请求前通过snapshot记录的Cookie
+        """
+        expires_at = time.time() + self.ttl
+        cookies = {}
+        for cookie in client.cookies.jar:
+            if (cookie.domain, cookie.name, cookie.value) in before:
+                continue
+            cookies[cookie.name] = cookie.value
+            if cookie.expires:
+                expires_at = min(expires_at, cookie.expires)
+        self.cookies = cookies
+        self.expires_at = expires_at
+
+    def invalidate(self) -> None:
+        """
+        使缓存的会话失效，下次搜索时重新获取
+        """
+        self.cookies = {}
+        self.expires_at = 0
+
+
 class Copyseeker(BaseSearchReq[CopyseekerResponse]):
     """
     Copyseeker搜索请求类
@@ -21,15 +95,64 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
     用于与Copyseeker反向图像搜索服务交互，实现多步骤搜索流程
     """
     
-    def __init__(self, base_url: str = "https://copyseeker.net", **request_kwargs: Any):
+    def __init__(self, base_url: str = "https://copyseeker.net",
+                 session: Optional[CopyseekerSession] = None, **request_kwargs: Any):
         """
         初始化Copyseeker搜索请求
         
         参数:
             base_url: Copyseeker API的基础URL
+            session: 复用的会话缓存，为None时仅在本实例内使用新会话
             **request_kwargs: 其他请求参数
         """
         super().__init__(base_url, **request_kwargs)
+        self.session: CopyseekerSession = session or CopyseekerSession()
+
+    async def _ensure_session(self, refresh: bool = False) -> None:
+        """
+        确保客户端带有有效的Copyseeker会话Cookie
+        
+        会话有效时直接复用，否则执行SET_COOKIE步骤并保存新的会话
+        
+        参数:
+            refresh: 是否强制重新获取会话
+        """
+        client = await self._get_client()
+        async with self.session.lock:
+            if refresh:
+                self.session.invalidate()
+            if not self.session.is_valid():
+                headers = {
+                    "content-type": "text/plain;charset=UTF-8",
+                    "next-action": COPYSEEKER_CONSTANTS["SET_COOKIE_TOKEN"],
+                }
+                before = self.session.snapshot(client)
+                await self._send_request(
+                    method="post",
+                    headers=headers,
+                    data="[]",
+                )
+                self.session.store(client, before)
+                return
+        client.cookies.update(self.session.cookies)
+
+    async def _read_payload_line(self, endpoint: str = "", **kwargs: Any) -> tuple[dict[str, Any], str]:
+        """
+        流式读取RSC响应，读到 "1:{" 开头的负载行后立即停止
+        
+        参数:
+            endpoint: API端点路径
+            **kwargs: 其他请求参数
+            
+        返回:
+            tuple[dict[str, Any], str]: 负载JSON(未找到时为空字典)和响应URL
+        """
+        async with self._stream_request("post", endpoint=endpoint, **kwargs) as resp:
+            async for line in resp.aiter_lines():
+                line = line.strip()
+                if line.startswith("1:{"):
+                    return json_loads(line[2:]), str(resp.url)
+            return {}, str(resp.url)
 
     async def _get_discovery_id(
         self, url: Optional[str] = None, file: Union[str, bytes, Path, None] = None
@@ -37,7 +160,8 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
         """
         获取搜索发现ID
         
-        Copyseeker搜索的第一步，设置Cookie并上传图像，获取发现ID
+        Copyseeker搜索的第一步，确保会话Cookie后上传图像，获取发现ID；
+        使用缓存会话失败时会刷新会话并重试一次
         
         参数:
             url: 图像URL
@@ -46,41 +170,27 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
         返回:
             Optional[str]: 发现ID，如果失败则返回None
         """
-        headers = {"content-type": "text/plain;charset=UTF-8", "next-action": COPYSEEKER_CONSTANTS["SET_COOKIE_TOKEN"]}
-        data = "[]"
-        discovery_id = None
-        await self._send_request(
-            method="post",
-            headers=headers,
-            data=data,
-        )
+        cached = self.session.is_valid()
+        await self._ensure_session()
         if url:
-            data = [{"discoveryType": "ReverseImageSearch", "imageUrl": url}]
-            headers = {"next-action": COPYSEEKER_CONSTANTS["URL_SEARCH_TOKEN"]}
-            resp = await self._send_request(
-                method="post",
-                headers=headers,
-                json=data,
-            )
-        elif file:
-            files = {
-                "1_file": ("image.jpg", read_file(file), "image/jpeg"),
-                "1_discoveryType": (None, "ReverseImageSearch"),
-                "0": (None, '["$K1"]'),
+            request_kwargs: dict[str, Any] = {
+                "headers": {"next-action": COPYSEEKER_CONSTANTS["URL_SEARCH_TOKEN"]},
+                "json": [{"discoveryType": "ReverseImageSearch", "imageUrl": url}],
             }
-            headers = {"next-action": COPYSEEKER_CONSTANTS["FILE_UPLOAD_TOKEN"]}
-            resp = await self._send_request(
-                method="post",
-                headers=headers,
-                files=files,
-            )
-        if resp:
-            for line in resp.text.splitlines():
-                line = line.strip()
-                if line.startswith("1:{"):
-                    discovery_id = json_loads(line[2:]).get("discoveryId")
-                    break
-        return discovery_id
+        else:
+            request_kwargs = {
+                "headers": {"next-action": COPYSEEKER_CONSTANTS["FILE_UPLOAD_TOKEN"]},
+                "files": {
+                    "1_file": ("image.jpg", await read_file_async(file), "image/jpeg"),
+                    "1_discoveryType": (None, "ReverseImageSearch"),
+                    "0": (None, '["$K1"]'),
+                },
+            }
+        payload, _ = await self._read_payload_line(**request_kwargs)
+        if not payload.get("discoveryId") and cached:
+            await self._ensure_session(refresh=True)
+            payload, _ = await self._read_payload_line(**request_kwargs)
+        return payload.get("discoveryId")
 
     @override
     async def search(
@@ -107,19 +217,12 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
             raise ValueError("Either 'url' or 'file' must be provided")
         discovery_id = await self._get_discovery_id(url, file)
         if discovery_id is None:
-            return CopyseekerResponse({}, "")
+            return CopyseekerResponse({}, "", limit=self.limit)
         data = [{"discoveryId": discovery_id, "hasBlocker": False}]
         headers = {"next-action": COPYSEEKER_CONSTANTS["GET_RESULTS_TOKEN"]}
-        resp = await self._send_request(
-            method="post",
+        resp_json, resp_url = await self._read_payload_line(
             endpoint="discovery",
             headers=headers,
             json=data,
         )
-        resp_json = {}
-        for line in resp.text.splitlines():
-            line = line.strip()
-            if line.startswith("1:{"):
-                resp_json = json_loads(line[2:])
-                break
-        return CopyseekerResponse(resp_json, resp.url)
+        return CopyseekerResponse(resp_json, resp_url, limit=self.limit)
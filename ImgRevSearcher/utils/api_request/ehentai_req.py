@@ -1,8 +1,9 @@
+import asyncio
 from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
-from ..response_parser import EHentaiResponse
-from ..ext_tools import read_file
+from ..response_parser import EHentaiResponse, is_gallery_element
+from ..ext_tools import HTML_CHUNK_SIZE, HTMLItemStream, read_file_async, read_html_stream
 from .base_req import BaseSearchReq
 
 
@@ -19,6 +20,7 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
         covers: bool = False,
         similar: bool = True,
         exp: bool = False,
+        max_results: int = 1,
         **request_kwargs: Any,
     ):
         """
@@ -29,6 +31,7 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
             covers: 是否搜索封面图像
             similar: 是否搜索相似图像
             exp: 是否使用扩展搜索
+            max_results: 最多读取的画廊数量，达到后停止读取响应，0表示读取全部；默认只展示第一个画廊
             **request_kwargs: 其他请求参数
         """
         base_url = "https://upld.exhentai.org" if is_ex else "https://upld.e-hentai.org"
@@ -37,6 +40,7 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
         self.covers: bool = covers
         self.similar: bool = similar
         self.exp: bool = exp
+        self.max_results: int = max(0, int(max_results or 0))
 
     @override
     async def search(
@@ -59,24 +63,24 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
         异常:
             ValueError: 当未提供url或file参数时抛出
         """
+        if not url and not file:
+            raise ValueError("Either 'url' or 'file' must be provided")
         endpoint = "upld/image_lookup.php" if self.is_ex else "image_lookup.php"
         data: dict[str, Any] = {"f_sfile": "File Search"}
-        if url:
-            files = {"sfile": await self.download(url)}
-        elif file:
-            files = {"sfile": read_file(file)}
-        else:
-            raise ValueError("Either 'url' or 'file' must be provided")
         if self.covers:
             data["fs_covers"] = "on"
         if self.similar:
             data["fs_similar"] = "on"
         if self.exp:
             data["fs_exp"] = "on"
-        resp = await self._send_request(
-            method="post",
-            endpoint=endpoint,
-            data=data,
-            files=files,
-        )
-        return EHentaiResponse(resp.text, resp.url)
+        counts = [count for count in (self.max_results, self.limit) if count > 0]
+        stream = HTMLItemStream(is_gallery_element, min(counts, default=0))
+        translations_task = asyncio.create_task(EHentaiResponse.load_translations_async())
+        try:
+            files = {"sfile": await self.download(url) if url else await read_file_async(file)}
+            async with self._stream_request("post", endpoint=endpoint, data=data, files=files) as resp:
+                await read_html_stream(resp.aiter_bytes(HTML_CHUNK_SIZE), stream)
+                resp_url = str(resp.url)
+        finally:
+            await translations_task
+        return EHentaiResponse(stream, resp_url, limit=self.limit)
@@ -2,9 +2,8 @@ from pathlib import Path
 from typing import Any, Literal, Optional, Union
 from pyquery import PyQuery
 from typing_extensions import override
-from ..response_parser import GoogleLensExactMatchesResponse, GoogleLensResponse
-from ..network import RESP
-from ..ext_tools import read_file
+from ..response_parser import GoogleLensExactMatchesResponse, GoogleLensResponse, GoogleLensStream
+from ..ext_tools import HTML_CHUNK_SIZE, HTMLItemStream, read_file_async, read_html_stream
 from .base_req import BaseSearchReq
 from ..types import FileContent
 
@@ -64,22 +63,53 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
         self.q: Optional[str] = q
         self.max_results: int = max_results
 
+    def _result_stream(self) -> GoogleLensStream:
+        """
+        创建结果页的增量解析器，收集到max_results(或limit)个结果项及其缩略图数据后停止读取
+        
+        返回:
+            GoogleLensStream: 增量解析器
+        """
+        return GoogleLensStream(self.search_type == "exact_matches", self.max_results, self.limit)
+
+    async def _read_page(self, stream: HTMLItemStream, method: str, endpoint: str = "", url: str = "",
+                         **kwargs: Any) -> str:
+        """
+        流式请求页面并送入增量解析器，解析器完成后不再读取剩余的响应体
+        
+        参数:
+            stream: 增量解析器
+            method: HTTP方法(get/post)
+            endpoint: API端点路径
+            url: 完整的请求URL
+            **kwargs: 其他请求参数
+            
+        返回:
+            str: 响应URL
+        """
+        async with self._stream_request(method, endpoint=endpoint, url=url, **kwargs) as resp:
+            await read_html_stream(resp.aiter_bytes(HTML_CHUNK_SIZE), stream)
+            return str(resp.url)
+
     async def _perform_image_search(
         self,
         url: Optional[str] = None,
         file: FileContent = None,
         q: Optional[str] = None,
-    ) -> RESP:
+    ) -> tuple[Union[GoogleLensStream, PyQuery], str]:
         """
         执行图像搜索请求
         
+        上传结果页只读取到目标标签页的链接为止，结果页读取到所需的结果项为止
+        
         参数:
             url: 图像URL
             file: 本地文件内容
             q: 搜索查询词
             
         返回:
-            RESP: HTTP响应对象
+            tuple[Union[GoogleLensStream, PyQuery], str]: 结果页的增量解析器(没有目标标签页时为已完整解析的
+                上传结果页)和响应URL
             
         异常:
             ValueError: 当未提供url或file参数时抛出
@@ -88,35 +118,26 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
         if q and self.search_type != "exact_matches":
             params["q"] = q
         if file:
-            endpoint = "v3/upload"
             filename = "image.jpg" if isinstance(file, bytes) else Path(file).name
-            files = {"encoded_image": (filename, read_file(file), "image/jpeg")}
-            resp = await self._send_request(
-                method="post",
-                endpoint=endpoint,
-                params=params,
-                files=files,
-            )
+            files = {"encoded_image": (filename, await read_file_async(file), "image/jpeg")}
+            request: dict[str, Any] = {"method": "post", "endpoint": "v3/upload", "params": params, "files": files}
         elif url:
-            endpoint = "uploadbyurl"
             params["url"] = url
-            resp = await self._send_request(
-                method="post" if file else "get",
-                endpoint=endpoint,
-                params=params,
-            )
+            request = {"method": "get", "endpoint": "uploadbyurl", "params": params}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
-        dom = PyQuery(resp.text)
-        exact_link = ""
-        
-        if self.search_type != "all" and self.search_type in SEARCH_TYPE_UDM:
-            udm_value = SEARCH_TYPE_UDM[self.search_type]
-            exact_link = dom(f'a[href*="udm={udm_value}"]').attr("href") or ""
-            
+        udm_value = SEARCH_TYPE_UDM.get(self.search_type)
+        if not udm_value:
+            stream = self._result_stream()
+            return stream, await self._read_page(stream, **request)
+        link_stream = HTMLItemStream(f'a[href*="udm={udm_value}"]', limit=1)
+        resp_url = await self._read_page(link_stream, **request)
+        exact_link = link_stream.items[0].get("href") if link_stream.items else ""
         if exact_link:
-            return await self._send_request(method="get", url=f"{self.search_url}{exact_link}")
-        return resp
+            stream = self._result_stream()
+            return stream, await self._read_page(stream, "get", url=f"{self.search_url}{exact_link}")
+        # 没有目标标签页时上传结果页已被完整读取，直接作为结果页解析
+        return link_stream.close(), resp_url
 
     @override
     async def search(
@@ -140,12 +161,10 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
         """
         if q is not None and self.search_type == "exact_matches":
             q = None
-        resp = await self._perform_image_search(url, file, q)
+        page, resp_url = await self._perform_image_search(url, file, q)
         if self.search_type == "exact_matches":
-            response = GoogleLensExactMatchesResponse(resp.text, resp.url)
-            response._parse_response(resp.text, resp_url=resp.url, max_results=self.max_results)
-            return response
+            return GoogleLensExactMatchesResponse(
+                page, resp_url, max_results=self.max_results, limit=self.limit
+            )
         else:
-            response = GoogleLensResponse(resp.text, resp.url)
-            response._parse_response(resp.text, resp_url=resp.url, max_results=self.max_results)
-            return response
+            return GoogleLensResponse(page, resp_url, max_results=self.max_results, limit=self.limit)
@@ -4,7 +4,7 @@ from typing import Any, Optional, Union
 from httpx import QueryParams
 from typing_extensions import override
 from ..response_parser import SauceNAOResponse
-from ..ext_tools import read_file
+from ..ext_tools import read_file_async
 from .base_req import BaseSearchReq
 
 
@@ -95,7 +95,7 @@ class SauceNAO(BaseSearchReq[SauceNAOResponse]):
         if url:
             params = params.add("url", url)
         elif file:
-            files = {"file": read_file(file)}
+            files = {"file": await read_file_async(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         resp = await self._send_request(
@@ -105,4 +105,4 @@ class SauceNAO(BaseSearchReq[SauceNAOResponse]):
         )
         resp_json = json_loads(resp.text)
         resp_json.update({"status_code": resp.status_code})
-        return SauceNAOResponse(resp_json, resp.url)
+        return SauceNAOResponse(resp_json, resp.url, limit=self.limit)
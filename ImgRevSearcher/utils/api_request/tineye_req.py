@@ -1,10 +1,12 @@
+import asyncio
+import math
 from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import TineyeResponse
 from ..types import DomainInfo
-from ..ext_tools import deep_get, read_file
+from ..ext_tools import deep_get, read_file_async
 from .base_req import BaseSearchReq
 
 
@@ -66,6 +68,44 @@ class Tineye(BaseSearchReq[TineyeResponse]):
             next_page_number,
         )
 
+    async def fetch_pages(
+        self, resp: TineyeResponse, pages: int, max_results: int = 0
+    ) -> TineyeResponse:
+        """
+        并发获取并聚合多页搜索结果
+        
+        基于_navigate_page同时请求当前页之后的若干页，按页码顺序合并结果，
+        达到结果数量上限后截断；请求失败的页面会被跳过，页数记录在failed_pages中
+        
+        参数:
+            resp: 第一页的搜索响应对象
+            pages: 需要获取的总页数(包含当前页)
+            max_results: 聚合结果数量上限，0表示不限制
+        
+        返回:
+            TineyeResponse: 合并后的搜索响应对象，raw包含所有成功获取的页面的结果
+        """
+        last_page = min(resp.page_number + max(pages, 1) - 1, resp.total_pages)
+        offsets = list(range(1, last_page - resp.page_number + 1))
+        if max_results > 0 and resp.raw:
+            needed = max(0, math.ceil((max_results - len(resp.raw)) / len(resp.raw)))
+            offsets = offsets[:needed]
+        if offsets:
+            page_resps = await asyncio.gather(
+                *(self._navigate_page(resp, offset) for offset in offsets),
+                return_exceptions=True,
+            )
+            errors = [page_resp for page_resp in page_resps if isinstance(page_resp, Exception)]
+            resp.failed_pages = len(errors)
+            if errors:
+                print(f"TinEye: {len(errors)}/{len(page_resps)} 个后续页面获取失败: {errors[0]!r}")
+            for page_resp in page_resps:
+                if isinstance(page_resp, TineyeResponse):
+                    resp.raw.extend(page_resp.raw)
+        if max_results > 0:
+            del resp.raw[max_results:]
+        return resp
+
     async def pre_page(self, resp: TineyeResponse) -> Optional[TineyeResponse]:
         """
         获取上一页搜索结果
@@ -100,6 +140,9 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         sort: str = "score",
         order: str = "desc",
         tags: str = "",
+        fetch_domains: bool = True,
+        pages: int = 1,
+        max_results: int = 0,
         **kwargs: Any,
     ) -> TineyeResponse:
         """
@@ -113,6 +156,9 @@ class Tineye(BaseSearchReq[TineyeResponse]):
             sort: 结果排序方式，可选值包括"score"、"size"、"date"等
             order: 排序顺序，可选值为"asc"或"desc"
             tags: 按标签过滤结果
+            fetch_domains: 是否获取结果的域名统计信息，关闭可省去一次请求
+            pages: 需要并发获取并聚合的结果页数
+            max_results: 聚合结果数量上限，0表示不限制
             **kwargs: 其他搜索参数
             
         返回:
@@ -134,7 +180,7 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         if url:
             params["url"] = url
         elif file:
-            files = {"image": read_file(file)}
+            files = {"image": await read_file_async(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         resp = await self._send_request(
@@ -146,9 +192,22 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         resp_json = json_loads(resp.text)
         resp_json["status_code"] = resp.status_code
         _url = resp.url
-        domains = []
+        domains_task: Optional[asyncio.Task[list[DomainInfo]]] = None
         if query_hash := deep_get(resp_json, "query.key"):
             query_string = "&".join(f"{k}={v}" for k, v in params.items())
             _url = f"{self.base_url}/search/{query_hash}?{query_string}"
-            domains = await self._get_domains(resp_json["query"]["hash"])
-        return TineyeResponse(resp_json, _url, domains)
+            if fetch_domains:
+                domains_task = asyncio.create_task(self._get_domains(resp_json["query"]["hash"]))
+        if self.limit > 0:
+            max_results = min(max_results, self.limit) if max_results > 0 else self.limit
+        try:
+            response = TineyeResponse(resp_json, _url, [], limit=0 if pages > 1 else self.limit)
+            if pages > 1 or max_results > 0:
+                response = await self.fetch_pages(response, pages, max_results)
+        except BaseException:
+            if domains_task:
+                domains_task.cancel()
+            raise
+        if domains_task:
+            response.domains = await domains_task
+        return response
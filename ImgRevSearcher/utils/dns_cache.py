@@ -0,0 +1,180 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+from httpcore import AsyncNetworkBackend, AsyncNetworkStream, ConnectError, ConnectTimeout
+
+
+def _load_resolver() -> Any:
+    """
+    加载可选依赖dnspython的异步解析器，可读取DNS记录的TTL
+
+    返回:
+        Any: dns.asyncresolver模块，未安装时为None
+    """
+    try:
+        import dns.asyncresolver
+    except ImportError:
+        return None
+    return dns.asyncresolver
+
+
+class DNSCache:
+    """
+    按TTL缓存的DNS解析结果
+
+    安装dnspython时按A记录的TTL缓存(限制在min_ttl与max_ttl之间)，否则使用系统getaddrinfo并按固定的
+    默认TTL缓存；同一主机的并发解析只发出一次查询，连接所有地址均失败时清除该主机的缓存
+    """
+
+    def __init__(self, ttl: float = 300, min_ttl: float = 30, max_ttl: float = 3600, max_entries: int = 256):
+        """
+        初始化DNS缓存
+
+        参数:
+            ttl: 无法读取记录TTL时的缓存时间(秒)
+            min_ttl: 缓存时间下限(秒)
+            max_ttl: 缓存时间上限(秒)
+            max_entries: 缓存的主机数量上限
+        """
+        self.ttl: float = float(ttl)
+        self.min_ttl: float = float(min_ttl)
+        self.max_ttl: float = max(self.min_ttl, float(max_ttl))
+        self.max_entries: int = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._resolver = _load_resolver()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.failures: int = 0
+
+    async def _lookup(self, host: str) -> tuple[list[str], float]:
+        """
+        查询主机的地址与缓存时间
+
+        参数:
+            host: 主机名
+
+        返回:
+            tuple[list[str], float]: 地址列表与缓存时间(秒)
+        """
+        if self._resolver is not None:
+            try:
+                answer = await self._resolver.resolve(host, "A")
+                addresses = [record.address for record in answer]
+                if addresses:
+                    return addresses, min(self.max_ttl, max(self.min_ttl, answer.rrset.ttl))
+            except Exception:
+                pass
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return addresses, min(self.max_ttl, max(self.min_ttl, self.ttl))
+
+    async def resolve(self, host: str) -> list[str]:
+        """
+        解析主机名，IP地址原样返回
+
+        参数:
+            host: 主机名
+
+        返回:
+            list[str]: 地址列表
+
+        异常:
+            OSError: 解析失败时抛出
+        """
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        entry = self._entries.get(host)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(host)
+            return entry[1]
+        if host in self._inflight:
+            self.hits += 1
+            return await asyncio.shield(self._inflight[host])
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[host] = future
+        try:
+            addresses, ttl = await self._lookup(host)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.failures += 1
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[host]
+        self._entries[host] = (time.monotonic() + ttl, addresses)
+        self._entries.move_to_end(host)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        future.set_result(addresses)
+        return addresses
+
+    def invalidate(self, host: str) -> None:
+        """
+        清除主机的缓存
+
+        参数:
+            host: 主机名
+        """
+        self._entries.pop(host, None)
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        导出缓存统计
+
+        返回:
+            dict[str, Any]: 缓存主机数、命中、未命中与解析失败次数，以及解析方式
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "resolver": "dnspython" if self._resolver is not None else "getaddrinfo",
+        }
+
+
+class CachingNetworkBackend(AsyncNetworkBackend):
+    """
+    httpcore网络后端的包装，建立TCP连接前通过DNSCache解析主机名，依次尝试各个地址
+
+    TLS握手的SNI与证书校验仍使用原主机名，不受影响
+    """
+
+    def __init__(self, backend: AsyncNetworkBackend, cache: DNSCache):
+        self._backend = backend
+        self._cache = cache
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None,
+                          socket_options: Optional[Iterable[Any]] = None) -> AsyncNetworkStream:
+        try:
+            addresses = await self._cache.resolve(host)
+        except OSError as e:
+            raise ConnectError(str(e)) from e
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (ConnectError, ConnectTimeout) as e:
+                error = e
+        self._cache.invalidate(host)
+        raise error or ConnectError(f"{host} 没有可用的地址")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options: Optional[Iterable[Any]] = None) -> AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
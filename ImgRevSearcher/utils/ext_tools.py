@@ -1,9 +1,22 @@
+import asyncio
+import ipaddress
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional, Union
-from lxml.html import HTMLParser, fromstring
+from typing import Any, AsyncIterable, Callable, Optional, Union
+from urllib.parse import urlparse
+from cssselect import GenericTranslator
+from lxml import etree
+from lxml.html import HtmlElement, HTMLParser, fromstring
 from pyquery import PyQuery
 
+JSON_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.S)
+# 流式解析HTML时每次读取的响应体字节数
+HTML_CHUNK_SIZE = 64 * 1024
+# lxml解析器不能跨线程共享，每个线程复用自己的解析器
+_parsers = threading.local()
+
 
 def deep_get(dictionary: dict[str, Any], keys: str) -> Optional[Any]:
     """
@@ -32,6 +45,39 @@ def deep_get(dictionary: dict[str, Any], keys: str) -> Optional[Any]:
     return dictionary
 
 
+def slice_json_block(text: str, marker: str, opener: str = "[") -> Optional[str]:
+    """
+    从原始文本中截取标记之后的第一个完整JSON块
+    
+    按括号深度匹配并整体跳过字符串内容，无需构建DOM即可从HTML/JS源码中取出内嵌数据
+    
+    参数:
+        text: 原始文本
+        marker: 定位用的标记字符串，如 'window.cardData'
+        opener: JSON块的起始字符，'[' 或 '{'
+    
+    返回:
+        Optional[str]: JSON块文本，未找到或括号不匹配时返回None
+    """
+    closer = "]" if opener == "[" else "}"
+    marker_pos = text.find(marker)
+    if marker_pos == -1:
+        return None
+    start = text.find(opener, marker_pos + len(marker))
+    if start == -1:
+        return None
+    depth = 0
+    for token in JSON_TOKEN_PATTERN.finditer(text, start):
+        char = token.group()
+        if char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:token.end()]
+    return None
+
+
 def read_file(file: Union[str, bytes, Path]) -> bytes:
     """
     读取文件内容为字节数据
@@ -55,6 +101,53 @@ def read_file(file: Union[str, bytes, Path]) -> bytes:
         raise type(e)(f"{error_type}：读取文件 {file} 时出错: {e}") from e
 
 
+async def read_file_async(file: Union[str, bytes, Path]) -> bytes:
+    """
+    异步读取文件内容为字节数据，在线程池中读取，慢速磁盘或网络磁盘不会阻塞事件循环
+    
+    参数:
+        file: 文件路径或字节数据
+        
+    返回:
+        bytes: 文件的字节内容
+        
+    异常:
+        FileNotFoundError: 当文件不存在时抛出
+        OSError: 当文件读取出错时抛出
+    """
+    if isinstance(file, bytes):
+        return file
+    return await asyncio.to_thread(read_file, file)
+
+
+def is_public_url(url: str) -> bool:
+    """
+    判断URL是否可能被外部服务直接访问
+    
+    仅接受http/https协议，排除localhost、内网与保留地址
+    
+    参数:
+        url: 待检测的URL
+        
+    返回:
+        bool: 可能公开可达返回True，否则返回False
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    host = parsed.hostname
+    if parsed.scheme not in ("http", "https") or not host:
+        return False
+    if host == "localhost" or host.endswith((".localhost", ".local", ".internal")):
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return "." in host
+    return address.is_global
+
+
 def parse_html(html: str) -> PyQuery:
     """
     解析HTML字符串为PyQuery对象
@@ -65,5 +158,140 @@ def parse_html(html: str) -> PyQuery:
     返回:
         PyQuery: 解析后的PyQuery对象，用于CSS选择器查询
     """
-    utf8_parser = HTMLParser(encoding="utf-8")
+    utf8_parser = getattr(_parsers, "utf8", None)
+    if utf8_parser is None:
+        utf8_parser = _parsers.utf8 = HTMLParser(encoding="utf-8")
     return PyQuery(fromstring(html, parser=utf8_parser))
+
+
+@lru_cache(maxsize=64)
+def css_matcher(selector: str) -> Callable[[HtmlElement], bool]:
+    """
+    将CSS选择器转换为判断单个元素是否匹配的函数，编译结果按选择器缓存
+    
+    只判断元素自身，适用于不含组合符的简单选择器，如 '.YxbOwd' 或 'a[href*="udm=48"]'
+    
+    参数:
+        selector: CSS选择器
+        
+    返回:
+        Callable[[HtmlElement], bool]: 元素匹配时返回True的函数
+    """
+    xpath = etree.XPath(GenericTranslator().css_to_xpath(selector, prefix="self::"))
+    return lambda element: bool(xpath(element))
+
+
+class HTMLItemStream:
+    """
+    增量HTML解析器
+    
+    分块接收响应体并交给lxml的HTMLPullParser，结果项元素闭合时即被收集，
+    收集到limit个结果项后done变为True，调用方可以停止读取剩余的响应体；
+    匹配script_selector的<script>闭合时其文本交给on_script，子类可重写以提取内嵌资源，
+    并重写done以在所需资源出现之前继续读取
+    """
+    
+    def __init__(
+        self,
+        selector: Union[str, Callable[[HtmlElement], bool]],
+        limit: int = 0,
+        script_selector: Optional[str] = None,
+    ):
+        """
+        初始化增量HTML解析器
+        
+        参数:
+            selector: 结果项的CSS选择器(见css_matcher)或判断元素是否为结果项的函数
+            limit: 收集多少个结果项后停止，0表示读取全部响应体
+            script_selector: 需要提取文本的<script>的CSS选择器，为空时不提取
+        """
+        self._is_item = css_matcher(selector) if isinstance(selector, str) else selector
+        self._is_script = css_matcher(script_selector) if script_selector else None
+        self.limit: int = max(0, int(limit or 0))
+        self.items: list[HtmlElement] = []
+        self.scripts: list[str] = []
+        self.bytes_read: int = 0
+        self.complete: bool = False
+        self._parser = etree.HTMLPullParser(events=("end",), encoding="utf-8")
+        self._root: Optional[HtmlElement] = None
+
+    @property
+    def full(self) -> bool:
+        """
+        是否已收集到limit个结果项
+        """
+        return bool(self.limit) and len(self.items) >= self.limit
+
+    @property
+    def done(self) -> bool:
+        """
+        是否可以停止读取响应体
+        """
+        return self.full
+
+    def on_script(self, text: str) -> None:
+        """
+        处理匹配script_selector的<script>文本，默认保存到scripts
+        
+        参数:
+            text: 脚本文本
+        """
+        self.scripts.append(text)
+
+    def feed(self, data: bytes) -> None:
+        """
+        追加一段响应体并处理其中已闭合的元素
+        
+        参数:
+            data: 响应体片段
+        """
+        self.bytes_read += len(data)
+        self._parser.feed(data)
+        collecting = not self.full
+        for _, element in self._parser.read_events():
+            if element.tag == "script":
+                if self._is_script is not None and element.text and self._is_script(element):
+                    self.on_script(element.text)
+            elif collecting and self._is_item(element):
+                self.items.append(element)
+                collecting = not self.full
+
+    def close(self, complete: bool = True) -> PyQuery:
+        """
+        结束解析，可重复调用
+        
+        参数:
+            complete: 是否已读取完整的响应体
+            
+        返回:
+            PyQuery: 已解析部分的文档，提前停止时只包含停止位置之前的内容
+        """
+        if self._root is None:
+            self.complete = complete
+            try:
+                self._root = self._parser.close()
+            except etree.XMLSyntaxError:
+                self._root = fromstring("<html></html>")
+        return PyQuery(self._root)
+
+
+async def read_html_stream(chunks: AsyncIterable[bytes], stream: HTMLItemStream) -> HTMLItemStream:
+    """
+    将响应体分块送入增量解析器，解析器的done变为True时停止读取
+    
+    调用方随后退出流式响应的上下文即可关闭连接，剩余的响应体不会被下载和解析
+    
+    参数:
+        chunks: 响应体分块，如httpx.Response.aiter_bytes(HTML_CHUNK_SIZE)
+        stream: 增量解析器
+        
+    返回:
+        HTMLItemStream: 传入的解析器，已结束解析
+    """
+    async for chunk in chunks:
+        stream.feed(chunk)
+        if stream.done:
+            stream.close(complete=False)
+            return stream
+    stream.close()
+    return stream
@@ -0,0 +1,208 @@
+import asyncio
+import io
+import multiprocessing
+import warnings
+from multiprocessing.connection import Connection
+from typing import Optional
+from PIL import Image
+from .image_normalizer import SNIFF_BYTES, _register_heif_opener, sniff_format
+
+
+class ImageBudgetError(ValueError):
+    """
+    图像超出字节或像素预算，或隔离解码失败
+    """
+
+
+def _limit_memory(memory_mb: int) -> None:
+    """
+    限制当前进程的地址空间，不支持resource模块的平台(Windows)上只做进程隔离
+
+    参数:
+        memory_mb: 地址空间上限(MB)
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _decode_worker(conn: Connection, data: bytes, max_side: int, quality: int, memory_mb: int) -> None:
+    """
+    隔离进程入口：在内存限制下解码第一帧并编码为JPEG，结果通过管道发回
+
+    参数:
+        conn: 管道的发送端
+        data: 图像数据
+        max_side: 输出图像的最长边上限
+        quality: JPEG质量
+        memory_mb: 进程地址空间上限(MB)
+    """
+    from .image_normalizer import ImageNormalizer
+
+    _register_heif_opener()
+    try:
+        _limit_memory(memory_mb)
+        Image.MAX_IMAGE_PIXELS = None
+        conn.send(("ok", ImageNormalizer(max_side=max_side, quality=quality, cache_size=0)._convert(data)))
+    except MemoryError:
+        conn.send(("error", "图片解码超出内存限制"))
+    except Exception as e:
+        conn.send(("error", f"图片解码失败: {e}"))
+    finally:
+        conn.close()
+
+
+class ImageBudget:
+    """
+    图像解码预算
+
+    解码前只读取文件头检查字节数与像素数：超过硬上限的图像直接拒绝；超过软上限的图像
+    在独立的spawn进程中以地址空间限制(RLIMIT_AS)解码并缩小，即使被构造成解压炸弹，
+    也只会使该进程内存不足或被终止，不影响主进程
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_pixels: int = 64_000_000,
+                 soft_pixels: int = 16_000_000, worker_memory_mb: int = 1024, worker_timeout: float = 20):
+        """
+        初始化解码预算
+
+        参数:
+            max_bytes: 图像数据的字节上限，0表示不限制
+            max_pixels: 像素数硬上限，超过时直接拒绝，0表示不限制
+            soft_pixels: 像素数软上限，超过时在隔离进程中解码，0表示总是在主进程中解码
+            worker_memory_mb: 隔离进程的地址空间上限(MB)
+            worker_timeout: 隔离解码的超时时间(秒)
+        """
+        self.max_bytes: int = max(0, int(max_bytes))
+        self.max_pixels: int = max(0, int(max_pixels))
+        self.soft_pixels: int = max(0, int(soft_pixels))
+        self.worker_memory_mb: int = max(64, int(worker_memory_mb))
+        self.worker_timeout: float = float(worker_timeout)
+
+    def check_bytes(self, size: int) -> None:
+        """
+        检查图像数据的字节数
+
+        参数:
+            size: 字节数
+
+        异常:
+            ImageBudgetError: 超过字节上限时抛出
+        """
+        if self.max_bytes and size > self.max_bytes:
+            raise ImageBudgetError(
+                f"图片过大（{size / 1024 / 1024:.1f} MB，上限 {self.max_bytes / 1024 / 1024:.0f} MB）"
+            )
+
+    def inspect(self, data: bytes) -> Optional[tuple[int, int]]:
+        """
+        只读取文件头，检查字节数与像素数
+
+        参数:
+            data: 图像数据
+
+        返回:
+            Optional[tuple[int, int]]: 图像宽高，无法识别格式、或HEIC/AVIF图像未安装pillow-heif时为None
+
+        异常:
+            ImageBudgetError: 超过字节或像素硬上限，或可识别格式的文件头无法读取时抛出
+        """
+        self.check_bytes(len(data))
+        image_format = sniff_format(data[:SNIFF_BYTES])
+        if image_format in ("heic", "avif") and not _register_heif_opener():
+            # 没有解码器时本进程内不会解码该图像，原样提交给引擎
+            return None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(io.BytesIO(data)) as image:
+                    size = image.size
+        except Image.DecompressionBombError:
+            raise ImageBudgetError(self._pixels_error("超出 Pillow 的解压炸弹限制")) from None
+        except Exception as e:
+            if image_format:
+                raise ImageBudgetError(f"无法读取图片尺寸: {e}") from None
+            return None
+        pixels = size[0] * size[1]
+        if self.max_pixels and pixels > self.max_pixels:
+            raise ImageBudgetError(self._pixels_error(f"{size[0]}x{size[1]}"))
+        return size
+
+    def _pixels_error(self, detail: str) -> str:
+        limit = f"，上限 {self.max_pixels / 1_000_000:.0f} 百万像素" if self.max_pixels else ""
+        return f"图片尺寸过大（{detail}{limit}）"
+
+    def needs_isolation(self, size: Optional[tuple[int, int]]) -> bool:
+        """
+        判断解码是否需要在隔离进程中进行
+
+        参数:
+            size: inspect返回的图像宽高
+
+        返回:
+            bool: 像素数超过软上限时为True
+        """
+        return bool(size and self.soft_pixels and size[0] * size[1] > self.soft_pixels)
+
+    async def decode_isolated(self, data: bytes, max_side: int, quality: int = 90) -> bytes:
+        """
+        在有内存限制的独立进程中解码第一帧，缩小并编码为JPEG
+
+        每次调用启动一个新进程，超时或崩溃时直接终止该进程；只有超过软上限的图像会走这条路径
+
+        参数:
+            data: 图像数据
+            max_side: 输出图像的最长边上限
+            quality: JPEG质量
+
+        返回:
+            bytes: JPEG图像数据
+
+        异常:
+            ImageBudgetError: 解码超时、内存不足或进程异常退出时抛出
+        """
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_decode_worker,
+            args=(sender, data, max_side, quality, self.worker_memory_mb),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        try:
+            if not await asyncio.to_thread(receiver.poll, self.worker_timeout):
+                raise ImageBudgetError("图片解码超时")
+            status, payload = receiver.recv()
+        except EOFError:
+            raise ImageBudgetError("图片解码超出内存限制") from None
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            await asyncio.to_thread(process.join)
+        if status != "ok":
+            raise ImageBudgetError(payload)
+        return payload
+
+    async def open_image(self, data: bytes, max_side: int = 1024) -> Image.Image:
+        """
+        在预算内打开图像用于渲染，超过软上限的图像先在隔离进程中缩小
+
+        参数:
+            data: 图像数据
+            max_side: 隔离解码时输出图像的最长边上限
+
+        返回:
+            Image.Image: 图像对象
+
+        异常:
+            ImageBudgetError: 超出预算或隔离解码失败时抛出
+        """
+        size = self.inspect(data)
+        if self.needs_isolation(size):
+            data = await self.decode_isolated(data, max_side)
+        return Image.open(io.BytesIO(data))
@@ -0,0 +1,213 @@
+import functools
+import hashlib
+import io
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional
+from PIL import Image
+
+# 不需要转换即可直接提交给各引擎的格式
+PASSTHROUGH_FORMATS = {"jpeg", "png"}
+# ISO BMFF(ftyp)容器中的品牌与格式的对应关系
+HEIF_BRANDS = {
+    b"heic": "heic", b"heix": "heic", b"hevc": "heic", b"hevx": "heic",
+    b"heim": "heic", b"heis": "heic", b"mif1": "heic", b"msf1": "heic",
+    b"avif": "avif", b"avis": "avif",
+}
+# 判断格式时读取的文件头字节数
+SNIFF_BYTES = 4096
+
+
+def _png_is_animated(data: bytes) -> bool:
+    """
+    按PNG块顺序检查acTL块是否出现在首个IDAT块之前(APNG)
+
+    参数:
+        data: 文件头部数据
+
+    返回:
+        bool: 是否为APNG
+    """
+    offset = 8
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        if chunk_type == b"acTL":
+            return True
+        if chunk_type == b"IDAT":
+            return False
+        offset += 12 + length
+    return False
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """
+    根据文件头的魔数判断图像的真实格式，不依赖扩展名
+
+    参数:
+        data: 图像数据或其头部(至少SNIFF_BYTES字节以识别APNG)
+
+    返回:
+        Optional[str]: jpeg、png、apng、gif、webp、webp_animated、bmp、tiff、heic、avif，无法识别时为None
+    """
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "apng" if _png_is_animated(data) else "png"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if data[12:16] == b"VP8X" and len(data) > 20 and data[20] & 0x02:
+            return "webp_animated"
+        return "webp"
+    if data.startswith(b"BM"):
+        return "bmp"
+    if data.startswith((b"II*\x00", b"MM\x00*")):
+        return "tiff"
+    if data[4:8] == b"ftyp":
+        box_size = int.from_bytes(data[:4], "big")
+        brands = [data[8:12]] + [data[i:i + 4] for i in range(16, min(box_size, len(data)), 4)]
+        formats = {HEIF_BRANDS[brand] for brand in brands if brand in HEIF_BRANDS}
+        # mif1等通用HEIF品牌也会出现在AVIF文件中，有AVIF品牌时优先判断为AVIF
+        if formats:
+            return "avif" if "avif" in formats else "heic"
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _register_heif_opener() -> bool:
+    """
+    注册可选依赖pillow-heif提供的HEIC/AVIF解码器，每个进程只注册一次
+
+    返回:
+        bool: 是否注册成功
+    """
+    try:
+        import pillow_heif
+    except ImportError:
+        return False
+    pillow_heif.register_heif_opener()
+    return True
+
+
+class ImageNormalizer:
+    """
+    搜索前的图像格式归一化
+
+    根据魔数识别真实格式：JPEG与静态PNG在尺寸不超限时原样提交；GIF、APNG、(动态)WebP、
+    HEIC/AVIF、BMP、TIFF只解码第一帧；JPEG解码时通过draft直接按比例缩小，其余格式完整解码第一帧后
+    再缩小，最后编码为JPEG；转换结果按内容摘要缓存(线程安全)，同一图片多次搜索只转换一次
+    """
+
+    def __init__(self, max_side: int = 4096, quality: int = 90, cache_size: int = 32):
+        """
+        初始化归一化器
+
+        参数:
+            max_side: 输出图像的最长边上限(像素)，0表示不限制
+            quality: 输出JPEG的质量
+            cache_size: 缓存的转换结果数量，0表示不缓存
+        """
+        self.max_side: int = max(0, int(max_side))
+        self.quality: int = int(quality)
+        self.cache_size: int = max(0, int(cache_size))
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _needs_resize(self, image: Image.Image) -> bool:
+        return bool(self.max_side) and max(image.size) > self.max_side
+
+    def _convert(self, data: bytes) -> bytes:
+        """
+        解码第一帧并缩放、编码为JPEG
+
+        只有JPEG可以在解码时缩小(draft)；其余格式先完整解码第一帧，再由thumbnail先按整数倍reduce、
+        后以LANCZOS缩放到目标尺寸
+
+        参数:
+            data: 图像数据
+
+        返回:
+            bytes: JPEG图像数据
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            if self.max_side:
+                image.draft("RGB", (self.max_side, self.max_side))
+            image.load()
+            frame = image.copy() if image.mode in ("RGB", "L") else self._flatten(image)
+        if self._needs_resize(frame):
+            frame.thumbnail((self.max_side, self.max_side), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        with io.BytesIO() as output:
+            frame.convert("RGB").save(output, "JPEG", quality=self.quality)
+            return output.getvalue()
+
+    @staticmethod
+    def _flatten(image: Image.Image) -> Image.Image:
+        """
+        将带透明通道或调色板的帧合成到白色背景上，避免透明区域变黑
+
+        参数:
+            image: 已加载的帧
+
+        返回:
+            Image.Image: RGB图像
+        """
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+
+    def needs_conversion(self, data: bytes) -> bool:
+        """
+        判断图像是否需要转换，只读取文件头
+
+        参数:
+            data: 图像数据
+
+        返回:
+            bool: 是否需要转换
+        """
+        fmt = sniff_format(data[:SNIFF_BYTES])
+        if fmt is None:
+            return False
+        if fmt not in PASSTHROUGH_FORMATS:
+            return True
+        if not self.max_side:
+            return False
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                return self._needs_resize(image)
+        except Exception:
+            return False
+
+    def normalize(self, data: bytes) -> bytes:
+        """
+        归一化图像，无需转换或转换失败时返回原数据
+
+        参数:
+            data: 图像数据
+
+        返回:
+            bytes: 可直接提交给引擎的图像数据
+        """
+        if not self.needs_conversion(data):
+            return data
+        digest = hashlib.sha1(data).hexdigest()
+        with self._cache_lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                return cached
+        if sniff_format(data[:SNIFF_BYTES]) in ("heic", "avif"):
+            _register_heif_opener()
+        try:
+            converted = self._convert(data)
+        except Exception as e:
+            print(f"图像格式转换失败，将提交原图: {e}")
+            return data
+        if self.cache_size:
+            with self._cache_lock:
+                self._cache[digest] = converted
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return converted
@@ -1,7 +1,18 @@
+import asyncio
+import importlib.util
+import ssl
+import urllib.request
+import weakref
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from types import TracebackType
-from typing import Any, Optional, Union
-from httpx import AsyncClient, QueryParams, create_ssl_context
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+import httpcore
+import httpx
+from httpx import (AsyncBaseTransport, AsyncByteStream, AsyncClient, AsyncHTTPTransport, Limits, QueryParams,
+                   Request, Response, Timeout, create_ssl_context)
+from .dns_cache import CachingNetworkBackend, DNSCache
+from .proxy_router import DIRECT
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -10,6 +21,237 @@ DEFAULT_HEADERS = {
         "Chrome/99.0.4844.82 Safari/537.36"
     )
 }
+# 共享连接池中空闲连接的保持时间(秒)
+POOL_KEEPALIVE_EXPIRY = 60
+POOL_LIMITS = Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=POOL_KEEPALIVE_EXPIRY)
+# httpcore异常到httpx异常的对应关系，子类在前，与httpx传输层的映射一致
+HTTPCORE_ERRORS: tuple[tuple[type[Exception], type[httpx.HTTPError]], ...] = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+_ssl_contexts: dict[bool, ssl.SSLContext] = {}
+_pooled_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, AsyncBaseTransport]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_ssl_context(verify_ssl: bool = True) -> ssl.SSLContext:
+    """
+    获取缓存的SSL上下文，避免每个客户端都重新加载CA证书
+    
+    参数:
+        verify_ssl: 是否验证SSL证书
+        
+    返回:
+        ssl.SSLContext: SSL上下文
+    """
+    context = _ssl_contexts.get(verify_ssl)
+    if context is None:
+        context = create_ssl_context(verify=verify_ssl)
+        context.set_ciphers("DEFAULT")
+        _ssl_contexts[verify_ssl] = context
+    return context
+
+
+def http2_available() -> bool:
+    """
+    检查HTTP/2所需的可选依赖h2是否已安装
+    
+    返回:
+        bool: 是否可以启用HTTP/2
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+class _PooledTransport(AsyncBaseTransport):
+    """
+    共享连接池的包装，客户端关闭时不关闭底层连接池
+    """
+    
+    def __init__(self, transport: AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+@contextmanager
+def _map_httpcore_errors() -> Iterator[None]:
+    """
+    将httpcore抛出的异常转换为对应的httpx异常，调用方按httpx异常处理连接失败与超时
+    """
+    try:
+        yield
+    except Exception as e:
+        for source, target in HTTPCORE_ERRORS:
+            if isinstance(e, source):
+                raise target(str(e)) from e
+        raise
+
+
+class _ResponseStream(AsyncByteStream):
+    """
+    httpcore响应体的包装，读取时同样转换异常
+    """
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _map_httpcore_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _ResolvingTransport(AsyncBaseTransport):
+    """
+    建立连接时通过DNS缓存解析主机名的传输层
+    
+    直接使用httpcore的连接池并传入包装后的网络后端；使用HTTP代理时解析的是代理主机
+    """
+
+    def __init__(self, resolver: DNSCache, proxy: Optional[str] = None, verify_ssl: bool = True, http2: bool = False):
+        """
+        初始化传输层
+        
+        参数:
+            resolver: DNS缓存
+            proxy: HTTP(S)代理地址，为空时直连
+            verify_ssl: 是否验证SSL证书
+            http2: 是否启用HTTP/2
+        """
+        options: dict[str, Any] = {
+            "ssl_context": get_ssl_context(verify_ssl),
+            "max_connections": POOL_LIMITS.max_connections,
+            "max_keepalive_connections": POOL_LIMITS.max_keepalive_connections,
+            "keepalive_expiry": POOL_LIMITS.keepalive_expiry,
+            "http1": True,
+            "http2": http2,
+            "network_backend": CachingNetworkBackend(httpcore.AnyIOBackend(), resolver),
+        }
+        if proxy:
+            proxy_info = httpx.Proxy(proxy)
+            self._pool: httpcore.AsyncConnectionPool = httpcore.AsyncHTTPProxy(
+                proxy_url=httpcore.URL(
+                    scheme=proxy_info.url.raw_scheme,
+                    host=proxy_info.url.raw_host,
+                    port=proxy_info.url.port,
+                    target=proxy_info.url.raw_path,
+                ),
+                proxy_auth=proxy_info.raw_auth,
+                proxy_headers=proxy_info.headers.raw,
+                **options,
+            )
+        else:
+            self._pool = httpcore.AsyncConnectionPool(**options)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_httpcore_errors():
+            response = await self._pool.handle_async_request(core_request)
+        return Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def _env_proxy_configured() -> bool:
+    """
+    检查环境变量中是否配置了代理(不计NO_PROXY)
+    
+    返回:
+        bool: 是否配置了代理
+    """
+    return any(key != "no" for key in urllib.request.getproxies())
+
+
+def get_pooled_transport(proxies: Optional[str] = None, verify_ssl: bool = True, http2: bool = False,
+                         resolver: Optional[DNSCache] = None) -> Optional[AsyncBaseTransport]:
+    """
+    获取当前事件循环中按(代理, 证书验证, HTTP/2, DNS缓存)共享的连接池，
+    同一主机的后续请求可直接复用已建立的TCP与TLS连接
+    
+    未配置代理且环境变量中配置了代理时不使用共享连接池，由httpx按环境变量(含NO_PROXY)选择代理；
+    SOCKS代理不经过DNS缓存；连接池绑定事件循环，不会跨事件循环复用
+    
+    参数:
+        proxies: 代理服务器地址，"direct"表示直连且不使用环境变量中的代理
+        verify_ssl: 是否验证SSL证书
+        http2: 是否启用HTTP/2
+        resolver: 建立连接时使用的DNS缓存，为空时每次连接都由系统解析
+        
+    返回:
+        Optional[AsyncBaseTransport]: 连接池，没有运行中的事件循环或需要按环境变量选择代理时为None
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    if proxies == DIRECT:
+        proxies = None
+    elif not proxies and _env_proxy_configured():
+        return None
+    if proxies and not proxies.startswith(("http://", "https://")):
+        resolver = None
+    key = (proxies or None, verify_ssl, http2, resolver)
+    pool = _pooled_transports.setdefault(loop, {})
+    transport = pool.get(key)
+    if transport is None:
+        if resolver is not None:
+            transport = _ResolvingTransport(resolver, proxies, verify_ssl, http2)
+        else:
+            transport = AsyncHTTPTransport(
+                verify=get_ssl_context(verify_ssl),
+                http2=http2,
+                proxy=proxies or None,
+                limits=POOL_LIMITS,
+            )
+        pool[key] = transport
+    return _PooledTransport(transport)
+
+
+async def close_pooled_transports() -> None:
+    """
+    关闭当前事件循环中的所有共享连接池
+    """
+    for transport in _pooled_transports.pop(asyncio.get_running_loop(), {}).values():
+        await transport.aclose()
 
 
 class Network:
@@ -26,21 +268,25 @@ class Network:
         proxies: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
         http2: bool = False,
+        pooled: bool = False,
+        resolver: Optional[DNSCache] = None,
     ):
         """
         初始化网络客户端
         
         参数:
             internal: 是否为内部客户端
-            proxies: 代理服务器地址
+            proxies: 代理服务器地址，"direct"表示直连且不使用环境变量中的代理
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，也可传入httpx.Timeout分阶段设置
             verify_ssl: 是否验证SSL证书
             http2: 是否启用HTTP/2
+            pooled: 是否使用当前事件循环的共享连接池，关闭客户端时保留连接供后续请求复用
+            resolver: 共享连接池使用的DNS缓存，仅在pooled为True时生效
         """
         self.internal: bool = internal
         headers = {**DEFAULT_HEADERS, **(headers or {})}
@@ -48,17 +294,26 @@ class Network:
         if cookies:
             self.cookies = {k.strip(): v for k, v in (c.strip().split("=", 1) 
                            for c in cookies.split(";") if "=" in c)}
-        ssl_context = create_ssl_context(verify=verify_ssl)
-        ssl_context.set_ciphers("DEFAULT")
-        self.client: AsyncClient = AsyncClient(
-            headers=headers,
-            cookies=self.cookies,
-            verify=ssl_context,
-            http2=http2,
-            proxy=proxies,
-            timeout=timeout,
-            follow_redirects=True,
-        )
+        transport = get_pooled_transport(proxies, verify_ssl, http2, resolver) if pooled else None
+        if transport is not None:
+            self.client: AsyncClient = AsyncClient(
+                headers=headers,
+                cookies=self.cookies,
+                transport=transport,
+                timeout=timeout,
+                follow_redirects=True,
+            )
+        else:
+            self.client = AsyncClient(
+                headers=headers,
+                cookies=self.cookies,
+                verify=get_ssl_context(verify_ssl),
+                http2=http2,
+                proxy=None if proxies == DIRECT else proxies,
+                timeout=timeout,
+                follow_redirects=True,
+                trust_env=proxies != DIRECT,
+            )
 
     def start(self) -> AsyncClient:
         """
@@ -114,7 +369,7 @@ class ClientManager:
         proxies: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
         http2: bool = False,
     ):
@@ -126,7 +381,7 @@ class ClientManager:
             proxies: 代理服务器地址
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，也可传入httpx.Timeout分阶段设置
             verify_ssl: 是否验证SSL证书
             http2: 是否启用HTTP/2
         """
@@ -192,7 +447,7 @@ class HandOver:
         proxies: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
         http2: bool = False,
     ):
@@ -204,7 +459,7 @@ class HandOver:
             proxies: 代理服务器地址
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，也可传入httpx.Timeout分阶段设置
             verify_ssl: 是否验证SSL证书
             http2: 是否启用HTTP/2
         """
@@ -212,7 +467,7 @@ class HandOver:
         self.proxies: Optional[str] = proxies
         self.headers: Optional[dict[str, str]] = headers
         self.cookies: Optional[str] = cookies
-        self.timeout: float = timeout
+        self.timeout: Union[float, Timeout] = timeout
         self.verify_ssl: bool = verify_ssl
         self.http2: bool = http2
         # 创建一个单一的ClientManager实例
@@ -330,6 +585,25 @@ class HandOver:
         )
         return RESP(resp.text, str(resp.url), resp.status_code)
 
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[Response]:
+        """
+        以流式方式执行请求，响应体按需读取
+        
+        提前退出上下文时会直接关闭响应，不再读取剩余内容
+        
+        参数:
+            method: HTTP方法
+            url: 请求URL
+            **kwargs: 其他请求参数
+            
+        返回:
+            AsyncIterator[Response]: 未读取响应体的httpx响应对象
+        """
+        client = await self._get_client()
+        async with client.stream(method.upper(), url, **kwargs) as resp:
+            yield resp
+
     async def download(self, url: str, headers: Optional[dict[str, str]] = None) -> bytes:
         """
         下载文件
@@ -0,0 +1,287 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Collection, Optional
+from urllib.parse import urlsplit
+
+# 表示直连的路由取值，直连时也不使用环境变量中的代理
+DIRECT = "direct"
+# 未配置全局代理时在统计中的名称，此时沿用环境变量中的代理
+SYSTEM = "system"
+
+
+def mask_proxy(proxy: Optional[str]) -> str:
+    """
+    隐藏代理地址中的用户名与密码，用于日志与统计
+
+    参数:
+        proxy: 代理地址，None表示未配置代理
+
+    返回:
+        str: 可公开的代理描述
+    """
+    if not proxy:
+        return SYSTEM
+    if proxy == DIRECT:
+        return DIRECT
+    parts = urlsplit(proxy)
+    if not parts.username and not parts.password:
+        return proxy
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return f"{parts.scheme}://***@{host}"
+
+
+class ProxyState:
+    """
+    单个代理的健康状态
+    """
+
+    def __init__(self, proxy: str):
+        self.proxy: str = proxy
+        self.failures: int = 0
+        self.down_since: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.requests: int = 0
+        self.errors: int = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_since is None
+
+
+class ProxyRouter:
+    """
+    分引擎代理路由
+
+    每个引擎可以使用全局代理、直连，或由多个代理组成的代理池；代理池按配置顺序优先使用第一个健康的代理，
+    连续连接失败达到阈值的代理被标记为不可用，其后的代理自动接替；不可用的代理在冷却时间后
+    先通过TCP探测检查健康状态，探测成功才重新启用；所有代理都不可用时使用最早失效的代理
+    """
+
+    def __init__(self, default: Optional[str] = None, routes: Optional[dict[str, Any]] = None,
+                 failure_threshold: int = 2, cooldown: float = 60, probe_timeout: float = 3):
+        """
+        初始化代理路由
+
+        参数:
+            default: 全局代理地址，为空时沿用环境变量中的代理
+            routes: 引擎名到路由的映射，留空使用全局代理，direct表示直连，多个代理地址(可包含direct)用英文逗号分隔组成代理池
+            failure_threshold: 连续连接失败多少次后标记代理不可用
+            cooldown: 代理不可用后重新探测前的等待时间(秒)
+            probe_timeout: 健康探测的超时时间(秒)
+        """
+        self.default: Optional[str] = default or None
+        self.failure_threshold: int = max(1, int(failure_threshold))
+        self.cooldown: float = float(cooldown)
+        self.probe_timeout: float = float(probe_timeout)
+        self.routes: dict[str, list[Optional[str]]] = {}
+        for engine, route in (routes or {}).items():
+            candidates = self._parse_route(route)
+            if candidates is not None:
+                self.routes[engine] = candidates
+        self._states: dict[str, ProxyState] = {}
+        self._probes: dict[str, asyncio.Task] = {}
+        self.decisions: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.failovers: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def _parse_route(route: Any) -> Optional[list[Optional[str]]]:
+        """
+        解析单个引擎的路由配置
+
+        参数:
+            route: 路由配置，字符串或代理地址列表
+
+        返回:
+            Optional[list[Optional[str]]]: 按优先级排列的候选代理，DIRECT表示直连；未配置时为None
+        """
+        if isinstance(route, str):
+            route = route.split(",")
+        candidates = [str(proxy).strip() for proxy in route or [] if str(proxy).strip()]
+        candidates = [DIRECT if proxy.lower() == DIRECT else proxy for proxy in candidates]
+        return list(dict.fromkeys(candidates)) or None
+
+    def candidates(self, engine: Optional[str]) -> list[Optional[str]]:
+        """
+        获取引擎的候选代理
+
+        参数:
+            engine: 引擎名，为空时使用全局代理
+
+        返回:
+            list[Optional[str]]: 按优先级排列的候选代理，DIRECT表示直连，None表示未配置代理
+        """
+        return self.routes.get(engine, [self.default]) if engine else [self.default]
+
+    @staticmethod
+    def _tracked(proxy: Optional[str]) -> bool:
+        return bool(proxy) and proxy != DIRECT
+
+    def _state(self, proxy: str) -> ProxyState:
+        state = self._states.get(proxy)
+        if state is None:
+            state = self._states[proxy] = ProxyState(proxy)
+        return state
+
+    async def _probe(self, proxy: str) -> bool:
+        """
+        通过TCP连接探测代理是否可用
+
+        参数:
+            proxy: 代理地址
+
+        返回:
+            bool: 是否可用
+        """
+        parts = urlsplit(proxy)
+        port = parts.port or (443 if parts.scheme == "https" else 1080 if parts.scheme.startswith("socks") else 80)
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, port), self.probe_timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            self._state(proxy).last_error = f"探测失败: {e or type(e).__name__}"
+            return False
+        writer.close()
+        return True
+
+    async def _recheck(self, proxy: str) -> bool:
+        """
+        对冷却结束的不可用代理进行健康探测，同一代理的并发探测只进行一次
+
+        参数:
+            proxy: 代理地址
+
+        返回:
+            bool: 代理是否已恢复
+        """
+        if not self._tracked(proxy):
+            return True
+        state = self._state(proxy)
+        if state.healthy:
+            return True
+        if time.monotonic() - state.down_since < self.cooldown:
+            return False
+        task = self._probes.get(proxy)
+        if task is None:
+            task = self._probes[proxy] = asyncio.ensure_future(self._probe(proxy))
+            task.add_done_callback(lambda _: self._probes.pop(proxy, None))
+        if await asyncio.shield(task):
+            if not state.healthy:
+                print(f"代理 {mask_proxy(proxy)} 探测成功，重新启用")
+            state.down_since = None
+            state.failures = 0
+            return True
+        state.down_since = time.monotonic()
+        return False
+
+    async def select(self, engine: Optional[str] = None, exclude: Collection[Optional[str]] = ()) -> Optional[str]:
+        """
+        为引擎选择本次请求使用的代理
+
+        参数:
+            engine: 引擎名，为空时使用全局代理
+            exclude: 本次搜索中已经失败的代理，故障切换时跳过
+
+        返回:
+            Optional[str]: 代理地址，DIRECT表示直连，None表示未配置代理
+        """
+        candidates = self.candidates(engine)
+        chosen = candidates[0]
+        if len(candidates) > 1:
+            for proxy in [p for p in candidates if p not in exclude]:
+                if await self._recheck(proxy):
+                    chosen = proxy
+                    break
+            else:
+                down = [p for p in candidates if self._tracked(p) and not self._state(p).healthy]
+                chosen = min(down, key=lambda p: self._state(p).down_since or 0) if down else candidates[0]
+            if chosen != candidates[0]:
+                self.failovers[engine or "default"] += 1
+        self.decisions[engine or "default"][mask_proxy(chosen)] += 1
+        if self._tracked(chosen):
+            self._state(chosen).requests += 1
+        return chosen
+
+    def has_fallback(self, engine: Optional[str], exclude: Collection[Optional[str]]) -> bool:
+        """
+        判断本次搜索中已失败的代理之外是否还有健康的候选代理
+
+        参数:
+            engine: 引擎名
+            exclude: 本次搜索中已经失败的代理
+
+        返回:
+            bool: 是否还有其他健康的候选代理
+        """
+        return any(p not in exclude and (not self._tracked(p) or self._state(p).healthy)
+                   for p in self.candidates(engine))
+
+    def report_success(self, proxy: Optional[str]) -> None:
+        """
+        记录代理请求成功，清零连续失败次数
+
+        参数:
+            proxy: 本次请求使用的代理
+        """
+        if self._tracked(proxy):
+            state = self._state(proxy)
+            state.failures = 0
+            state.down_since = None
+
+    def report_failure(self, proxy: Optional[str], error: BaseException) -> None:
+        """
+        记录代理连接失败，连续失败达到阈值时标记为不可用
+
+        参数:
+            proxy: 本次请求使用的代理，直连时不计入
+            error: 连接异常
+        """
+        if not self._tracked(proxy):
+            return
+        state = self._state(proxy)
+        state.failures += 1
+        state.errors += 1
+        state.last_error = f"{type(error).__name__}: {error}"
+        if state.healthy and state.failures >= self.failure_threshold:
+            state.down_since = time.monotonic()
+            print(f"代理 {mask_proxy(proxy)} 连续 {state.failures} 次连接失败，暂停使用 {self.cooldown:.0f} 秒")
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        导出路由统计
+
+        返回:
+            dict[str, Any]: routes为各引擎的路由方式与各代理的选择次数、故障切换次数，
+                proxies为各代理的健康状态与请求、错误次数
+        """
+        now = time.monotonic()
+        routes = {}
+        for engine in sorted(set(self.routes) | set(self.decisions)):
+            candidates = self.candidates(None if engine == "default" else engine)
+            if candidates == [DIRECT]:
+                mode = DIRECT
+            elif candidates == [None]:
+                mode = SYSTEM
+            elif len(candidates) > 1:
+                mode = "pool"
+            else:
+                mode = "proxy"
+            routes[engine] = {
+                "mode": mode,
+                "decisions": dict(self.decisions.get(engine, {})),
+                "failovers": self.failovers.get(engine, 0),
+            }
+        return {
+            "routes": routes,
+            "proxies": {
+                mask_proxy(proxy): {
+                    "healthy": state.healthy,
+                    "down_for": None if state.healthy else round(now - state.down_since, 1),
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "last_error": state.last_error,
+                }
+                for proxy, state in self._states.items()
+            },
+        }
@@ -1,14 +1,16 @@
 from .anime_trace_parser import AnimeTraceItem, AnimeTraceResponse
 from .baidu_parser import BaiDuItem, BaiDuResponse
+from .base_parser import LazyItemList, set_keep_origin
 from .bing_parser import BingItem, BingResponse
 from .copyseeker_parser import CopyseekerItem, CopyseekerResponse
-from .ehentai_parser import EHentaiItem, EHentaiResponse
+from .ehentai_parser import EHentaiItem, EHentaiResponse, is_gallery_element
 from .google_lens_parser import (
     GoogleLensExactMatchesItem,
     GoogleLensExactMatchesResponse,
     GoogleLensItem,
     GoogleLensRelatedSearchItem,
     GoogleLensResponse,
+    GoogleLensStream,
 )
 from .saucenao_parser import SauceNAOItem, SauceNAOResponse
 from .tineye_parser import TineyeItem, TineyeResponse
@@ -29,8 +31,12 @@ __all__ = [
     "GoogleLensExactMatchesResponse",
     "GoogleLensExactMatchesItem",
     "GoogleLensRelatedSearchItem",
+    "GoogleLensStream",
+    "LazyItemList",
     "SauceNAOItem",
     "SauceNAOResponse",
     "TineyeItem",
     "TineyeResponse",
+    "is_gallery_element",
+    "set_keep_origin",
 ]
\ No newline at end of file
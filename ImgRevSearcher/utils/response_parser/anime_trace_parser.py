@@ -1,6 +1,7 @@
 from typing import Any, NamedTuple
 from typing_extensions import override
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class Character(NamedTuple):
@@ -20,6 +21,8 @@ class AnimeTraceItem(BaseResParser):
     解析单个识别结果，包含角色信息和位置框
     """
     
+    __slots__ = ("box", "box_id", "characters")
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any):
         """
         初始化AnimeTrace结果项解析器
@@ -55,6 +58,8 @@ class AnimeTraceResponse(BaseSearchResponse[AnimeTraceItem]):
     解析完整的AnimeTrace API响应，包含多个识别结果
     """
     
+    engine = "animetrace"
+    
     def __init__(self, resp_data: dict[str, Any], resp_url: str, **kwargs: Any) -> None:
         """
         初始化AnimeTrace响应解析器
@@ -79,7 +84,27 @@ class AnimeTraceResponse(BaseSearchResponse[AnimeTraceItem]):
         self.ai: bool = resp_data.get("ai", False)
         self.trace_id: str = resp_data["trace_id"]
         results = resp_data["data"]
-        self.raw: list[AnimeTraceItem] = [AnimeTraceItem(item) for item in results]
+        self.raw: LazyItemList[AnimeTraceItem] = self._lazy_items(AnimeTraceItem, results)
+
+    @override
+    def _item_records(self, item: AnimeTraceItem) -> list[ResultRecord]:
+        """
+        将识别结果中的每个角色转换为一条结构化结果
+        
+        参数:
+            item: 识别结果项
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        return [
+            ResultRecord(self.engine, title=character.name, extra={"work": character.work})
+            for character in item.characters
+        ]
+
+    @override
+    def _result_extra(self) -> dict[str, Any]:
+        return {"ai": self.ai}
         
     def show_result(self) -> str:
         """
@@ -1,7 +1,8 @@
-from typing import Any
+from typing import Any, Optional
 from typing_extensions import override
 from ..ext_tools import deep_get
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class BaiDuItem(BaseResParser):
@@ -11,6 +12,8 @@ class BaiDuItem(BaseResParser):
     解析单个搜索结果，提取标题、URL和缩略图等信息
     """
     
+    __slots__ = ()
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any) -> None:
         """
         初始化百度识图结果项解析器
@@ -42,6 +45,8 @@ class BaiDuResponse(BaseSearchResponse[BaiDuItem]):
     解析完整的百度识图API响应，包含相似图片和相同图片的搜索结果
     """
     
+    engine = "baidu"
+    
     def __init__(self, resp_data: dict[str, Any], resp_url: str, **kwargs: Any):
         """
         初始化百度识图响应解析器
@@ -62,13 +67,28 @@ class BaiDuResponse(BaseSearchResponse[BaiDuItem]):
             resp_data: 原始响应数据
             **kwargs: 其他解析参数
         """
-        self.raw: list[BaiDuItem] = []
-        self.exact_matches: list[BaiDuItem] = []
+        self.raw: LazyItemList[BaiDuItem] = self._lazy_items(BaiDuItem)
+        self.exact_matches: LazyItemList[BaiDuItem] = self._lazy_items(BaiDuItem)
         if same_data := resp_data.get("same"):
             if "list" in same_data:
-                self.exact_matches.extend(BaiDuItem(i) for i in same_data["list"] if "url" in i and "image_src" in i)
+                self.exact_matches.feed(i for i in same_data["list"] if "url" in i and "image_src" in i)
         if data_list := deep_get(resp_data, "data.list"):
-            self.raw.extend([BaiDuItem(i) for i in data_list])
+            self.raw.feed(data_list)
+
+    @override
+    def to_records(self, limit: Optional[int] = None) -> list[ResultRecord]:
+        """
+        转换为结构化结果，相同图片排在相似图片之前
+        
+        参数:
+            limit: 最多转换的相似图片数量，None表示使用record_limit，0表示全部
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        records = [ResultRecord(self.engine, url=item.url, title=item.title, thumbnail=item.thumbnail,
+                                extra={"match": "exact"}) for item in self.exact_matches]
+        return records + super().to_records(limit)
             
     def show_result(self) -> str:
         """
@@ -1,25 +1,96 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar, Union, overload
+from lxml import etree
+from pyquery import PyQuery
+from ..result_record import ResultRecord, SearchResult
 
 T = TypeVar("T")
 
+_UNPARSED = object()
+
+_keep_origin = False
+
+
+def set_keep_origin(enabled: bool) -> None:
+    """
+    设置是否在解析结果中保留原始数据(origin)
+    
+    默认不保留，解析完成后即可释放完整的DOM树或JSON数据，仅在调试时开启
+    
+    参数:
+        enabled: 是否保留原始数据
+    """
+    global _keep_origin
+    _keep_origin = bool(enabled)
+
+
+def keep_origin() -> bool:
+    """
+    获取当前是否保留原始数据
+    
+    返回:
+        bool: 处于调试模式时返回True
+    """
+    return _keep_origin
+
+
+class _Fragment:
+    """
+    序列化后的DOM片段，解析时再还原为元素
+    """
+
+    __slots__ = ("data", "wrapped")
+
+    def __init__(self, data: list[bytes], wrapped: bool):
+        self.data: list[bytes] = data
+        self.wrapped: bool = wrapped
+
+    def restore(self) -> Any:
+        elements = [etree.fromstring(data) for data in self.data]
+        return PyQuery(elements) if self.wrapped else elements[0]
+
+
+def detach_source(source: Any) -> Any:
+    """
+    将待解析的DOM节点序列化为独立的片段，其他数据原样返回
+    
+    未解析的结果项只保留自身子树的序列化文本，解析完成后即可释放完整的DOM树；
+    结果项的选择器只在自身子树内查询，解析结果不受影响
+    
+    参数:
+        source: 结果项的原始数据
+        
+    返回:
+        Any: DOM片段或原始数据
+    """
+    if isinstance(source, PyQuery):
+        return _Fragment([etree.tostring(element, with_tail=False) for element in source], True)
+    if isinstance(source, etree._Element):
+        return _Fragment([etree.tostring(source, with_tail=False)], False)
+    return source
+
 
 class BaseResParser(ABC):
     """
     响应项解析基类
     
-    解析单个搜索结果项的基类，提供通用的属性和解析接口
+    解析单个搜索结果项的基类，提供通用的属性和解析接口，
+    子类需通过__slots__声明自身的属性以减少内存占用
     """
+
+    __slots__ = ("origin", "url", "thumbnail", "title", "similarity")
     
     def __init__(self, data: Any, **kwargs: Any):
         """
         初始化响应项解析器
         
         参数:
-            data: 原始响应数据
+            data: 原始响应数据，仅在调试模式下保存到origin
             **kwargs: 其他解析参数
         """
-        self.origin: Any = data
+        self.origin: Any = data if _keep_origin else None
         self.url: str = ""
         self.thumbnail: str = ""
         self.title: str = ""
@@ -41,12 +112,144 @@ class BaseResParser(ABC):
         pass
 
 
+class LazyItemList(Sequence[T]):
+    """
+    惰性结果项列表
+    
+    保存未解析的原始数据，仅在某一项首次被访问时调用工厂函数解析并缓存，
+    只展示前几项结果时可以跳过其余项的解析；DOM节点在追加时序列化为独立的片段，
+    不会让整棵DOM树随响应对象一直存活
+    """
+
+    def __init__(self, factory: Optional[Callable[[Any], T]] = None, limit: int = 0):
+        """
+        初始化惰性结果项列表
+        
+        参数:
+            factory: 将原始数据解析为结果项的函数
+            limit: 最多保留的结果项数量，0表示不限制
+        """
+        self.factory: Optional[Callable[[Any], T]] = factory
+        self.limit: int = max(0, int(limit or 0))
+        self._sources: list[Any] = []
+        self._items: list[Any] = []
+
+    def feed(self, sources: Iterable[Any]) -> None:
+        """
+        追加待解析的原始数据，超出数量上限的部分不会被读取，DOM节点会被序列化为独立的片段
+        
+        参数:
+            sources: 原始数据的可迭代对象
+        """
+        if self.limit:
+            sources = islice(sources, max(0, self.limit - len(self._sources)))
+        for source in sources:
+            self._sources.append(detach_source(source))
+            self._items.append(_UNPARSED)
+
+    def append(self, item: T) -> None:
+        """
+        追加已解析的结果项
+        
+        参数:
+            item: 结果项
+        """
+        self._sources.append(None)
+        self._items.append(item)
+
+    def extend(self, items: Iterable[T]) -> None:
+        """
+        追加多个结果项，来自另一个惰性列表时保留其未解析状态
+        
+        参数:
+            items: 结果项的可迭代对象
+        """
+        if isinstance(items, LazyItemList) and items.factory is self.factory:
+            self._sources.extend(items._sources)
+            self._items.extend(items._items)
+        else:
+            for item in items:
+                self.append(item)
+
+    def _materialize(self, index: int) -> T:
+        """
+        解析并缓存指定位置的结果项
+        
+        参数:
+            index: 非负下标
+        
+        返回:
+            T: 结果项
+        """
+        item = self._items[index]
+        if item is _UNPARSED:
+            source = self._sources[index]
+            if isinstance(source, _Fragment):
+                source = source.restore()
+            item = self._items[index] = self.factory(source)
+            self._sources[index] = None
+        return item
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, list[T]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self._items)))]
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError("list index out of range")
+        return self._materialize(index)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self._sources[index]
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(len(self._items)):
+            yield self._materialize(index)
+
+    def __add__(self, other: Iterable[T]) -> list[T]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[T]) -> list[T]:
+        return [*other, *self]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyItemList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        parsed = sum(item is not _UNPARSED for item in self._items)
+        return f"<LazyItemList {parsed}/{len(self._items)} parsed>"
+
+    def materialize(self) -> None:
+        """
+        解析所有尚未解析的结果项并释放对应的原始数据
+        """
+        for index in range(len(self._items)):
+            self._materialize(index)
+
+
 class BaseSearchResponse(ABC, Generic[T]):
     """
     搜索响应基类
     
     解析完整搜索响应的基类，包含多个搜索结果项
+    
+    engine为引擎名称，record_limit为to_records默认输出的结果数量(0表示全部)
     """
+
+    engine: str = ""
+    record_limit: int = 0
     
     def __init__(self, resp_data: Any, resp_url: str, **kwargs: Any):
         """
@@ -55,13 +258,42 @@ class BaseSearchResponse(ABC, Generic[T]):
         参数:
             resp_data: 原始响应数据
             resp_url: 响应URL
-            **kwargs: 其他解析参数
+            **kwargs: 其他解析参数，limit为最多解析的结果项数量(0表示不限制)
         """
-        self.origin: Any = resp_data
+        self.origin: Any = resp_data if _keep_origin else None
         self.url: str = resp_url
-        self.raw: list[T] = []
+        self.limit: int = max(0, int(kwargs.get("limit") or 0))
+        self.raw: LazyItemList[T] = LazyItemList(limit=self.limit)
         self._parse_response(resp_data, resp_url=resp_url, **kwargs)
 
+    def _lazy_items(self, factory: Callable[[Any], T], sources: Iterable[Any] = ()) -> LazyItemList[T]:
+        """
+        创建按需解析的结果项列表，遵循limit解析选项
+        
+        参数:
+            factory: 将原始数据解析为结果项的函数
+            sources: 原始数据的可迭代对象
+        
+        返回:
+            LazyItemList[T]: 惰性结果项列表
+        """
+        items = LazyItemList(factory, self.limit)
+        items.feed(sources)
+        return items
+
+    def compact(self) -> None:
+        """
+        解析所有待解析的结果项并释放原始数据
+        
+        未解析的结果项会引用各自的DOM片段或JSON数据，需要长期保存响应对象时调用，
+        以便释放这些原始数据
+        """
+        for value in vars(self).values():
+            if isinstance(value, LazyItemList):
+                value.materialize()
+        if not _keep_origin:
+            self.origin = None
+
     @abstractmethod
     def _parse_response(self, resp_data: Any, **kwargs: Any) -> None:
         """
@@ -76,6 +308,62 @@ class BaseSearchResponse(ABC, Generic[T]):
         """
         pass
         
+    def _item_records(self, item: T) -> list[ResultRecord]:
+        """
+        将单个结果项转换为结构化结果，子类可重写以填充引擎特有字段
+        
+        参数:
+            item: 结果项
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        return [ResultRecord(
+            self.engine,
+            url=item.url,
+            title=item.title,
+            similarity=item.similarity or None,
+            thumbnail=item.thumbnail,
+        )]
+
+    def _result_extra(self) -> dict[str, Any]:
+        """
+        获取引擎级别的附加信息，子类可重写
+        
+        返回:
+            dict[str, Any]: 附加信息
+        """
+        return {}
+
+    def to_records(self, limit: Optional[int] = None) -> list[ResultRecord]:
+        """
+        将结果项转换为与引擎无关的结构化结果，只解析需要输出的结果项
+        
+        参数:
+            limit: 最多转换的结果项数量，None表示使用record_limit，0表示全部
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        limit = self.record_limit if limit is None else limit
+        items = self.raw[:limit] if limit > 0 else self.raw
+        records: list[ResultRecord] = []
+        for item in items:
+            records.extend(self._item_records(item))
+        return records
+
+    def to_result(self, limit: Optional[int] = None) -> SearchResult:
+        """
+        生成结构化的搜索结果
+        
+        参数:
+            limit: 最多转换的结果项数量，含义同to_records
+            
+        返回:
+            SearchResult: 搜索结果
+        """
+        return SearchResult(self.engine, self.to_records(limit), self._result_extra())
+
     @abstractmethod
     def show_result(self) -> str:
         """
@@ -1,6 +1,7 @@
 from typing import Any, Callable, Optional
 from typing_extensions import override
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class BingItem(BaseResParser):
@@ -10,6 +11,8 @@ class BingItem(BaseResParser):
     解析单个搜索结果，提取标题、URL和缩略图等信息
     """
     
+    __slots__ = ("image_url",)
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any):
         """
         初始化Bing结果项解析器
@@ -42,6 +45,8 @@ class RelatedSearchItem:
     解析相关搜索建议，包含文本和缩略图
     """
     
+    __slots__ = ("text", "thumbnail")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化相关搜索项解析器
@@ -60,6 +65,8 @@ class PagesIncludingItem:
     解析包含该图像的网页信息
     """
     
+    __slots__ = ("name", "thumbnail", "url", "image_url")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化包含页面项解析器
@@ -80,6 +87,8 @@ class VisualSearchItem:
     解析视觉相似的图像信息
     """
     
+    __slots__ = ("name", "thumbnail", "url", "image_url")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化视觉搜索项解析器
@@ -100,6 +109,8 @@ class Attraction:
     解析旅行相关的景点信息
     """
     
+    __slots__ = ("url", "title", "search_url", "interest_types")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化景点信息解析器
@@ -120,6 +131,8 @@ class TravelCard:
     解析旅行相关的卡片信息
     """
     
+    __slots__ = ("card_type", "title", "url", "image_url", "image_source_url")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化旅行卡片解析器
@@ -141,6 +154,8 @@ class TravelInfo:
     解析旅行相关的综合信息，包含目的地、景点和卡片等
     """
     
+    __slots__ = ("destination_name", "travel_guide_url", "attractions", "travel_cards")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化旅行信息解析器
@@ -161,6 +176,8 @@ class EntityItem:
     解析识别出的实体信息，如人物、地点等
     """
     
+    __slots__ = ("name", "thumbnail", "description", "profiles", "short_description")
+    
     def __init__(self, data: dict[str, Any]):
         """
         初始化实体信息解析器
@@ -190,6 +207,8 @@ class BingResponse(BaseSearchResponse[BingItem]):
     解析完整的Bing图像搜索API响应，包含多种类型的搜索结果
     """
     
+    engine = "bing"
+    
     def __init__(self, resp_data: dict[str, Any], resp_url: str, **kwargs: Any):
         """
         初始化Bing响应解析器
@@ -210,8 +229,8 @@ class BingResponse(BaseSearchResponse[BingItem]):
             resp_data: 原始响应数据
             **kwargs: 其他解析参数
         """
-        self.pages_including: list[PagesIncludingItem] = []
-        self.visual_search: list[VisualSearchItem] = []
+        self.pages_including: LazyItemList[PagesIncludingItem] = self._lazy_items(PagesIncludingItem)
+        self.visual_search: LazyItemList[VisualSearchItem] = self._lazy_items(VisualSearchItem)
         self.related_searches: list[RelatedSearchItem] = []
         self.best_guess: Optional[str] = None
         self.travel: Optional[TravelInfo] = None
@@ -248,7 +267,7 @@ class BingResponse(BaseSearchResponse[BingItem]):
             action: 动作数据
         """
         if value := action.get("data", {}).get("value"):
-            self.pages_including.extend([PagesIncludingItem(val) for val in value])
+            self.pages_including.feed(value)
 
     def _handle_visual_search(self, action: dict[str, Any]) -> None:
         """
@@ -258,7 +277,7 @@ class BingResponse(BaseSearchResponse[BingItem]):
             action: 动作数据
         """
         if value := action.get("data", {}).get("value"):
-            self.visual_search.extend([VisualSearchItem(val) for val in value])
+            self.visual_search.feed(value)
 
     def _handle_related_searches(self, action: dict[str, Any]) -> None:
         """
@@ -297,6 +316,31 @@ class BingResponse(BaseSearchResponse[BingItem]):
         """
         if data := action.get("data"):
             self.entities.append(EntityItem(data))
+
+    @override
+    def to_records(self, limit: Optional[int] = None) -> list[ResultRecord]:
+        """
+        将包含页面和视觉搜索结果转换为结构化结果
+        
+        参数:
+            limit: 最多转换的结果数量，None表示使用record_limit，0表示全部
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        limit = self.record_limit if limit is None else limit
+        records = []
+        for items in (self.pages_including, self.visual_search):
+            for item in items:
+                if limit > 0 and len(records) >= limit:
+                    return records
+                records.append(ResultRecord(self.engine, url=item.url, title=item.name, thumbnail=item.thumbnail,
+                                            extra={"image_url": item.image_url}))
+        return records
+
+    @override
+    def _result_extra(self) -> dict[str, Any]:
+        return {"best_guess": self.best_guess} if self.best_guess else {}
             
     def show_result(self) -> str:
         """
@@ -306,7 +350,7 @@ class BingResponse(BaseSearchResponse[BingItem]):
             str: 格式化的搜索结果文本
         """
         lines = ["-" * 50]
-        combined = (self.pages_including or []) + (self.visual_search or [])
+        combined = [*self.pages_including, *self.visual_search]
         if combined:
             for idx, item in enumerate(combined, 1):
                 lines.append(f"结果 #{idx}")
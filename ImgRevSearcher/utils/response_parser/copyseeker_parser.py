@@ -1,6 +1,6 @@
 from typing import Any, Optional
 from typing_extensions import override
-from .base_parser import BaseResParser, BaseSearchResponse
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class CopyseekerItem(BaseResParser):
@@ -10,6 +10,8 @@ class CopyseekerItem(BaseResParser):
     解析单个匹配结果，提取URL、标题和缩略图等信息
     """
     
+    __slots__ = ("thumbnail_list", "website_rank")
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any):
         """
         初始化Copyseeker结果项解析器
@@ -43,6 +45,9 @@ class CopyseekerResponse(BaseSearchResponse[CopyseekerItem]):
     解析完整的Copyseeker API响应，包含匹配结果、相似图片和EXIF信息等
     """
     
+    engine = "copyseeker"
+    record_limit = 1
+    
     def __init__(self, resp_data: dict[str, Any], resp_url: str, **kwargs: Any) -> None:
         """
         初始化Copyseeker响应解析器
@@ -69,8 +74,12 @@ class CopyseekerResponse(BaseSearchResponse[CopyseekerItem]):
         self.entities: Optional[str] = resp_data.get("entities")
         self.total: int = resp_data["totalLinksFound"]
         self.exif: dict[str, Any] = resp_data.get("exif", {})
-        self.raw: list[CopyseekerItem] = [CopyseekerItem(page) for page in resp_data.get("pages", [])]
+        self.raw: LazyItemList[CopyseekerItem] = self._lazy_items(CopyseekerItem, resp_data.get("pages", []))
         self.similar_image_urls: list[str] = resp_data.get("visuallySimilarImages", [])
+
+    @override
+    def _result_extra(self) -> dict[str, Any]:
+        return {"similar_images": self.similar_image_urls} if self.similar_image_urls else {}
         
     def show_result(self) -> str:
         """
@@ -1,10 +1,35 @@
-from typing import Any
+from typing import Any, Optional, Union
+import asyncio
 import json
 from pathlib import Path
 from pyquery import PyQuery
 from typing_extensions import override
-from ..ext_tools import parse_html
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..ext_tools import HTMLItemStream, parse_html
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList, keep_origin
+
+DEFAULT_TRANSLATIONS_FILE = "resource/translations/ehviewer_translations.json"
+# 已加载的翻译数据，按文件路径缓存，翻译文件只在首次使用时读取一次
+_translations_cache: dict[str, dict[str, Any]] = {}
+
+
+def is_gallery_element(element: Any) -> bool:
+    """
+    判断元素是否为搜索结果中的画廊，与EHentaiResponse的选择规则一致：
+    .itg下含<td>的<tr>(列表视图)或.gl1t(缩略图视图)
+    
+    参数:
+        element: lxml元素
+        
+    返回:
+        bool: 是画廊元素时返回True
+    """
+    parent = element.getparent()
+    if parent is None or "itg" not in (parent.get("class") or "").split():
+        return False
+    if element.tag == "tr":
+        return any(child.tag == "td" for child in element)
+    return "gl1t" in (element.get("class") or "").split()
 
 
 class EHentaiItem(BaseResParser):
@@ -14,6 +39,8 @@ class EHentaiItem(BaseResParser):
     解析单个画廊结果，提取标题、URL、缩略图、类型、日期、页数和标签等信息
     """
     
+    __slots__ = ("type", "date", "pages", "tags")
+    
     def __init__(self, data: PyQuery, **kwargs: Any):
         """
         初始化E-Hentai结果项解析器
@@ -76,63 +103,103 @@ class EHentaiResponse(BaseSearchResponse[EHentaiItem]):
     """
     E-Hentai搜索响应解析器
     
-    解析完整的E-Hentai搜索响应，包含多个画廊结果
+    解析完整的E-Hentai搜索响应，包含多个画廊结果；也可以传入以is_gallery_element
+    收集画廊的HTMLItemStream，此时只包含停止读取之前出现的画廊
     """
     
-    def __init__(self, resp_data: str, resp_url: str, **kwargs: Any):
+    engine = "ehentai"
+    record_limit = 1
+    
+    def __init__(self, resp_data: Union[str, HTMLItemStream], resp_url: str, **kwargs: Any):
         """
         初始化E-Hentai响应解析器
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据或已结束的增量解析器
             resp_url: 响应URL
             **kwargs: 其他解析参数
         """
         super().__init__(resp_data, resp_url, **kwargs)
 
     @override
-    def _parse_response(self, resp_data: str, **kwargs: Any) -> None:
+    def _parse_response(self, resp_data: Union[str, HTMLItemStream], **kwargs: Any) -> None:
         """
         解析E-Hentai响应数据
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据或已结束的增量解析器
             **kwargs: 其他解析参数
         """
+        if isinstance(resp_data, HTMLItemStream):
+            data = resp_data.close()
+            self.origin: Optional[PyQuery] = data if keep_origin() else None
+            self.raw: LazyItemList[EHentaiItem] = self._lazy_items(EHentaiItem)
+            if "No unfiltered results" not in data.text():
+                self.raw.feed(PyQuery(element) for element in resp_data.items)
+            return
         data = parse_html(resp_data)
-        self.origin: PyQuery = data
+        self.origin = data if keep_origin() else None
+        self.raw = self._lazy_items(EHentaiItem)
         if "No unfiltered results" in resp_data:
-            self.raw: list[EHentaiItem] = []
+            return
         elif tr_items := data.find(".itg").children("tr").items():
-            self.raw = [EHentaiItem(i) for i in tr_items if i.children("td")]
+            self.raw.feed(i for i in tr_items if i.children("td"))
         else:
-            gl1t_items = data.find(".itg").children(".gl1t").items()
-            self.raw = [EHentaiItem(i) for i in gl1t_items]
+            self.raw.feed(data.find(".itg").children(".gl1t").items())
             
-    def show_result(self, translations_file: str = "resource/translations/ehviewer_translations.json") -> str:
+    @staticmethod
+    def _load_translations(translations_file: str) -> dict[str, Any]:
         """
-        生成可读的搜索结果文本
-        
-        支持使用翻译文件将标签翻译为本地语言
+        加载标签翻译文件，成功加载的数据会被缓存，加载失败时下次使用会重试
         
         参数:
-            translations_file: 翻译文件路径
+            translations_file: 相对于ImgRevSearcher目录的翻译文件路径
             
         返回:
-            str: 格式化的搜索结果文本
+            dict[str, Any]: 翻译数据，加载失败时为空字典
         """
+        if translations_file in _translations_cache:
+            return _translations_cache[translations_file]
         try:
             base_dir = Path(__file__).parent.parent.parent
             abs_translations_file = base_dir / translations_file
             with open(abs_translations_file, 'r', encoding='utf-8') as f:
                 translations = json.load(f)
         except Exception as e:
-            translations = {}
             print(f"加载翻译文件失败: {e}")
-        if not self.raw:
-            return "未找到匹配结果"
+            return {}
+        _translations_cache[translations_file] = translations
+        return translations
+
+    @classmethod
+    async def load_translations_async(cls, translations_file: str = DEFAULT_TRANSLATIONS_FILE) -> dict[str, Any]:
+        """
+        在线程池中预加载标签翻译文件，之后同步的to_records与show_result直接使用缓存
+        
+        参数:
+            translations_file: 相对于ImgRevSearcher目录的翻译文件路径
+            
+        返回:
+            dict[str, Any]: 翻译数据，加载失败时为空字典
+        """
+        if translations_file in _translations_cache:
+            return _translations_cache[translations_file]
+        return await asyncio.to_thread(cls._load_translations, translations_file)
+
+    @staticmethod
+    def _translate_item(item: EHentaiItem, translations: dict[str, Any]) -> tuple[str, list[str]]:
+        """
+        翻译结果项的类型和标签，标签按分类合并
+        
+        参数:
+            item: 结果项
+            translations: 翻译数据
+            
+        返回:
+            tuple[str, list[str]]: 翻译后的类型和每个分类一行的标签
+        """
         categorized_tags = {}
-        for tag in self.raw[0].tags:
+        for tag in item.tags:
             if ':' in tag:
                 category, tag_name = tag.split(':', 1)
                 category_cn = translations.get('rows', {}).get(category, category)
@@ -146,7 +213,58 @@ class EHentaiResponse(BaseSearchResponse[EHentaiItem]):
         for category, tags in categorized_tags.items():
             tag_line = f"{category}: {'; '.join(tags)}"
             tag_lines.append(tag_line)
-        type_cn = translations.get('reclass', {}).get(self.raw[0].type.lower(), self.raw[0].type)
+        type_cn = translations.get('reclass', {}).get(item.type.lower(), item.type)
+        return type_cn, tag_lines
+
+    @override
+    def to_records(
+        self,
+        limit: Optional[int] = None,
+        translations_file: str = DEFAULT_TRANSLATIONS_FILE,
+    ) -> list[ResultRecord]:
+        """
+        转换为结构化结果，类型和标签按翻译文件翻译
+        
+        参数:
+            limit: 最多转换的结果项数量，None表示使用record_limit，0表示全部
+            translations_file: 翻译文件路径
+            
+        返回:
+            list[ResultRecord]: 结构化结果列表
+        """
+        limit = self.record_limit if limit is None else limit
+        items = self.raw[:limit] if limit > 0 else self.raw
+        if not items:
+            return []
+        translations = self._load_translations(translations_file)
+        records = []
+        for item in items:
+            type_cn, tag_lines = self._translate_item(item, translations)
+            records.append(ResultRecord(
+                self.engine,
+                url=item.url,
+                title=item.title,
+                thumbnail=item.thumbnail,
+                extra={"date": item.date, "type": type_cn, "pages": item.pages, "tags": tag_lines},
+            ))
+        return records
+            
+    def show_result(self, translations_file: str = DEFAULT_TRANSLATIONS_FILE) -> str:
+        """
+        生成可读的搜索结果文本
+        
+        支持使用翻译文件将标签翻译为本地语言
+        
+        参数:
+            translations_file: 翻译文件路径
+            
+        返回:
+            str: 格式化的搜索结果文本
+        """
+        translations = self._load_translations(translations_file)
+        if not self.raw:
+            return "未找到匹配结果"
+        type_cn, tag_lines = self._translate_item(self.raw[0], translations)
         lines = [f"结果 #1", f"链接: {self.raw[0].url}", f"上传时间: {self.raw[0].date}",
                 f"标题: {self.raw[0].title}", f"类型: {type_cn}", f"页数: {self.raw[0].pages}", "标签:"]
         lines.extend([f"  {tag_line}" for tag_line in tag_lines])
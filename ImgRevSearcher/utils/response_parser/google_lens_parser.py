@@ -1,11 +1,17 @@
 import re
 from ast import literal_eval
-from typing import Any, Optional
+from typing import Any, Optional, Union
 from urllib.parse import urlparse
 from pyquery import PyQuery
 from typing_extensions import override
-from ..ext_tools import parse_html
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..ext_tools import HTMLItemStream, parse_html
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList, keep_origin
+
+
+# 结果项与其缩略图的选择器，键为是否为精确匹配结果页
+ITEM_SELECTORS = {False: ".vEWxFf.RCxtQc.my5z3d", True: ".YxbOwd"}
+THUMBNAIL_SELECTORS = {False: ".gdOPf.q07dbf.uhHOwf.ez24Df img", True: ".GmoL0c .zVq10e img"}
 
 
 def get_site_name(url: Optional[str]) -> str:
@@ -99,13 +105,84 @@ def extract_image_maps(html: PyQuery) -> tuple[dict[str, str], dict[str, str]]:
     return image_url_map, base64_image_map
 
 
+class GoogleLensStream(HTMLItemStream):
+    """
+    Google Lens结果页的增量解析器
+    
+    收集到所需数量的结果项后，如果其缩略图引用的图像ID还没有出现在已解析的
+    google.ldi或_setImagesSrc脚本中，则继续读取直到全部出现或响应体结束
+    """
+    
+    def __init__(self, exact_matches: bool, max_results: int = 0, limit: int = 0):
+        """
+        初始化Google Lens结果页的增量解析器
+        
+        参数:
+            exact_matches: 是否为精确匹配结果页
+            max_results: 最大结果数量，0表示不限制
+            limit: 最多解析的结果项数量，0表示不限制
+        """
+        counts = [count for count in (max_results, limit) if count > 0]
+        super().__init__(ITEM_SELECTORS[exact_matches], min(counts, default=0), script_selector="script[nonce]")
+        self.exact_matches: bool = exact_matches
+        self.image_url_map: dict[str, str] = {}
+        self.base64_image_map: dict[str, str] = {}
+        self._pending: Optional[set[str]] = None
+
+    @override
+    def on_script(self, text: str) -> None:
+        extract_ldi_images(text, self.image_url_map)
+        extract_base64_images(text, self.base64_image_map)
+
+    @property
+    @override
+    def done(self) -> bool:
+        if not self.full:
+            return False
+        if self._pending is None:
+            self._pending = set()
+            for element in self.items:
+                image = PyQuery(element)(THUMBNAIL_SELECTORS[self.exact_matches])
+                if image_id := image.attr("data-iid") or image.attr("id"):
+                    self._pending.add(image_id)
+        self._pending = {
+            image_id for image_id in self._pending
+            if image_id not in self.image_url_map and image_id not in self.base64_image_map
+        }
+        return not self._pending
+
+
+def load_lens_page(
+    resp_data: Union[str, PyQuery, GoogleLensStream], exact_matches: bool
+) -> tuple[PyQuery, list[Any], dict[str, str], dict[str, str]]:
+    """
+    获取结果页的文档、结果项元素与图像映射
+    
+    参数:
+        resp_data: HTML字符串、已解析的文档或已结束的增量解析器
+        exact_matches: 是否为精确匹配结果页
+        
+    返回:
+        tuple[PyQuery, list[Any], dict[str, str], dict[str, str]]: 文档(增量解析提前停止时只包含已读取部分)、
+            结果项元素、图像URL映射和Base64图像映射
+    """
+    if isinstance(resp_data, GoogleLensStream):
+        return resp_data.close(), resp_data.items, resp_data.image_url_map, resp_data.base64_image_map
+    html = resp_data if isinstance(resp_data, PyQuery) else parse_html(resp_data)
+    image_url_map, base64_image_map = extract_image_maps(html)
+    return html, list(html(ITEM_SELECTORS[exact_matches])), image_url_map, base64_image_map
+
+
 class GoogleLensBaseItem(BaseResParser):
     """
     Google Lens基础结果项解析器
     
-    所有Google Lens结果项的基类，提供图像URL提取等共享功能
+    所有Google Lens结果项的基类，提供图像URL提取等共享功能，
+    图像映射仅在解析时使用，不会保存在结果项中
     """
     
+    __slots__ = ()
+    
     def __init__(
         self,
         data: PyQuery,
@@ -122,9 +199,7 @@ class GoogleLensBaseItem(BaseResParser):
             base64_image_map: 图像ID到Base64数据的映射
             **kwargs: 其他解析参数
         """
-        self.image_url_map: dict[str, str] = image_url_map
-        self.base64_image_map: dict[str, str] = base64_image_map
-        super().__init__(data, **kwargs)
+        super().__init__(data, image_url_map=image_url_map, base64_image_map=base64_image_map, **kwargs)
 
     @override
     def _parse_data(self, data: PyQuery, **kwargs: Any) -> None:
@@ -137,12 +212,17 @@ class GoogleLensBaseItem(BaseResParser):
         """
         pass
 
-    def _extract_image_url(self, image_element: PyQuery) -> str:
+    @staticmethod
+    def _extract_image_url(
+        image_element: PyQuery, image_url_map: dict[str, str], base64_image_map: dict[str, str]
+    ) -> str:
         """
         从图像元素中提取URL
         
         参数:
             image_element: 包含图像的PyQuery元素
+            image_url_map: 图像ID到URL的映射
+            base64_image_map: 图像ID到Base64数据的映射
             
         返回:
             str: 图像URL或Base64数据
@@ -152,7 +232,7 @@ class GoogleLensBaseItem(BaseResParser):
         
         image_id = image_element.attr("data-iid") or image_element.attr("id")
         if image_id:
-            return self.image_url_map.get(image_id, "") or self.base64_image_map.get(image_id, "")
+            return image_url_map.get(image_id, "") or base64_image_map.get(image_id, "")
             
         return image_element.attr("data-src") or image_element.attr("src") or ""
 
@@ -164,6 +244,8 @@ class GoogleLensItem(GoogleLensBaseItem):
     解析常规搜索结果中的单个项目
     """
     
+    __slots__ = ("site_name",)
+    
     def __init__(
         self,
         data: PyQuery,
@@ -201,7 +283,9 @@ class GoogleLensItem(GoogleLensBaseItem):
             self.site_name: str = site_name_element.text()
         else:
             self.site_name = get_site_name(self.url)
-        self.thumbnail: str = self._extract_image_url(image_element)
+        self.thumbnail: str = self._extract_image_url(
+            image_element, kwargs["image_url_map"], kwargs["base64_image_map"]
+        )
 
 
 class GoogleLensRelatedSearchItem(GoogleLensBaseItem):
@@ -211,6 +295,8 @@ class GoogleLensRelatedSearchItem(GoogleLensBaseItem):
     解析相关搜索建议中的单个项目
     """
     
+    __slots__ = ()
+    
     def __init__(
         self,
         data: PyQuery,
@@ -243,45 +329,53 @@ class GoogleLensRelatedSearchItem(GoogleLensBaseItem):
         if url_el and url_el.attr("href"):
             self.url: str = f"https://www.google.com{url_el.attr('href')}"
         self.title: str = data(".I9S4yc").text()
-        self.thumbnail: str = self._extract_image_url(image_element)
+        self.thumbnail: str = self._extract_image_url(
+            image_element, kwargs["image_url_map"], kwargs["base64_image_map"]
+        )
 
 
 class GoogleLensResponse(BaseSearchResponse[GoogleLensItem]):
     """
     Google Lens搜索响应解析器
     
-    解析完整的Google Lens API响应，包含常规搜索结果和相关搜索建议
+    解析完整的Google Lens API响应，包含常规搜索结果和相关搜索建议；
+    由GoogleLensStream增量解析时，相关搜索只包含停止读取之前出现的部分
     """
     
-    def __init__(self, resp_data: str, resp_url: str, **kwargs: Any):
+    engine = "google"
+    
+    def __init__(self, resp_data: Union[str, PyQuery, GoogleLensStream], resp_url: str, **kwargs: Any):
         """
         初始化Google Lens响应解析器
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据、已解析的文档或已结束的增量解析器
             resp_url: 响应URL
             **kwargs: 其他解析参数
         """
         super().__init__(resp_data, resp_url, **kwargs)
 
     def _parse_search_items(
-        self, html: PyQuery, image_url_map: dict[str, str], base64_image_map: dict[str, str], max_results: int = 0
+        self,
+        items_elements: list[Any],
+        image_url_map: dict[str, str],
+        base64_image_map: dict[str, str],
+        max_results: int = 0,
     ) -> None:
         """
         解析搜索结果项
         
         参数:
-            html: PyQuery对象，包含完整HTML
+            items_elements: 结果项元素
             image_url_map: 图像ID到URL的映射
             base64_image_map: 图像ID到Base64数据的映射
             max_results: 最大结果数量，0表示不限制
         """
-        items_elements = html(".vEWxFf.RCxtQc.my5z3d")
-        for idx, el in enumerate(items_elements):
-            if max_results > 0 and idx >= max_results:
-                break
-            item = GoogleLensItem(PyQuery(el), image_url_map, base64_image_map)
-            self.raw.append(item)
+        if max_results > 0:
+            items_elements = items_elements[:max_results]
+        self.raw = self._lazy_items(
+            lambda el: GoogleLensItem(PyQuery(el), image_url_map, base64_image_map), items_elements
+        )
 
     def _parse_related_searches(
         self, html: PyQuery, image_url_map: dict[str, str], base64_image_map: dict[str, str]
@@ -300,23 +394,27 @@ class GoogleLensResponse(BaseSearchResponse[GoogleLensItem]):
             self.related_searches.append(related_item)
 
     @override
-    def _parse_response(self, resp_data: str, **kwargs: Any) -> None:
+    def _parse_response(self, resp_data: Union[str, PyQuery, GoogleLensStream], **kwargs: Any) -> None:
         """
         解析Google Lens响应数据
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据、已解析的文档或已结束的增量解析器
             **kwargs: 其他解析参数
         """
-        html = parse_html(resp_data)
-        self.origin: PyQuery = html
+        html, items_elements, image_url_map, base64_image_map = load_lens_page(resp_data, exact_matches=False)
+        self.origin: Optional[PyQuery] = html if keep_origin() else None
         self.url: str = kwargs.get("resp_url", "")
-        self.raw: list[GoogleLensItem] = []
+        self.raw: LazyItemList[GoogleLensItem] = LazyItemList(limit=self.limit)
         self.related_searches: list[GoogleLensRelatedSearchItem] = []
         max_results = kwargs.get("max_results", 0)
-        image_url_map, base64_image_map = extract_image_maps(html)
-        self._parse_search_items(html, image_url_map, base64_image_map, max_results)
+        self._parse_search_items(items_elements, image_url_map, base64_image_map, max_results)
         self._parse_related_searches(html, image_url_map, base64_image_map)
+
+    @override
+    def _item_records(self, item: GoogleLensItem) -> list[ResultRecord]:
+        return [ResultRecord(self.engine, url=item.url, title=item.title, thumbnail=item.thumbnail,
+                             extra={"site_name": item.site_name})]
         
     def show_result(self) -> str:
         """
@@ -343,6 +441,8 @@ class GoogleLensExactMatchesItem(GoogleLensBaseItem):
     解析精确匹配搜索结果中的单个项目
     """
     
+    __slots__ = ("site_name", "size")
+    
     def __init__(
         self,
         data: PyQuery,
@@ -382,7 +482,9 @@ class GoogleLensExactMatchesItem(GoogleLensBaseItem):
         else:
             self.site_name = get_site_name(self.url)
         self.size: Optional[str] = parse_image_size(info_div)
-        self.thumbnail: str = self._extract_image_url(image_element)
+        self.thumbnail: str = self._extract_image_url(
+            image_element, kwargs["image_url_map"], kwargs["base64_image_map"]
+        )
 
 
 class GoogleLensExactMatchesResponse(BaseSearchResponse[GoogleLensExactMatchesItem]):
@@ -392,12 +494,14 @@ class GoogleLensExactMatchesResponse(BaseSearchResponse[GoogleLensExactMatchesIt
     解析完整的Google Lens精确匹配API响应
     """
     
-    def __init__(self, resp_data: str, resp_url: str, **kwargs: Any):
+    engine = "google"
+    
+    def __init__(self, resp_data: Union[str, PyQuery, GoogleLensStream], resp_url: str, **kwargs: Any):
         """
         初始化Google Lens精确匹配响应解析器
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据、已解析的文档或已结束的增量解析器
             resp_url: 响应URL
             **kwargs: 其他解析参数
         """
@@ -405,48 +509,54 @@ class GoogleLensExactMatchesResponse(BaseSearchResponse[GoogleLensExactMatchesIt
 
     @staticmethod
     def _parse_search_items(
-        html: PyQuery,
+        items_elements: list[Any],
         image_url_map: dict[str, str],
         base64_image_map: dict[str, str],
         max_results: int = 0,
-    ) -> list[GoogleLensExactMatchesItem]:
+        limit: int = 0,
+    ) -> LazyItemList[GoogleLensExactMatchesItem]:
         """
         解析精确匹配搜索结果项
         
         参数:
-            html: PyQuery对象，包含完整HTML
+            items_elements: 结果项元素
             image_url_map: 图像ID到URL的映射
             base64_image_map: 图像ID到Base64数据的映射
             max_results: 最大结果数量，0表示不限制
+            limit: 最多解析的结果项数量，0表示不限制
             
         返回:
-            list[GoogleLensExactMatchesItem]: 精确匹配结果项列表
-        """
-        items = []
-        items_elements = html(".YxbOwd")
-        for idx, el in enumerate(items_elements):
-            if max_results > 0 and idx >= max_results:
-                break
-            item = GoogleLensExactMatchesItem(PyQuery(el), image_url_map, base64_image_map)
-            items.append(item)
+            LazyItemList[GoogleLensExactMatchesItem]: 按需解析的精确匹配结果项列表
+        """
+        if max_results > 0:
+            items_elements = items_elements[:max_results]
+        items = LazyItemList(lambda el: GoogleLensExactMatchesItem(PyQuery(el), image_url_map, base64_image_map), limit)
+        items.feed(items_elements)
         return items
 
     @override
-    def _parse_response(self, resp_data: str, **kwargs: Any) -> None:
+    def _parse_response(self, resp_data: Union[str, PyQuery, GoogleLensStream], **kwargs: Any) -> None:
         """
         解析Google Lens精确匹配响应数据
         
         参数:
-            resp_data: 原始HTML响应数据
+            resp_data: 原始HTML响应数据、已解析的文档或已结束的增量解析器
             **kwargs: 其他解析参数
         """
-        html = parse_html(resp_data)
-        self.origin: PyQuery = html
+        html, items_elements, image_url_map, base64_image_map = load_lens_page(resp_data, exact_matches=True)
+        self.origin: Optional[PyQuery] = html if keep_origin() else None
         self.url: str = kwargs.get("resp_url", "")
-        self.raw: list[GoogleLensExactMatchesItem] = []
         max_results = kwargs.get("max_results", 0)
-        image_url_map, base64_image_map = extract_image_maps(html)
-        self.raw = self._parse_search_items(html, image_url_map, base64_image_map, max_results)
+        self.raw: LazyItemList[GoogleLensExactMatchesItem] = self._parse_search_items(
+            items_elements, image_url_map, base64_image_map, max_results, self.limit
+        )
+
+    @override
+    def _item_records(self, item: GoogleLensExactMatchesItem) -> list[ResultRecord]:
+        extra = {"site_name": item.site_name}
+        if item.size:
+            extra["size"] = item.size
+        return [ResultRecord(self.engine, url=item.url, title=item.title, thumbnail=item.thumbnail, extra=extra)]
         
     def show_result(self) -> str:
         """
@@ -1,6 +1,7 @@
 from typing import Any, Optional
 from typing_extensions import override
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class SauceNAOItem(BaseResParser):
@@ -10,6 +11,8 @@ class SauceNAOItem(BaseResParser):
     解析单个搜索结果，提取标题、URL、作者等信息
     """
     
+    __slots__ = ("index_id", "index_name", "hidden", "ext_urls", "author", "author_url", "source")
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any):
         """
         初始化SauceNAO结果项解析器
@@ -163,6 +166,9 @@ class SauceNAOResponse(BaseSearchResponse[SauceNAOItem]):
     解析完整的SauceNAO API响应，包含多个搜索结果和API限制信息
     """
     
+    engine = "saucenao"
+    record_limit = 1
+    
     def __init__(self, resp_data: dict[str, Any], resp_url: str, **kwargs: Any) -> None:
         """
         初始化SauceNAO响应解析器
@@ -186,7 +192,7 @@ class SauceNAOResponse(BaseSearchResponse[SauceNAOItem]):
         self.status_code: int = resp_data["status_code"]
         header = resp_data["header"]
         results = resp_data.get("results", [])
-        self.raw: list[SauceNAOItem] = [SauceNAOItem(i) for i in results]
+        self.raw: LazyItemList[SauceNAOItem] = self._lazy_items(SauceNAOItem, results)
         self.short_remaining: Optional[int] = header.get("short_remaining")
         self.long_remaining: Optional[int] = header.get("long_remaining")
         self.user_id: Optional[int] = header.get("user_id")
@@ -200,6 +206,18 @@ class SauceNAOResponse(BaseSearchResponse[SauceNAOItem]):
         self.results_returned: Optional[int] = header.get("results_returned")
         self.url: str = f"https://saucenao.com/search.php?url=https://saucenao.com{header.get('query_image_display')}"
 
+    @override
+    def _item_records(self, item: SauceNAOItem) -> list[ResultRecord]:
+        return [ResultRecord(
+            self.engine,
+            url=item.url,
+            title=item.title,
+            similarity=item.similarity,
+            thumbnail=item.thumbnail,
+            author=item.author,
+            extra={"author_url": item.author_url, "source": item.source, "ext_urls": item.ext_urls},
+        )]
+
     def show_result(self) -> str:
         """
         生成可读的搜索结果文本
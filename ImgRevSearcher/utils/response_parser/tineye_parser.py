@@ -1,7 +1,8 @@
 from typing import Any
 from typing_extensions import override
 from ..types import DomainInfo
-from .base_parser import BaseResParser, BaseSearchResponse
+from ..result_record import ResultRecord
+from .base_parser import BaseResParser, BaseSearchResponse, LazyItemList
 
 
 class TineyeItem(BaseResParser):
@@ -11,6 +12,8 @@ class TineyeItem(BaseResParser):
     解析单个匹配结果，提取缩略图、原图URL、来源网页和尺寸等信息
     """
     
+    __slots__ = ("image_url", "domain", "size", "crawl_date")
+    
     def __init__(self, data: dict[str, Any], **kwargs: Any):
         """
         初始化TinEye结果项解析器
@@ -45,12 +48,15 @@ class TineyeResponse(BaseSearchResponse[TineyeItem]):
     解析完整的TinEye API响应，包含多个匹配结果和分页信息
     """
     
+    engine = "tineye"
+    
     def __init__(
         self,
         resp_data: dict[str, Any],
         resp_url: str,
         domains: list[DomainInfo],
         page_number: int = 1,
+        limit: int = 0,
     ):
         """
         初始化TinEye响应解析器
@@ -60,15 +66,18 @@ class TineyeResponse(BaseSearchResponse[TineyeItem]):
             resp_url: 响应URL
             domains: 域名信息列表
             page_number: 当前页码
+            limit: 最多解析的结果项数量，0表示不限制
         """
         super().__init__(
             resp_data,
             resp_url,
             domains=domains,
             page_number=page_number,
+            limit=limit,
         )
         self.domains: list[DomainInfo] = domains
         self.page_number: int = page_number
+        self.failed_pages: int = 0
 
     @override
     def _parse_response(self, resp_data: dict[str, Any], **kwargs: Any) -> None:
@@ -83,7 +92,20 @@ class TineyeResponse(BaseSearchResponse[TineyeItem]):
         self.status_code: int = resp_data["status_code"]
         self.total_pages: int = resp_data["total_pages"]
         matches = resp_data["matches"]
-        self.raw: list[TineyeItem] = [TineyeItem(i) for i in matches] if matches else []
+        self.raw: LazyItemList[TineyeItem] = self._lazy_items(TineyeItem, matches or [])
+
+    @override
+    def _item_records(self, item: TineyeItem) -> list[ResultRecord]:
+        return [ResultRecord(
+            self.engine,
+            url=item.url,
+            thumbnail=item.thumbnail,
+            extra={"image_url": item.image_url, "size": "x".join(map(str, item.size)), "crawl_date": item.crawl_date},
+        )]
+
+    @override
+    def _result_extra(self) -> dict[str, Any]:
+        return {"failed_pages": self.failed_pages} if self.failed_pages else {}
         
     def show_result(self) -> str:
         """
@@ -92,9 +114,10 @@ class TineyeResponse(BaseSearchResponse[TineyeItem]):
         返回:
             str: 格式化的搜索结果文本
         """
+        notice = f"有 {self.failed_pages} 页结果获取失败，结果不完整" if self.failed_pages else ""
         if not self.raw:
-            return "未找到匹配结果"
-        lines = []
+            return "\n".join(filter(None, [notice, "未找到匹配结果"]))
+        lines = [notice] if notice else []
         for i, item in enumerate(self.raw, 1):
             lines.append("-" * 50)
             lines.append(f"结果 #{i}")
@@ -0,0 +1,91 @@
+import io
+from dataclasses import dataclass
+from typing import Optional
+from PIL import Image
+
+# 编码格式对应的临时文件扩展名
+FORMAT_SUFFIXES = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+
+@dataclass(slots=True)
+class RenderedPage:
+    """
+    编码后的一页结果图
+    """
+    data: bytes
+    format: str
+    width: int
+    height: int
+
+    @property
+    def suffix(self) -> str:
+        return FORMAT_SUFFIXES.get(self.format, ".jpg")
+
+    def describe(self) -> str:
+        """
+        返回页面的格式、尺寸与编码大小，用于日志
+
+        返回:
+            str: 描述文本
+        """
+        return f"{self.format} {self.width}x{self.height} {len(self.data) / 1024:.1f} KB"
+
+
+def paginate_lines(lines: list[Optional[str]], first_capacity: int, capacity: int) -> list[list[Optional[str]]]:
+    """
+    将文本行拆分为若干页，尽量在分隔线(None)处分页，避免一条结果被拆到两页
+
+    参数:
+        lines: 文本行，None表示分隔线
+        first_capacity: 第一页可容纳的行数(第一页还包含源图像)
+        capacity: 其余页可容纳的行数
+
+    返回:
+        list[list[Optional[str]]]: 每页的文本行，至少一页
+    """
+    pages: list[list[Optional[str]]] = []
+    start = 0
+    limit = max(1, first_capacity)
+    while start < len(lines):
+        end = min(start + limit, len(lines))
+        if end < len(lines):
+            for index in range(end - 1, start + (end - start) // 2 - 1, -1):
+                if lines[index] is None:
+                    end = index + 1
+                    break
+        pages.append(lines[start:end])
+        start = end
+        limit = max(1, capacity)
+    return pages or [[]]
+
+
+def encode_page(image: Image.Image, photo: bool, text_format: str = "png",
+                palette_colors: int = 32, jpeg_quality: int = 85) -> RenderedPage:
+    """
+    按页面内容选择编码：包含照片(源图像或缩略图)的页面使用JPEG，纯文本页面使用调色板PNG或无损WebP，
+    文字边缘清晰且体积通常远小于JPEG
+
+    参数:
+        image: 页面图像
+        photo: 页面是否包含照片
+        text_format: 纯文本页面的编码格式，png、webp或jpeg
+        palette_colors: 调色板PNG的颜色数
+        jpeg_quality: JPEG质量
+
+    返回:
+        RenderedPage: 编码后的页面
+    """
+    text_format = text_format.lower()
+    with io.BytesIO() as output:
+        if photo or text_format == "jpeg":
+            image.convert("RGB").save(output, format="JPEG", quality=jpeg_quality)
+            fmt = "JPEG"
+        elif text_format == "webp":
+            image.save(output, format="WEBP", lossless=True, method=4)
+            fmt = "WEBP"
+        else:
+            image.convert("RGB").quantize(colors=palette_colors, method=Image.Quantize.FASTOCTREE).save(
+                output, format="PNG"
+            )
+            fmt = "PNG"
+        return RenderedPage(output.getvalue(), fmt, image.width, image.height)
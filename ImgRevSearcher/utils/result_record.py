@@ -0,0 +1,290 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+SEPARATOR = "-" * 50
+
+# extra字段在文本中的显示名称，未列出的字段不参与文本渲染
+EXTRA_LABELS = {
+    "work": "作品名",
+    "site_name": "网站",
+    "image_url": "图片链接",
+    "author_url": "作者链接",
+    "source": "作者链接（备用）",
+    "date": "上传时间",
+    "type": "类型",
+    "pages": "页数",
+    "size": "尺寸",
+    "crawl_date": "收录时间",
+    "ext_urls": "更多相关链接",
+    "tags": "标签",
+}
+
+
+@dataclass(slots=True)
+class ResultRecord:
+    """
+    与引擎无关的单条搜索结果
+
+    只保存渲染和去重需要的字段，可直接序列化为JSON或msgpack
+    """
+    engine: str
+    url: str = ""
+    title: str = ""
+    similarity: Optional[float] = None
+    thumbnail: str = ""
+    author: str = ""
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为字典，省略空字段
+
+        返回:
+            dict[str, Any]: 结果字典
+        """
+        data: dict[str, Any] = {"engine": self.engine}
+        for key in ("url", "title", "similarity", "thumbnail", "author"):
+            value = getattr(self, key)
+            if value not in (None, ""):
+                data[key] = value
+        if self.extra:
+            data["extra"] = self.extra
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ResultRecord":
+        """
+        从字典还原结果
+
+        参数:
+            data: to_dict生成的字典
+
+        返回:
+            ResultRecord: 结果对象
+        """
+        return cls(
+            engine=data["engine"],
+            url=data.get("url", ""),
+            title=data.get("title", ""),
+            similarity=data.get("similarity"),
+            thumbnail=data.get("thumbnail", ""),
+            author=data.get("author", ""),
+            extra=data.get("extra") or {},
+        )
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """
+    一次搜索的结构化结果
+
+    records为结果列表，extra保存引擎级别的附加信息(如最佳猜测、相似图片)，
+    搜索失败时error为错误信息
+    """
+    engine: str
+    records: list[ResultRecord] = field(default_factory=list)
+    extra: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为字典
+
+        返回:
+            dict[str, Any]: 结果字典
+        """
+        data: dict[str, Any] = {"engine": self.engine, "records": [r.to_dict() for r in self.records]}
+        if self.extra:
+            data["extra"] = self.extra
+        if self.error:
+            data["error"] = self.error
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SearchResult":
+        """
+        从字典还原结果
+
+        参数:
+            data: to_dict生成的字典
+
+        返回:
+            SearchResult: 结果对象
+        """
+        return cls(
+            engine=data["engine"],
+            records=[ResultRecord.from_dict(r) for r in data.get("records", [])],
+            extra=data.get("extra") or {},
+            error=data.get("error"),
+        )
+
+    def to_json(self) -> str:
+        """
+        序列化为JSON字符串
+
+        返回:
+            str: JSON字符串
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    def to_msgpack(self) -> bytes:
+        """
+        序列化为msgpack，需要安装msgpack
+
+        返回:
+            bytes: msgpack数据
+
+        异常:
+            ImportError: 未安装msgpack时抛出
+        """
+        import msgpack
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+
+def format_record(record: ResultRecord, index: int) -> list[str]:
+    """
+    将单条结果渲染为文本行
+
+    参数:
+        record: 结果
+        index: 结果序号(从1开始)
+
+    返回:
+        list[str]: 文本行
+    """
+    lines = [f"结果 #{index}"]
+    if record.similarity is not None:
+        lines.append(f"相似度: {record.similarity}%")
+    if record.title:
+        lines.append(f"标题: {record.title}")
+    if record.author:
+        lines.append(f"作者: {record.author}")
+    for key, label in EXTRA_LABELS.items():
+        value = record.extra.get(key)
+        if value in (None, "", []):
+            continue
+        if isinstance(value, list):
+            lines.append(f"{label}:")
+            lines.extend(f"  {item}" for item in value)
+        else:
+            lines.append(f"{label}: {value}")
+    if record.url:
+        lines.append(f"链接: {record.url}")
+    return lines
+
+
+def format_lines(result: SearchResult) -> list[Optional[str]]:
+    """
+    将搜索结果渲染为文本行，None表示分隔线
+
+    参数:
+        result: 搜索结果
+
+    返回:
+        list[Optional[str]]: 文本行，分隔线为None，便于图片渲染直接画线
+    """
+    if result.error:
+        return [f"{result.engine} 搜索失败", None, f"错误信息: {result.error}"]
+    lines: list[Optional[str]] = []
+    if best_guess := result.extra.get("best_guess"):
+        lines.extend([f"最佳结果: {best_guess}", None])
+    if "ai" in result.extra:
+        lines.extend([f"是否为 AI 生成: {'是' if result.extra['ai'] else '否'}", None])
+    if failed_pages := result.extra.get("failed_pages"):
+        lines.extend([f"有 {failed_pages} 页结果获取失败，结果不完整", None])
+    if not result.records:
+        lines.append("未找到匹配结果")
+    for index, record in enumerate(result.records, 1):
+        lines.extend(format_record(record, index))
+        lines.append(None)
+    if similar := result.extra.get("similar_images"):
+        lines.append("相似图片:")
+        lines.extend(f"  #{i} {url}" for i, url in enumerate(similar, 1))
+    return lines
+
+
+def format_text(result: SearchResult) -> str:
+    """
+    将搜索结果渲染为纯文本
+
+    参数:
+        result: 搜索结果
+
+    返回:
+        str: 文本
+    """
+    return "\n".join(SEPARATOR if line is None else line for line in format_lines(result))
+
+
+def format_preview(result: SearchResult, top_n: int = 3) -> str:
+    """
+    生成简短的文本预览，只包含前几条结果的相似度、标题与链接，用于在结果图渲染完成前先行发送
+
+    参数:
+        result: 搜索结果
+        top_n: 预览的结果数量
+
+    返回:
+        str: 预览文本
+    """
+    if result.error:
+        return f"{result.engine} 搜索失败: {result.error}"
+    if not result.records:
+        return f"{result.engine} 未找到匹配结果"
+    lines = [f"{result.engine} 找到 {len(result.records)} 条结果"]
+    if failed_pages := result.extra.get("failed_pages"):
+        lines.append(f"有 {failed_pages} 页结果获取失败，结果不完整")
+    if best_guess := result.extra.get("best_guess"):
+        lines.append(f"最佳结果: {best_guess}")
+    for index, record in enumerate(result.records[:top_n], 1):
+        similarity = f"[{record.similarity}%] " if record.similarity is not None else ""
+        title = record.title or record.extra.get("work") or record.url
+        lines.append(f"#{index} {similarity}{title}")
+        if record.url and record.url != title:
+            lines.append(f"    {record.url}")
+    return "\n".join(lines)
+
+
+def split_records(result: SearchResult, max_length: int = 4000) -> list[str]:
+    """
+    按结果边界把渲染后的文本拆分为不超过max_length的若干段，用于合并转发消息
+
+    单条结果本身超过max_length时会按长度硬切分
+
+    参数:
+        result: 搜索结果
+        max_length: 每段最大长度
+
+    返回:
+        list[str]: 文本段
+    """
+    blocks: list[str] = []
+    current: list[str] = []
+    for line in format_lines(result):
+        if line is None:
+            current.append(SEPARATOR)
+            blocks.append("\n".join(current))
+            current = []
+        else:
+            current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    parts: list[str] = []
+    buffer = ""
+    for block in blocks:
+        while len(block) > max_length:
+            if buffer:
+                parts.append(buffer)
+                buffer = ""
+            parts.append(block[:max_length])
+            block = block[max_length:]
+        candidate = f"{buffer}\n{block}" if buffer else block
+        if len(candidate) > max_length:
+            parts.append(buffer)
+            buffer = block
+        else:
+            buffer = candidate
+    if buffer:
+        parts.append(buffer)
+    return parts or [""]
@@ -0,0 +1,220 @@
+import time
+from typing import Any, Optional, Union
+
+SHORT_WINDOW = 30
+LONG_WINDOW = 24 * 60 * 60
+
+# 跨进程共享的配额字段，in_flight只在本进程内有意义
+SHARED_FIELDS = (
+    "short_limit", "long_limit", "short_remaining", "long_remaining",
+    "short_reset_at", "long_reset_at", "parked_until", "updated_at",
+)
+
+
+class SauceNAOKeyState:
+    """
+    单个SauceNAO API密钥的配额状态
+
+    记录30秒短窗口和24小时长窗口的剩余次数与重置时间，以及因配额耗尽而暂停使用的截止时间
+    """
+
+    def __init__(self, key: str):
+        """
+        初始化密钥状态，配额未知时视为满额
+
+        参数:
+            key: API密钥
+        """
+        self.key: str = key
+        self.short_limit: Optional[int] = None
+        self.long_limit: Optional[int] = None
+        self.short_remaining: Optional[int] = None
+        self.long_remaining: Optional[int] = None
+        self.short_reset_at: float = 0
+        self.long_reset_at: float = 0
+        self.parked_until: float = 0
+        self.in_flight: int = 0
+        self.updated_at: float = 0
+
+    def refresh(self, now: float) -> None:
+        """
+        窗口到期后按上限恢复剩余次数
+
+        参数:
+            now: 当前时间戳
+        """
+        if self.short_reset_at and now >= self.short_reset_at:
+            self.short_remaining = self.short_limit
+            self.short_reset_at = 0
+        if self.long_reset_at and now >= self.long_reset_at:
+            self.long_remaining = self.long_limit
+            self.long_reset_at = 0
+
+    def headroom(self) -> float:
+        """
+        计算密钥当前可用余量，取短窗口与长窗口剩余次数的较小值并扣除进行中的请求
+
+        返回:
+            float: 可用余量，配额未知时为正无穷
+        """
+        remaining = [r for r in (self.short_remaining, self.long_remaining) if r is not None]
+        if not remaining:
+            return float("inf")
+        return min(remaining) - self.in_flight
+
+
+class SauceNAOKeyPool:
+    """
+    SauceNAO API密钥池
+
+    从每次响应头中跟踪各密钥的剩余配额，每次选择余量最大的密钥，
+    配额耗尽的密钥暂停到对应窗口重置后再启用
+    """
+
+    def __init__(self, keys: Union[str, list[str], None]):
+        """
+        初始化密钥池
+
+        参数:
+            keys: 单个密钥、逗号分隔的多个密钥或密钥列表
+        """
+        if isinstance(keys, str):
+            keys = keys.split(",")
+        unique_keys = dict.fromkeys(k.strip() for k in keys or [] if k and k.strip())
+        self.states: dict[str, SauceNAOKeyState] = {key: SauceNAOKeyState(key) for key in unique_keys}
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def acquire(self) -> str:
+        """
+        选取余量最大的可用密钥
+
+        返回:
+            str: API密钥
+
+        异常:
+            RuntimeError: 所有密钥都在暂停期内时抛出
+        """
+        now = time.time()
+        candidates = []
+        for state in self.states.values():
+            state.refresh(now)
+            if state.parked_until <= now and state.headroom() > 0:
+                candidates.append(state)
+        if not candidates:
+            retry_after = min(
+                (s.parked_until or s.short_reset_at or now + SHORT_WINDOW for s in self.states.values()),
+                default=now,
+            )
+            raise RuntimeError(f"SauceNAO API 配额已用尽，请在 {max(1, int(retry_after - now))} 秒后重试")
+        state = max(candidates, key=lambda s: s.headroom())
+        state.in_flight += 1
+        return state.key
+
+    def release(self, key: str, response: Optional[Any] = None) -> None:
+        """
+        归还密钥，并根据响应更新配额
+
+        参数:
+            key: API密钥
+            response: SauceNAOResponse对象，请求失败时为None
+        """
+        state = self.states.get(key)
+        if state is None:
+            return
+        state.in_flight = max(0, state.in_flight - 1)
+        if response is not None:
+            self.update(key, response)
+
+    def update(self, key: str, response: Any) -> None:
+        """
+        从响应中读取剩余配额，配额耗尽或被限流时暂停该密钥
+
+        参数:
+            key: API密钥
+            response: SauceNAOResponse对象
+        """
+        state = self.states.get(key)
+        if state is None:
+            return
+        now = time.time()
+        state.updated_at = now
+        if response.short_limit is not None:
+            state.short_limit = int(response.short_limit)
+        if response.long_limit is not None:
+            state.long_limit = int(response.long_limit)
+        if response.short_remaining is not None:
+            state.short_reset_at = state.short_reset_at or now + SHORT_WINDOW
+            state.short_remaining = int(response.short_remaining)
+        if response.long_remaining is not None:
+            state.long_reset_at = state.long_reset_at or now + LONG_WINDOW
+            state.long_remaining = int(response.long_remaining)
+        if state.long_remaining is not None and state.long_remaining <= 0:
+            state.parked_until = state.long_reset_at
+        elif (state.short_remaining is not None and state.short_remaining <= 0) or response.status_code == 429:
+            state.parked_until = state.short_reset_at or now + SHORT_WINDOW
+
+    def snapshot(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        导出密钥的配额状态，用于跨进程共享
+
+        参数:
+            key: API密钥
+
+        返回:
+            Optional[dict[str, Any]]: 配额状态，密钥不存在或尚未收到响应时为None
+        """
+        state = self.states.get(key)
+        if state is None or not state.updated_at:
+            return None
+        return {field: getattr(state, field) for field in SHARED_FIELDS}
+
+    def merge(self, key: str, data: Optional[dict[str, Any]]) -> None:
+        """
+        合并其他进程导出的配额状态
+
+        SauceNAO返回的剩余次数是服务端对该密钥的全局计数，因此以更新时间较新的一方为准，
+        暂停截止时间取两者较晚者
+
+        参数:
+            key: API密钥
+            data: snapshot导出的配额状态
+        """
+        state = self.states.get(key)
+        if state is None or not data:
+            return
+        parked_until = max(state.parked_until, data.get("parked_until") or 0)
+        if (data.get("updated_at") or 0) > state.updated_at:
+            for field in SHARED_FIELDS:
+                setattr(state, field, data.get(field, getattr(state, field)))
+        state.parked_until = parked_until
+
+    def quota(self) -> dict[str, Any]:
+        """
+        汇总所有密钥的配额情况
+
+        返回:
+            dict[str, Any]: 密钥总数、可用数、暂停数以及短/长窗口的剩余与上限合计
+        """
+        now = time.time()
+        summary = {
+            "keys": len(self.states),
+            "available": 0,
+            "parked": 0,
+            "short_remaining": 0,
+            "short_limit": 0,
+            "long_remaining": 0,
+            "long_limit": 0,
+        }
+        for state in self.states.values():
+            state.refresh(now)
+            if state.parked_until > now:
+                summary["parked"] += 1
+            else:
+                summary["available"] += 1
+            summary["short_remaining"] += state.short_remaining or 0
+            summary["short_limit"] += state.short_limit or 0
+            summary["long_remaining"] += state.long_remaining or 0
+            summary["long_limit"] += state.long_limit or 0
+        return summary
@@ -0,0 +1,396 @@
+import asyncio
+import heapq
+import io
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Optional
+
+# 会话中可能持有图片数据的字段
+IMAGE_KEY = "preloaded_img"
+
+
+class SessionStore:
+    """
+    用户会话存储
+
+    每个会话带有独立的过期时间，通过最小堆与事件循环的call_at定时器在到期时立即清除，
+    不依赖周期扫描；统计所有会话占用的内存字节数，超过阈值的预加载图片或超出内存上限时
+    较大的图片会转存到有容量上限的磁盘目录，读取会话时再载回内存；磁盘也已满时丢弃图片，
+    只保留图片URL，搜索时会重新下载
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, spill_threshold: int = 512 * 1024,
+                 spill_dir: Optional[str] = None, spill_max_bytes: int = 256 * 1024 * 1024,
+                 expired_grace: float = 600):
+        """
+        初始化会话存储
+
+        参数:
+            max_bytes: 内存中会话数据的字节上限
+            spill_threshold: 单张预加载图片超过该字节数时直接转存到磁盘，0表示仅在超出内存上限时转存
+            spill_dir: 转存目录，为空时在系统临时目录下创建
+            spill_max_bytes: 转存目录的字节上限
+            expired_grace: 会话过期后保留过期标记的时间(秒)，用于提示用户操作已超时
+        """
+        self.max_bytes: int = max(0, int(max_bytes))
+        self.spill_threshold: int = max(0, int(spill_threshold))
+        self.spill_max_bytes: int = max(0, int(spill_max_bytes))
+        self.expired_grace: float = float(expired_grace)
+        self._spill_root: Optional[str] = spill_dir or None
+        self._spill_dir: Optional[str] = None
+        self._sessions: dict[str, dict[str, Any]] = {}
+        self._ttls: dict[str, float] = {}
+        self._deadlines: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}
+        self._spilled: dict[str, tuple[str, int]] = {}
+        self._expired: dict[str, tuple[float, Optional[str]]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_deadline: float = float("inf")
+        self.resident_bytes: int = 0
+        self.spilled_bytes: int = 0
+        self.expired_total: int = 0
+        self.dropped_images: int = 0
+
+    def __len__(self) -> int:
+        self._expire_due()
+        return len(self._sessions)
+
+    def __contains__(self, user_id: str) -> bool:
+        self._expire_due()
+        return user_id in self._sessions
+
+    @staticmethod
+    def _value_size(value: Any) -> int:
+        """
+        估算单个会话字段占用的字节数，只统计图片、文本和搜索结果等大对象，列表按元素累加
+
+        参数:
+            value: 字段值
+
+        返回:
+            int: 字节数
+        """
+        if isinstance(value, io.BytesIO):
+            return value.getbuffer().nbytes
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        if isinstance(value, str):
+            return len(value)
+        if hasattr(value, "to_json"):
+            return len(value.to_json())
+        if isinstance(value, (list, tuple)):
+            return sum(SessionStore._value_size(item) for item in value)
+        return 0
+
+    def _measure(self, user_id: str) -> None:
+        """
+        重新统计会话占用的内存字节数
+
+        参数:
+            user_id: 用户ID
+        """
+        size = sum(self._value_size(v) for v in self._sessions[user_id].values())
+        self.resident_bytes += size - self._sizes.get(user_id, 0)
+        self._sizes[user_id] = size
+
+    def _ensure_spill_dir(self) -> str:
+        """
+        获取转存目录，首次使用时创建
+
+        返回:
+            str: 目录路径
+        """
+        if self._spill_dir is None:
+            if self._spill_root:
+                os.makedirs(self._spill_root, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix="imgrev_sessions_", dir=self._spill_root)
+        return self._spill_dir
+
+    def _spill(self, user_id: str) -> bool:
+        """
+        将会话中的预加载图片转存到磁盘，磁盘容量不足时丢弃图片
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            bool: 是否释放了内存
+        """
+        state = self._sessions[user_id]
+        image = state.get(IMAGE_KEY)
+        if not isinstance(image, io.BytesIO):
+            return False
+        data = image.getbuffer()
+        size = data.nbytes
+        try:
+            if self.spilled_bytes + size > self.spill_max_bytes:
+                raise OSError("转存目录已满")
+            fd, path = tempfile.mkstemp(suffix=".img", dir=self._ensure_spill_dir())
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            self._spilled[user_id] = (path, size)
+            self.spilled_bytes += size
+        except OSError as e:
+            print(f"会话图片转存失败，已丢弃({e})，搜索时将重新下载")
+            self.dropped_images += 1
+        finally:
+            data.release()
+        state[IMAGE_KEY] = None
+        self._measure(user_id)
+        return True
+
+    def _restore(self, user_id: str) -> None:
+        """
+        将转存到磁盘的预加载图片载回会话
+
+        参数:
+            user_id: 用户ID
+        """
+        path, size = self._spilled.pop(user_id)
+        self.spilled_bytes -= size
+        try:
+            with open(path, "rb") as f:
+                self._sessions[user_id][IMAGE_KEY] = io.BytesIO(f.read())
+        except OSError as e:
+            print(f"会话图片读取失败({e})，搜索时将重新下载")
+            self.dropped_images += 1
+        finally:
+            self._remove_file(path)
+        self._measure(user_id)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _enforce_limits(self, user_id: str) -> None:
+        """
+        按单图阈值与内存上限转存图片，优先转存最大的会话
+
+        参数:
+            user_id: 刚写入或更新的用户ID
+        """
+        image = self._sessions[user_id].get(IMAGE_KEY)
+        if (self.spill_threshold and isinstance(image, io.BytesIO)
+                and image.getbuffer().nbytes > self.spill_threshold):
+            self._spill(user_id)
+        if self.resident_bytes <= self.max_bytes:
+            return
+        for candidate in sorted(self._sizes, key=self._sizes.get, reverse=True):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            self._spill(candidate)
+
+    def _schedule(self, deadline: float) -> None:
+        """
+        按最早的过期时间设置定时器，没有运行中的事件循环时在访问时惰性清理
+
+        参数:
+            deadline: 过期时间(time.monotonic)
+        """
+        if deadline >= self._timer_deadline:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_deadline = deadline
+        self._timer = loop.call_at(loop.time() + max(0.0, deadline - time.monotonic()), self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_deadline = float("inf")
+        self._expire_due()
+
+    def _push(self, user_id: str) -> None:
+        """
+        为会话计算新的过期时间并入堆，旧的堆项在出堆时按过期时间不一致跳过
+
+        参数:
+            user_id: 用户ID
+        """
+        deadline = time.monotonic() + self._ttls[user_id]
+        self._deadlines[user_id] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), user_id))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(d, next(self._counter), u) for u, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        self._schedule(deadline)
+
+    def _expire_due(self) -> None:
+        """
+        清除所有已到期的会话，并为下一个到期的会话设置定时器
+        """
+        now = time.monotonic()
+        if not self._heap or self._heap[0][0] > now:
+            if self._expired:
+                self._prune_expired(now)
+            return
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, user_id = heapq.heappop(self._heap)
+            if self._deadlines.get(user_id) != deadline:
+                continue
+            state = self._discard(user_id)
+            self._expired.pop(user_id, None)
+            self._expired[user_id] = (now, state.get("step"))
+            self.expired_total += 1
+        self._prune_expired(now)
+        if self._heap:
+            self._schedule(self._heap[0][0])
+
+    def _prune_expired(self, now: float) -> None:
+        """
+        删除超过保留时间的过期标记，按过期先后顺序检查，遇到未超时的标记即停止
+
+        参数:
+            now: 当前时间(time.monotonic)
+        """
+        while self._expired:
+            user_id, (expired_at, _) = next(iter(self._expired.items()))
+            if now - expired_at <= self.expired_grace:
+                break
+            del self._expired[user_id]
+
+    def _discard(self, user_id: str) -> dict[str, Any]:
+        """
+        移除会话并释放其内存统计与转存文件
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            dict[str, Any]: 被移除的会话
+        """
+        state = self._sessions.pop(user_id)
+        self._ttls.pop(user_id, None)
+        self._deadlines.pop(user_id, None)
+        self.resident_bytes -= self._sizes.pop(user_id, 0)
+        if user_id in self._spilled:
+            path, size = self._spilled.pop(user_id)
+            self.spilled_bytes -= size
+            self._remove_file(path)
+        return state
+
+    def set(self, user_id: str, state: dict[str, Any], ttl: float) -> None:
+        """
+        写入会话，覆盖同一用户已有的会话
+
+        参数:
+            user_id: 用户ID
+            state: 会话数据
+            ttl: 有效期(秒)
+        """
+        self._expire_due()
+        if user_id in self._sessions:
+            self._discard(user_id)
+        self._expired.pop(user_id, None)
+        self._sessions[user_id] = state
+        self._ttls[user_id] = float(ttl)
+        self._measure(user_id)
+        self._enforce_limits(user_id)
+        self._push(user_id)
+
+    def get(self, user_id: str) -> Optional[dict[str, Any]]:
+        """
+        读取会话，转存到磁盘的图片会载回内存
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            Optional[dict[str, Any]]: 会话数据，不存在或已过期时为None
+        """
+        self._expire_due()
+        state = self._sessions.get(user_id)
+        if state is not None and user_id in self._spilled:
+            self._restore(user_id)
+        return state
+
+    def touch(self, user_id: str, ttl: Optional[float] = None) -> None:
+        """
+        会话被修改后调用：续期并重新统计内存占用
+
+        参数:
+            user_id: 用户ID
+            ttl: 新的有效期(秒)，为空时沿用原有效期
+        """
+        self._expire_due()
+        if user_id not in self._sessions:
+            return
+        if ttl is not None:
+            self._ttls[user_id] = float(ttl)
+        self._measure(user_id)
+        self._enforce_limits(user_id)
+        self._push(user_id)
+
+    def pop(self, user_id: str) -> Optional[dict[str, Any]]:
+        """
+        移除并返回会话
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            Optional[dict[str, Any]]: 会话数据，不存在时为None
+        """
+        self._expire_due()
+        if user_id not in self._sessions:
+            return None
+        if user_id in self._spilled:
+            self._restore(user_id)
+        return self._discard(user_id)
+
+    def pop_expired(self, user_id: str) -> Optional[str]:
+        """
+        取出用户最近一次过期会话的标记
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            Optional[str]: 过期会话所处的步骤，没有过期标记时为None
+        """
+        self._expire_due()
+        marker = self._expired.pop(user_id, None)
+        return marker[1] if marker else None
+
+    def metrics(self) -> dict[str, int]:
+        """
+        导出会话统计
+
+        返回:
+            dict[str, int]: 会话数、内存字节数、转存图片数与字节数、累计过期数与丢弃图片数
+        """
+        self._expire_due()
+        return {
+            "sessions": len(self._sessions),
+            "resident_bytes": self.resident_bytes,
+            "spilled_images": len(self._spilled),
+            "spilled_bytes": self.spilled_bytes,
+            "expired_total": self.expired_total,
+            "dropped_images": self.dropped_images,
+        }
+
+    def close(self) -> None:
+        """
+        取消定时器并删除所有会话与转存目录
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_deadline = float("inf")
+        for user_id in list(self._sessions):
+            self._discard(user_id)
+        self._heap.clear()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
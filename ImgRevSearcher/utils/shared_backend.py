@@ -0,0 +1,404 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Union
+from urllib.parse import unquote, urlsplit
+
+
+class SharedBackend:
+    """
+    共享状态后端基类
+
+    为搜索结果缓存、Google Cookie及SauceNAO配额等跨进程共享的状态提供带过期时间的键值存储，
+    子类实现具体存储；所有方法均为异步，值统一为bytes
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        读取键值
+
+        参数:
+            key: 键
+
+        返回:
+            Optional[bytes]: 值，不存在或已过期时为None
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        写入键值
+
+        参数:
+            key: 键
+            value: 值
+            ttl: 有效期(秒)，None表示永不过期
+        """
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        仅在键不存在时写入，可用作跨进程锁
+
+        参数:
+            key: 键
+            value: 值
+            ttl: 有效期(秒)，None表示永不过期
+
+        返回:
+            bool: 是否写入成功
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """
+        删除键
+
+        参数:
+            key: 键
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        关闭后端连接
+        """
+
+    async def get_json(self, key: str) -> Any:
+        """
+        读取JSON值
+
+        参数:
+            key: 键
+
+        返回:
+            Any: 解析后的值，不存在时为None
+        """
+        value = await self.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        以JSON写入值
+
+        参数:
+            key: 键
+            value: 可JSON序列化的值
+            ttl: 有效期(秒)
+        """
+        await self.set(key, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(), ttl)
+
+
+class MemoryBackend(SharedBackend):
+    """
+    进程内存后端，不跨进程共享，为默认后端
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float]] = {}
+
+    def _alive(self, key: str) -> Optional[tuple[bytes, float]]:
+        item = self._data.get(key)
+        if item is not None and item[1] and item[1] <= time.time():
+            del self._data[key]
+            return None
+        return item
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._alive(key)
+        return item[0] if item else None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, time.time() + ttl if ttl else 0)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if self._alive(key):
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class SQLiteBackend(SharedBackend):
+    """
+    SQLite后端
+
+    使用WAL日志模式，同一主机上的多个进程可以同时读写同一个数据库文件；
+    数据库操作在线程池中执行，不阻塞事件循环
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        """
+        初始化SQLite后端
+
+        参数:
+            path: 数据库文件路径
+            busy_timeout: 数据库被其他进程锁定时的等待时间(秒)
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires_at) WHERE expires_at > 0")
+        self._writes = 0
+
+    def _run(self, func, *args):
+        """
+        在线程池中串行执行数据库操作
+
+        参数:
+            func: 接收连接与参数的同步函数
+            *args: 参数
+
+        返回:
+            Awaitable: func的返回值
+        """
+        def call():
+            with self._lock:
+                return func(self._conn, *args)
+        return asyncio.to_thread(call)
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        每隔若干次写入删除过期数据，防止数据库无限增长
+        """
+        self._writes += 1
+        if self._writes % 256 == 0:
+            conn.execute("DELETE FROM kv WHERE expires_at > 0 AND expires_at <= ?", (now,))
+
+    @staticmethod
+    def _expires_at(ttl: Optional[float], now: float) -> float:
+        return now + ttl if ttl else 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        def op(conn, key):
+            row = conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at = 0 OR expires_at > ?)", (key, time.time())
+            ).fetchone()
+            return bytes(row[0]) if row else None
+        return await self._run(op, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        def op(conn, key, value, ttl):
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl, now)),
+            )
+            self._purge(conn, now)
+        await self._run(op, key, value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        def op(conn, key, value, ttl):
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM kv WHERE key = ? AND expires_at > 0 AND expires_at <= ?", (key, now))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, self._expires_at(ttl, now)),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return cursor.rowcount == 1
+        return await self._run(op, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._run(lambda conn, key: conn.execute("DELETE FROM kv WHERE key = ?", (key,)), key)
+
+    async def close(self) -> None:
+        await self._run(lambda conn: conn.close())
+
+
+class RedisError(Exception):
+    """
+    Redis服务端返回的错误
+    """
+
+
+class RedisBackend(SharedBackend):
+    """
+    Redis协议后端
+
+    内置最小化的RESP2客户端，只使用GET/SET/DEL命令，
+    兼容Redis及实现了Redis协议的服务(如KeyDB、Dragonfly)，无需额外依赖；
+    单连接按请求串行发送，连接断开时在下一次请求自动重连
+    """
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", timeout: float = 5.0):
+        """
+        初始化Redis后端
+
+        参数:
+            url: 连接地址，格式为redis://[:密码@]主机[:端口][/数据库编号]
+            timeout: 连接与单次请求的超时时间(秒)
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"不支持的Redis地址: {url}")
+        self.host: str = parts.hostname or "127.0.0.1"
+        self.port: int = parts.port or 6379
+        self.username: Optional[str] = unquote(parts.username) if parts.username else None
+        self.password: Optional[str] = unquote(parts.password) if parts.password else None
+        self.db: int = int(parts.path.strip("/") or 0)
+        self.timeout: float = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(*args: Union[str, bytes, int, float]) -> bytes:
+        """
+        将命令编码为RESP数组
+
+        参数:
+            *args: 命令及参数
+
+        返回:
+            bytes: 编码后的数据
+        """
+        chunks = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            chunks.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(chunks)
+
+    async def _read_reply(self) -> Any:
+        """
+        读取一条RESP回复
+
+        返回:
+            Any: 简单字符串为str，整数为int，批量字符串为bytes或None，数组为list
+
+        异常:
+            RedisError: 服务端返回错误时抛出
+        """
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis连接已关闭")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"无法解析的回复: {line!r}")
+
+    async def _connect(self) -> None:
+        """
+        建立连接并完成认证与数据库选择
+        """
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        if self.password:
+            auth = ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+            await self._send(*auth)
+        if self.db:
+            await self._send("SELECT", self.db)
+
+    async def _send(self, *args: Union[str, bytes, int, float]) -> Any:
+        self._writer.write(self._encode(*args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def execute(self, *args: Union[str, bytes, int, float]) -> Any:
+        """
+        发送一条命令并返回回复，连接失败时重连重试一次
+
+        参数:
+            *args: 命令及参数
+
+        返回:
+            Any: 回复
+
+        异常:
+            RedisError: 服务端返回错误时抛出
+            ConnectionError: 重连后仍无法通信时抛出
+        """
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await asyncio.wait_for(self._send(*args), self.timeout)
+                except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    await self._drop()
+                    if attempt:
+                        raise ConnectionError(f"无法连接Redis: {self.host}:{self.port}") from None
+
+    async def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = self._writer = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            await self.execute("SET", key, value)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if ttl:
+            reply = await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)), "NX")
+        else:
+            reply = await self.execute("SET", key, value, "NX")
+        return reply == "OK"
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._drop()
+
+
+def create_backend(config: Optional[dict[str, Any]] = None) -> SharedBackend:
+    """
+    根据配置创建共享状态后端
+
+    参数:
+        config: 后端配置，type为memory、sqlite或redis，sqlite需要sqlite_path，redis需要redis_url
+
+    返回:
+        SharedBackend: 后端实例
+
+    异常:
+        ValueError: 后端类型不支持时抛出
+    """
+    config = config or {}
+    backend_type = (config.get("type") or "memory").lower()
+    if backend_type == "memory":
+        return MemoryBackend()
+    if backend_type == "sqlite":
+        return SQLiteBackend(config.get("sqlite_path") or "imgrev_shared.db")
+    if backend_type == "redis":
+        return RedisBackend(config.get("redis_url") or "redis://127.0.0.1:6379/0")
+    raise ValueError(f"不支持的共享后端类型: {backend_type}")
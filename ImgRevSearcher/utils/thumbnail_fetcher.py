@@ -0,0 +1,228 @@
+import asyncio
+import base64
+import io
+from collections import OrderedDict
+from typing import Optional, Union
+from urllib.parse import urlsplit
+from httpx import Timeout
+from PIL import Image
+from .network import Network
+
+# 单张缩略图允许下载的最大字节数，超出即放弃，避免误链到原图时拖慢整张卡片
+MAX_THUMBNAIL_BYTES = 2 * 1024 * 1024
+# 单张缩略图允许解码的最大像素数，在读取文件头后、解码前检查，防止小文件解压出巨大图像
+MAX_THUMBNAIL_PIXELS = 16_000_000
+
+
+class ThumbnailFetcher:
+    """
+    结果卡片缩略图获取器
+
+    并发下载结果缩略图，每个主机限制同时连接数，整批请求受全局截止时间约束，
+    超时或失败的缩略图直接留空，不会拖慢回复；解码时通过Pillow的draft只解码
+    所需的小尺寸，解码结果以URL为键保存在LRU缓存中
+    """
+
+    def __init__(self, size: tuple[int, int] = (160, 160), cache_size: int = 256, per_host: int = 2,
+                 proxies: Optional[str] = None, timeout: Union[float, Timeout] = 10):
+        """
+        初始化缩略图获取器
+
+        参数:
+            size: 缩略图最大尺寸(宽, 高)
+            cache_size: LRU缓存保留的缩略图数量，0表示不缓存
+            per_host: 每个主机的最大并发连接数
+            proxies: 代理服务器地址
+            timeout: 单张缩略图的请求超时时间(秒)
+        """
+        self.size: tuple[int, int] = size
+        self.cache_size: int = max(0, int(cache_size))
+        self.per_host: int = max(1, int(per_host))
+        self.proxies: Optional[str] = proxies
+        self.timeout: Union[float, Timeout] = timeout
+        self._cache: OrderedDict[str, Image.Image] = OrderedDict()
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._network: Optional[Network] = None
+
+    def _client(self) -> Network:
+        """
+        获取复用的网络客户端，首次调用时创建
+
+        返回:
+            Network: 网络客户端
+        """
+        if self._network is None:
+            self._network = Network(proxies=self.proxies, timeout=self.timeout)
+        return self._network
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """
+        获取URL所属主机的并发信号量
+
+        参数:
+            url: 缩略图URL
+
+        返回:
+            asyncio.Semaphore: 主机信号量
+        """
+        host = urlsplit(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return limit
+
+    def _cache_get(self, url: str) -> Optional[Image.Image]:
+        """
+        从LRU缓存读取缩略图，命中时移到队尾
+
+        参数:
+            url: 缩略图URL
+
+        返回:
+            Optional[Image.Image]: 缩略图，未命中时为None
+        """
+        image = self._cache.get(url)
+        if image is not None:
+            self._cache.move_to_end(url)
+        return image
+
+    def _cache_put(self, url: str, image: Image.Image) -> None:
+        """
+        写入LRU缓存，超出容量时淘汰最久未使用的缩略图
+
+        参数:
+            url: 缩略图URL
+            image: 缩略图
+        """
+        if not self.cache_size:
+            return
+        self._cache[url] = image
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _decode(self, data: bytes) -> Image.Image:
+        """
+        解码缩略图，JPEG通过draft在解码阶段直接缩小，其余格式解码后缩放
+
+        参数:
+            data: 图像数据
+
+        返回:
+            Image.Image: 不超过size的RGB图像
+
+        异常:
+            ValueError: 像素数超过MAX_THUMBNAIL_PIXELS时抛出
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > MAX_THUMBNAIL_PIXELS:
+                raise ValueError("缩略图尺寸过大")
+            image.draft("RGB", self.size)
+            image = image.convert("RGB")
+        image.thumbnail(self.size)
+        return image
+
+    @staticmethod
+    def _decode_data_uri(url: str) -> bytes:
+        """
+        读取data URI中的图像数据(如Google结果中内嵌的base64缩略图)
+
+        参数:
+            url: data URI
+
+        返回:
+            bytes: 图像数据
+
+        异常:
+            ValueError: 不是base64编码的data URI时抛出
+        """
+        header, _, payload = url.partition(",")
+        if not header.endswith(";base64"):
+            raise ValueError("仅支持base64编码的data URI")
+        return base64.b64decode(payload)
+
+    async def _download(self, url: str) -> bytes:
+        """
+        在主机并发限制内下载缩略图，超过MAX_THUMBNAIL_BYTES时中止
+
+        参数:
+            url: 缩略图URL
+
+        返回:
+            bytes: 图像数据
+
+        异常:
+            ValueError: 数据超过大小限制时抛出
+        """
+        async with self._host_limit(url):
+            async with self._client().start().stream("GET", url) as response:
+                response.raise_for_status()
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received > MAX_THUMBNAIL_BYTES:
+                        raise ValueError("缩略图过大")
+                    chunks.append(chunk)
+                return b"".join(chunks)
+
+    async def _fetch(self, url: str) -> Image.Image:
+        """
+        获取单张缩略图并写入缓存
+
+        参数:
+            url: 缩略图URL或data URI
+
+        返回:
+            Image.Image: 缩略图
+        """
+        if url.startswith("data:"):
+            data = self._decode_data_uri(url)
+        else:
+            data = await self._download(url)
+        image = await asyncio.to_thread(self._decode, data)
+        self._cache_put(url, image)
+        return image
+
+    async def fetch_many(self, urls: list[str], deadline: float) -> dict[str, Optional[Image.Image]]:
+        """
+        在截止时间内并发获取一批缩略图
+
+        已缓存的直接返回，截止时间到达时仍未完成的请求会被取消，对应值为None
+
+        参数:
+            urls: 缩略图URL列表，空字符串会被跳过
+            deadline: 整批请求的截止时间(秒)
+
+        返回:
+            dict[str, Optional[Image.Image]]: URL到缩略图的映射，失败或超时为None
+        """
+        images: dict[str, Optional[Image.Image]] = {}
+        tasks: dict[asyncio.Task, str] = {}
+        for url in dict.fromkeys(u for u in urls if u):
+            cached = self._cache_get(url)
+            images[url] = cached
+            if cached is None:
+                tasks[asyncio.create_task(self._fetch(url))] = url
+        if not tasks:
+            return images
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline))
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception() is None:
+                images[tasks[task]] = task.result()
+            else:
+                print(f"缩略图获取失败: {tasks[task][:100]} {task.exception()}")
+        if pending:
+            print(f"{len(pending)} 张缩略图未在 {deadline} 秒内完成，已跳过")
+            await asyncio.gather(*pending, return_exceptions=True)
+        return images
+
+    async def close(self) -> None:
+        """
+        关闭网络客户端
+        """
+        if self._network is not None:
+            await self._network.close()
+            self._network = None
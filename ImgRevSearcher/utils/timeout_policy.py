@@ -0,0 +1,208 @@
+import math
+from collections import deque
+from typing import Any, Optional
+from httpx import Timeout
+
+TIMEOUT_PHASES = ("connect", "read", "write", "pool")
+
+DEFAULT_ADAPTIVE_CONFIG = {
+    "enabled": False,
+    "percentile": 99,
+    "multiplier": 3.0,
+    "min_samples": 20,
+    "window": 200,
+    "min_timeout": 3.0,
+    "max_timeout": 60.0,
+}
+
+
+class LatencyTracker:
+    """
+    延迟统计类
+
+    为每个引擎维护一个固定长度的滚动窗口，记录最近若干次搜索耗时，
+    用于计算延迟分位数
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        初始化延迟统计
+
+        参数:
+            window: 每个引擎保留的最近样本数量
+        """
+        self.window: int = max(1, int(window))
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, engine: str, seconds: float) -> None:
+        """
+        记录一次搜索耗时
+
+        参数:
+            engine: 引擎名称
+            seconds: 耗时(秒)
+        """
+        samples = self._samples.get(engine)
+        if samples is None:
+            samples = self._samples[engine] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, engine: str) -> int:
+        """
+        获取引擎当前窗口内的样本数量
+
+        参数:
+            engine: 引擎名称
+
+        返回:
+            int: 样本数量
+        """
+        return len(self._samples.get(engine, ()))
+
+    def engines(self) -> list[str]:
+        """
+        获取已有样本的引擎列表
+
+        返回:
+            list[str]: 引擎名称列表
+        """
+        return list(self._samples)
+
+    def percentile(self, engine: str, q: float) -> Optional[float]:
+        """
+        计算引擎耗时的分位数（最近秩法）
+
+        参数:
+            engine: 引擎名称
+            q: 分位数(0-100)
+
+        返回:
+            Optional[float]: 分位数值，无样本时返回None
+        """
+        samples = self._samples.get(engine)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class TimeoutPolicy:
+    """
+    超时策略类
+
+    根据配置为每个引擎生成分阶段(connect/read/write/pool)的httpx超时，
+    启用自适应模式后，按滚动延迟分布的分位数乘以倍数计算整次搜索的截止时间
+    """
+
+    def __init__(self, config: Optional[dict[str, Any]] = None, default: float = 60):
+        """
+        初始化超时策略
+
+        参数:
+            config: 超时配置，包含default、engines和adaptive三部分
+            default: 未配置某阶段时使用的超时时间(秒)
+        """
+        config = config or {}
+        self.default: float = float(default)
+        self.phases: dict[str, Optional[float]] = self._read_phases(config.get("default"))
+        self.engine_phases: dict[str, dict[str, Optional[float]]] = {
+            engine: self._read_phases(phases)
+            for engine, phases in (config.get("engines") or {}).items()
+        }
+        self.adaptive: dict[str, Any] = {**DEFAULT_ADAPTIVE_CONFIG, **(config.get("adaptive") or {})}
+        self.tracker = LatencyTracker(self.adaptive["window"])
+
+    @staticmethod
+    def _read_phases(phases: Optional[dict[str, Any]]) -> dict[str, Optional[float]]:
+        """
+        读取分阶段超时配置，忽略空值和非正数
+
+        参数:
+            phases: 原始配置
+
+        返回:
+            dict[str, Optional[float]]: 阶段名到超时时间的映射
+        """
+        phases = phases or {}
+        result: dict[str, Optional[float]] = {}
+        for phase in TIMEOUT_PHASES:
+            value = phases.get(phase)
+            result[phase] = float(value) if value and float(value) > 0 else None
+        return result
+
+    def get_deadline(self, engine: str) -> Optional[float]:
+        """
+        获取引擎整次搜索的自适应截止时间
+
+        参数:
+            engine: 引擎名称
+
+        返回:
+            Optional[float]: 截止时间(秒)，未启用自适应或样本不足时返回None
+        """
+        if not self.adaptive["enabled"] or self.tracker.count(engine) < self.adaptive["min_samples"]:
+            return None
+        observed = self.tracker.percentile(engine, self.adaptive["percentile"])
+        if observed is None:
+            return None
+        deadline = observed * float(self.adaptive["multiplier"])
+        return min(max(deadline, float(self.adaptive["min_timeout"])), float(self.adaptive["max_timeout"]))
+
+    def get_timeout(self, engine: str) -> Timeout:
+        """
+        获取引擎的httpx分阶段超时
+
+        优先使用引擎专属配置，其次为全局配置，最后回退到默认值；
+        存在自适应截止时间时，各阶段均不超过该截止时间
+
+        参数:
+            engine: 引擎名称
+
+        返回:
+            Timeout: httpx超时对象
+        """
+        engine_phases = self.engine_phases.get(engine, {})
+        deadline = self.get_deadline(engine)
+        values = {}
+        for phase in TIMEOUT_PHASES:
+            value = engine_phases.get(phase) or self.phases.get(phase) or self.default
+            values[phase] = min(value, deadline) if deadline else value
+        return Timeout(**values)
+
+    def record(self, engine: str, seconds: float) -> None:
+        """
+        记录一次成功搜索的耗时
+
+        参数:
+            engine: 引擎名称
+            seconds: 耗时(秒)
+        """
+        self.tracker.record(engine, seconds)
+
+    def record_timeout(self, engine: str, deadline: float) -> None:
+        """
+        记录一次超时，按截止时间计入样本，使持续变慢的引擎截止时间能逐步放宽
+
+        参数:
+            engine: 引擎名称
+            deadline: 本次使用的截止时间(秒)
+        """
+        self.tracker.record(engine, deadline)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        导出各引擎的延迟统计与当前截止时间
+
+        返回:
+            dict[str, dict[str, Any]]: 引擎名到统计信息的映射
+        """
+        return {
+            engine: {
+                "samples": self.tracker.count(engine),
+                "p50": self.tracker.percentile(engine, 50),
+                "p99": self.tracker.percentile(engine, 99),
+                "deadline": self.get_deadline(engine),
+            }
+            for engine in self.tracker.engines()
+        }
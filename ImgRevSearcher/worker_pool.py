@@ -0,0 +1,257 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+from .model import BaseSearchModel
+from .utils.result_pages import RenderedPage
+from .utils.result_record import SearchResult
+
+# 工作进程内的搜索模型与事件循环，由_init_worker创建，进程存活期间复用
+_worker_model: Optional[BaseSearchModel] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+# 启动进程池时等待全部进程响应的最多轮数，以及每次探测占用进程的时间(秒)
+START_ROUNDS = 50
+START_PING_HOLD = 0.2
+
+
+class WorkerPoolFull(RuntimeError):
+    """
+    等待中的搜索任务已达上限
+    """
+
+
+def _init_worker(model_kwargs: dict[str, Any], prewarm_kwargs: Optional[dict[str, Any]] = None) -> None:
+    """
+    工作进程初始化：创建搜索模型与事件循环，按需在进程内执行启动预热
+
+    参数:
+        model_kwargs: BaseSearchModel的构造参数
+        prewarm_kwargs: prewarm的参数(engines、connect、connect_timeout)，为空时不预热
+    """
+    global _worker_model, _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_model = BaseSearchModel(**model_kwargs)
+    if prewarm_kwargs:
+        from .prewarm import prewarm
+
+        try:
+            _worker_loop.run_until_complete(prewarm(_worker_model, **prewarm_kwargs))
+        except Exception as e:
+            print(f"工作进程预热失败: {e}")
+
+
+def _ping(hold: float = 0) -> int:
+    """
+    返回工作进程的pid
+
+    参数:
+        hold: 返回前占用进程的时间(秒)，使同时提交的其他任务交给其他进程处理
+
+    返回:
+        int: 进程pid
+    """
+    time.sleep(hold)
+    return os.getpid()
+
+
+async def run_job(model: BaseSearchModel, job: dict[str, Any]) -> dict[str, Any]:
+    """
+    执行一个搜索任务：搜索、解析并渲染结果图
+
+    只提供url时，原图下载与搜索同时进行，下载结果既用于需要上传文件的引擎，也用于渲染
+
+    参数:
+        model: 搜索模型
+        job: 任务，包含api、file(图像bytes)或url、kwargs(其他搜索参数)与render(是否渲染结果图)
+
+    返回:
+        dict[str, Any]: result为SearchResult.to_dict()，pages为编码后的结果图页面列表(未渲染时为空)
+    """
+    api, file, url = job["api"], job.get("file"), job.get("url")
+    kwargs = job.get("kwargs") or {}
+    source = file
+    if file is None and job.get("render"):
+        # URL透传时只在回退为上传文件时下载原图，结果图中不绘制原图
+        download_task = None if model.can_pass_url(api, url) else asyncio.create_task(model._download(url))
+
+        async def load_file() -> Optional[bytes]:
+            nonlocal download_task
+            if download_task is None:
+                download_task = asyncio.create_task(model._download(url))
+            try:
+                return await download_task
+            except Exception:
+                return None
+
+        try:
+            result = await model.search_records(api, url=url, file_loader=load_file, **kwargs)
+        finally:
+            source = await load_file() if download_task is not None else None
+    else:
+        result = await model.search_records(api, file=file, url=None if file else url, **kwargs)
+    pages = []
+    if job.get("render"):
+        try:
+            source_image = await model.budget.open_image(source) if source else None
+        except Exception:
+            source_image = None
+        pages = await model.render_pages(result, source_image)
+    return {"result": result.to_dict(), "pages": pages}
+
+
+def _run_job(job: dict[str, Any]) -> dict[str, Any]:
+    """
+    工作进程入口，在进程内的事件循环中执行任务
+    """
+    return _worker_loop.run_until_complete(run_job(_worker_model, job))
+
+
+class SearchWorkerPool:
+    """
+    进程外搜索工作池
+
+    搜索任务(图像数据、引擎与参数)提交到本地队列，由多个工作进程完成网络请求、解析与渲染，
+    只把编码后的结果图和结构化结果传回主进程，避免繁重的解析和绘图阻塞主事件循环；
+    等待中的任务数超过上限时拒绝新任务，工作进程崩溃时重建进程池并重试一次
+    """
+
+    def __init__(self, model_kwargs: Optional[dict[str, Any]] = None, workers: int = 2, max_pending: int = 16,
+                 prewarm_kwargs: Optional[dict[str, Any]] = None):
+        """
+        初始化工作池，进程在首次提交任务或调用start时启动
+
+        参数:
+            model_kwargs: 工作进程中BaseSearchModel的构造参数，需可被pickle
+            workers: 工作进程数量
+            max_pending: 运行中与排队中的任务总数上限
+            prewarm_kwargs: 工作进程启动时的预热参数，格式见_init_worker，为空时不预热
+        """
+        self.model_kwargs: dict[str, Any] = model_kwargs or {}
+        self.workers: int = max(1, int(workers))
+        self.max_pending: int = max(1, int(max_pending))
+        self.pending: int = 0
+        self.restarts: int = 0
+        self.prewarm_kwargs: Optional[dict[str, Any]] = prewarm_kwargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        """
+        获取进程池，尚未创建或已损坏时新建；使用spawn启动方式，避免在多线程的主进程中fork
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_kwargs, self.prewarm_kwargs),
+            )
+        return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """
+        重建已损坏的进程池，多个任务同时发现损坏时只重建一次
+
+        参数:
+            broken: 发现损坏的进程池
+        """
+        if self._executor is not broken:
+            return
+        print("搜索工作进程异常退出，正在重建进程池")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self.restarts += 1
+
+    async def start(self) -> None:
+        """
+        提前启动全部工作进程(并执行进程内预热)，使第一次搜索不必等待进程启动
+
+        非fork方式下进程池按需逐个启动进程，同时提交与进程数相同的任务才会启动全部进程
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._ensure_executor()
+        pids: set[int] = set()
+        # 先完成初始化的进程可能接走多个任务，重复提交直到每个进程都已响应(即已完成预热)
+        for _ in range(START_ROUNDS):
+            pids.update(await asyncio.gather(
+                *(loop.run_in_executor(executor, _ping, START_PING_HOLD) for _ in range(self.workers))
+            ))
+            if len(pids) >= self.workers:
+                break
+        print(f"搜索工作进程已启动: {len(pids)}/{self.workers}")
+
+    async def submit(self, job: dict[str, Any]) -> dict[str, Any]:
+        """
+        提交搜索任务并等待结果
+
+        参数:
+            job: 任务，格式见run_job
+
+        返回:
+            dict[str, Any]: 任务结果，格式见run_job
+
+        异常:
+            WorkerPoolFull: 等待中的任务数已达上限时抛出
+            BrokenProcessPool: 重建进程池后任务仍导致进程崩溃时抛出
+        """
+        if self.pending >= self.max_pending:
+            raise WorkerPoolFull(f"搜索任务已达上限({self.max_pending})，请稍后再试")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self._ensure_executor()
+                try:
+                    return await loop.run_in_executor(executor, _run_job, job)
+                except BrokenProcessPool:
+                    self._restart(executor)
+                    if attempt:
+                        raise
+        finally:
+            self.pending -= 1
+
+    async def search(self, api: str, file: Optional[bytes] = None, url: Optional[str] = None,
+                     render: bool = True, **kwargs: Any) -> tuple[SearchResult, list[RenderedPage]]:
+        """
+        在工作进程中搜索并渲染结果图
+
+        参数:
+            api: 搜索引擎API名称
+            file: 图像数据
+            url: 图像URL，file为空时使用
+            render: 是否渲染结果图
+            **kwargs: 其他搜索参数
+
+        返回:
+            tuple[SearchResult, list[RenderedPage]]: 结构化结果与编码后的结果图页面
+
+        异常:
+            WorkerPoolFull: 等待中的任务数已达上限时抛出
+        """
+        payload = await self.submit({"api": api, "file": file, "url": url, "render": render, "kwargs": kwargs})
+        return SearchResult.from_dict(payload["result"]), payload["pages"]
+
+    def metrics(self) -> dict[str, int]:
+        """
+        导出工作池统计
+
+        返回:
+            dict[str, int]: 工作进程数、等待中的任务数、任务上限与进程池重建次数
+        """
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "restarts": self.restarts,
+        }
+
+    def close(self) -> None:
+        """
+        关闭进程池并取消排队中的任务
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
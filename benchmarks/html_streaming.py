@@ -0,0 +1,164 @@
+"""
+HTML增量解析基准测试
+
+为Google Lens精确匹配结果页与E-Hentai结果页构造离线样例，比较两种解析方式的耗时与读取的字节数：
+
+    full    解码完整响应体后构建整棵DOM树再选择结果项(改动前的行为)
+    stream  按块送入HTMLItemStream，收集到所需结果项(及其缩略图数据)后停止读取
+
+样例页面:
+
+    google-inline  缩略图数据以_setImagesSrc脚本紧跟在每批结果项之后，可以提前停止
+    google-ldi     缩略图URL集中在页面末尾的google.ldi脚本中，需要读到末尾，耗时与完整解析相当
+    ehentai        只需要第一个画廊
+
+只统计解析开销，不包含网络传输；实际搜索中提前停止还可以省去剩余响应体的下载。
+
+用法:
+    python benchmarks/html_streaming.py [--items 500] [--max-results 50] [--repeat 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ImgRevSearcher.utils.ext_tools import HTML_CHUNK_SIZE, HTMLItemStream  # noqa: E402
+from ImgRevSearcher.utils.response_parser import (EHentaiResponse, GoogleLensExactMatchesResponse,  # noqa: E402
+                                                  GoogleLensStream, is_gallery_element)
+
+# 每批结果项之后出现一段_setImagesSrc脚本
+BATCH = 10
+
+
+def _google_item(i: int) -> str:
+    return (
+        f'<div class="YxbOwd"><a class="ngTNl" href="https://example.com/{i}"><div class="ZhosBf">Match {i}</div></a>'
+        f'<div class="GmoL0c"><div class="zVq10e"><img id="dimg_{i}"></div></div>'
+        f'<div class="oYQBg Zn52Me"><span>1920x1080</span></div></div>'
+    )
+
+
+def google_page(n: int, inline: bool) -> bytes:
+    """
+    构造精确匹配结果页
+
+    参数:
+        n: 结果项数量
+        inline: 缩略图数据是否以内联脚本紧跟在结果项之后，否则集中在页面末尾的google.ldi中
+
+    返回:
+        bytes: 页面内容
+    """
+    base64_image = "data:image/jpeg;base64," + "A" * 3000
+    parts = ["<html><head>", f"<style>{'x' * 200_000}</style>", "</head><body><div>"]
+    for start in range(0, n, BATCH):
+        ids = range(start, min(n, start + BATCH))
+        parts.extend(_google_item(i) for i in ids)
+        if inline:
+            image_ids = ",".join(f"'dimg_{i}'" for i in ids)
+            parts.append(f"<script nonce=\"n\">var s='{base64_image}';var ii=[{image_ids}];_setImagesSrc(ii,s);</script>")
+    parts.append("</div>")
+    if not inline:
+        ldi = ",".join(f"'dimg_{i}':'https://encrypted-tbn0.gstatic.com/images?q={i}'" for i in range(n))
+        parts.append(f"<script nonce=\"n\">google.ldi={{{ldi}}};</script>")
+    parts.append("</body></html>")
+    return "".join(parts).encode()
+
+
+def ehentai_page(n: int) -> bytes:
+    """
+    构造E-Hentai结果页
+
+    参数:
+        n: 画廊数量
+
+    返回:
+        bytes: 页面内容
+    """
+    tags = "".join(f'<div class="gt" title="female:tag{j}">tag{j}</div>' for j in range(20))
+    rows = "".join(
+        f'<tr><td class="gl1c glcat"><div class="cn">Manga</div></td>'
+        f'<td class="gl2c"><div class="glthumb"><img src="https://ehgt.org/t/{i}.jpg"></div>'
+        f'<div id="posted_{i}">2024-01-01 00:00</div></td>'
+        f'<td class="gl3c glname"><a href="https://e-hentai.org/g/{i}/token/">'
+        f'<div class="glink">Gallery {i}</div><div>{tags}</div></a></td>'
+        f'<td class="gl4c glhide"><div>uploader</div><div>{i} pages</div></td></tr>'
+        for i in range(n)
+    )
+    return (f"<html><head><style>{'x' * 20000}</style></head><body>"
+            f'<table class="itg gltc"><tr><th>Category</th></tr>{rows}</table></body></html>').encode()
+
+
+def feed(body: bytes, stream: HTMLItemStream) -> HTMLItemStream:
+    for start in range(0, len(body), HTML_CHUNK_SIZE):
+        stream.feed(body[start:start + HTML_CHUNK_SIZE])
+        if stream.done:
+            stream.close(complete=False)
+            return stream
+    stream.close()
+    return stream
+
+
+def scenarios(items: int, max_results: int) -> dict[str, tuple[bytes, Callable[[bytes], Any], Callable[[bytes], Any]]]:
+    """
+    构造各样例页面及其两种解析方式
+
+    返回:
+        dict: 样例名到(页面, full解析函数, stream解析函数)的映射，解析函数返回(响应对象, 读取字节数)
+    """
+    google_full = lambda body: (GoogleLensExactMatchesResponse(body.decode(), "", max_results=max_results), len(body))
+
+    def google_stream(body: bytes) -> tuple[Any, int]:
+        stream = feed(body, GoogleLensStream(True, max_results))
+        return GoogleLensExactMatchesResponse(stream, "", max_results=max_results), stream.bytes_read
+
+    def ehentai_stream(body: bytes) -> tuple[Any, int]:
+        stream = feed(body, HTMLItemStream(is_gallery_element, 1))
+        return EHentaiResponse(stream, ""), stream.bytes_read
+
+    return {
+        "google-inline": (google_page(items, True), google_full, google_stream),
+        "google-ldi": (google_page(items, False), google_full, google_stream),
+        "ehentai": (ehentai_page(items), lambda body: (EHentaiResponse(body.decode(), ""), len(body)), ehentai_stream),
+    }
+
+
+def bench(parse: Callable[[bytes], Any], body: bytes, repeat: int) -> tuple[float, int, int]:
+    """
+    多次解析并统计耗时中位数
+
+    返回:
+        tuple[float, int, int]: 耗时中位数(秒)、读取字节数与结果数量
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response, bytes_read = parse(body)
+        records = response.to_records()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), bytes_read, len(records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="比较完整解析与增量解析结果页的耗时")
+    parser.add_argument("--items", type=int, default=500, help="每个页面包含的结果项数量")
+    parser.add_argument("--max-results", type=int, default=50, help="Google Lens的max_results")
+    parser.add_argument("--repeat", type=int, default=20, help="每种方式的解析次数")
+    args = parser.parse_args()
+    header = f"{'page':<16}{'mode':<8}{'time':>10}{'read':>12}{'page size':>12}{'records':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, (body, full, stream) in scenarios(args.items, args.max_results).items():
+        for mode, parse in (("full", full), ("stream", stream)):
+            seconds, bytes_read, records = bench(parse, body, args.repeat)
+            print(f"{name:<16}{mode:<8}{seconds * 1000:>8.1f}ms{bytes_read / 1024:>10.0f}KB"
+                  f"{len(body) / 1024:>10.0f}KB{records:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+HTTP/2 多路复用基准测试
+
+在本地启动一个同时支持HTTP/1.1与HTTP/2(TLS + ALPN)的替身服务器，按各引擎一次搜索的请求流程
+(请求顺序、并发关系与上传大小)模拟搜索，比较三种模式下每次搜索的延迟与新建连接数：
+
+    http1-new     每次搜索新建客户端，HTTP/1.1（共享连接池之前的行为）
+    http1-pooled  共享连接池，HTTP/1.1，并发请求仍需各自占用一条连接
+    http2-pooled  共享连接池，HTTP/2，同一主机的所有请求复用一条多路复用连接
+
+本地回环几乎没有网络延迟，服务器按--rtt模拟往返时间：每个响应延迟1个RTT，
+每条新连接在处理第一个请求前额外延迟--handshake-rtts个RTT(TCP与TLS握手)。
+
+需要安装h2(pip install httpx[http2])，并使用openssl命令生成临时自签名证书。
+
+用法:
+    python benchmarks/http2_multiplexing.py [--rtt 40] [--searches 10] [--concurrency 4] [--engines google,tineye]
+"""
+import argparse
+import asyncio
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ImgRevSearcher.utils.network import Network, close_pooled_transports, http2_available  # noqa: E402
+
+MODES = ("http1-new", "http1-pooled", "http2-pooled")
+
+# 各引擎一次搜索的请求流程：按顺序执行的步骤，每个步骤内的请求并发发出，(方法, 路径, 上传字节数)
+FLOWS: dict[str, list[list[tuple[str, str, int]]]] = {
+    # 上传图片后请求精确匹配标签页
+    "google": [[("POST", "/upload", 200_000)], [("GET", "/search?udm=48", 0)]],
+    # 获取会话后依次提交两次next-action
+    "copyseeker": [[("GET", "/", 0)], [("POST", "/upload", 200_000)], [("POST", "/discovery", 2_000)]],
+    # 搜索结果与域名列表并发请求，再并发获取后续页
+    "tineye": [
+        [("POST", "/api/v1/result_json/", 200_000), ("GET", "/api/v1/search/get_domains/", 0)],
+        [("GET", "/api/v1/result_json/?page=2", 0), ("GET", "/api/v1/result_json/?page=3", 0)],
+    ],
+    "saucenao": [[("POST", "/search.php", 200_000)]],
+}
+
+# 替身服务器的响应体大小
+RESPONSE_BYTES = 32_000
+# 替身服务器通告的HTTP/2流与连接接收窗口，与主流搜索引擎的设置相近；使用协议默认的64KB窗口时，
+# 上传图片需要多次等待WINDOW_UPDATE，不能代表真实服务器
+STREAM_WINDOW = 1 << 20
+CONNECTION_WINDOW = 15 << 20
+
+
+def create_certificate(directory: str) -> tuple[str, str]:
+    """
+    使用openssl生成临时自签名证书
+
+    参数:
+        directory: 证书输出目录
+
+    返回:
+        tuple[str, str]: 证书与私钥路径
+    """
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=localhost"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+class StandInServer:
+    """
+    本地替身服务器，按ALPN协商结果以HTTP/1.1或HTTP/2处理请求，并模拟握手与往返延迟
+    """
+
+    def __init__(self, cert: str, key: str, rtt: float, handshake_rtts: int):
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(cert, key)
+        self.context.set_alpn_protocols(["h2", "http/1.1"])
+        self.rtt = rtt
+        self.handshake_rtts = handshake_rtts
+        self.connections = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=self.context)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.rtt * self.handshake_rtts)
+        try:
+            if writer.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_h1(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if length:
+                await reader.readexactly(length)
+            await asyncio.sleep(self.rtt)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n"
+                         b"Content-Length: %d\r\n\r\n" % RESPONSE_BYTES + b"x" * RESPONSE_BYTES)
+            await writer.drain()
+
+    async def _serve_h2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.settings
+
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.local_settings = h2.settings.Settings(client=False, initial_values={
+            h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: STREAM_WINDOW,
+            h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 100,
+        })
+        conn.initiate_connection()
+        conn.increment_flow_control_window(CONNECTION_WINDOW)
+        writer.write(conn.data_to_send())
+
+        window_open = asyncio.Event()
+
+        async def respond(stream_id: int) -> None:
+            await asyncio.sleep(self.rtt)
+            conn.send_headers(stream_id, [(":status", "200"), ("content-length", str(RESPONSE_BYTES))])
+            remaining = RESPONSE_BYTES
+            while remaining:
+                size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, remaining)
+                if size <= 0:
+                    window_open.clear()
+                    await window_open.wait()
+                    continue
+                remaining -= size
+                conn.send_data(stream_id, b"x" * size, end_stream=not remaining)
+                writer.write(conn.data_to_send())
+
+        tasks = set()
+        while data := await reader.read(65536):
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.WindowUpdated):
+                    window_open.set()
+                elif isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.create_task(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+
+async def run_search(base: str, flow: list[list[tuple[str, str, int]]], mode: str) -> float:
+    """
+    按引擎流程执行一次模拟搜索，同一次搜索内的请求共用一个客户端
+
+    参数:
+        base: 替身服务器地址
+        flow: 请求流程
+        mode: 连接模式
+
+    返回:
+        float: 搜索耗时(秒)
+    """
+    start = time.perf_counter()
+    async with Network(verify_ssl=False, pooled=mode != "http1-new", http2=mode == "http2-pooled") as client:
+        for step in flow:
+            responses = await asyncio.gather(*(
+                client.request(method, base + path, content=b"\0" * size if size else None)
+                for method, path, size in step
+            ))
+            for response in responses:
+                response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def bench_engine(server: StandInServer, engine: str, mode: str,
+                       searches: int, concurrency: int) -> dict[str, Any]:
+    """
+    统计一个引擎在一种模式下的搜索延迟与新建连接数
+
+    参数:
+        server: 替身服务器
+        engine: 引擎名
+        mode: 连接模式
+        searches: 每个并发槽依次执行的搜索次数
+        concurrency: 同时进行的搜索数
+
+    返回:
+        dict[str, Any]: 延迟中位数、P95、总耗时与新建连接数
+    """
+    base = f"https://localhost:{server.port}"
+    connections = server.connections
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        for _ in range(searches):
+            latencies.append(await run_search(base, FLOWS[engine], mode))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await close_pooled_transports()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "elapsed": elapsed,
+        "connections": server.connections - connections,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = create_certificate(directory)
+        server = StandInServer(cert, key, args.rtt / 1000, args.handshake_rtts)
+        await server.start()
+        try:
+            print(f"RTT {args.rtt:.0f} ms，握手 {args.handshake_rtts} RTT，"
+                  f"{args.concurrency} 个并发槽各执行 {args.searches} 次搜索")
+            header = f"{'engine':<12}{'mode':<14}{'p50':>10}{'p95':>10}{'total':>10}{'conns':>8}"
+            print(header)
+            print("-" * len(header))
+            for engine in engines:
+                for mode in MODES:
+                    result = await bench_engine(server, engine, mode, args.searches, args.concurrency)
+                    print(f"{engine:<12}{mode:<14}{result['p50'] * 1000:>8.0f}ms{result['p95'] * 1000:>8.0f}ms"
+                          f"{result['elapsed']:>9.2f}s{result['connections']:>8}")
+        finally:
+            await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="比较各引擎搜索流程在HTTP/1.1与HTTP/2下的延迟")
+    parser.add_argument("--rtt", type=float, default=40, help="模拟的往返时间(毫秒)")
+    parser.add_argument("--handshake-rtts", type=int, default=2, help="新建连接(TCP与TLS握手)消耗的RTT数")
+    parser.add_argument("--searches", type=int, default=10, help="每个并发槽依次执行的搜索次数")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时进行的搜索数")
+    parser.add_argument("--engines", default=",".join(FLOWS), help="以逗号分隔的引擎列表")
+    args = parser.parse_args()
+    if not http2_available():
+        raise SystemExit("需要安装h2: pip install httpx[http2]")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+on_message单条消息开销基准测试
+
+on_message注册为接收所有消息，绝大多数消息与插件无关。本脚本构造几类常见的群消息，
+比较两种处理路径在"发送者没有会话、消息也不是指令"时的单条耗时：
+
+    legacy     改动前的路径：拼接全部文本段判断指令，再将每个消息段转为字符串正则提取图片URL
+    prefilter  starts_with_trigger只检查首个非空文本段，再查询会话存储，二者都不满足即返回
+
+消息段使用与AstrBot消息段相同属性(type/url)的简单对象，不依赖AstrBot运行环境。
+
+用法:
+    python benchmarks/on_message_prefilter.py [--number 200000]
+"""
+import argparse
+import asyncio
+import re
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ImgRevSearcher.utils.session_store import SessionStore  # noqa: E402
+from message_utils import get_message_text, starts_with_trigger  # noqa: E402
+
+
+class Component:
+    """
+    模拟AstrBot消息段，str()与pydantic模型的输出格式一致(如type='Image' url='...')
+    """
+
+    def __init__(self, type_: str, **fields):
+        self.type = type_
+        self.__dict__.update(fields)
+
+    def __str__(self) -> str:
+        return " ".join(f"{k}={v!r}" for k, v in self.__dict__.items())
+
+
+class Message:
+    def __init__(self, components: list, raw_parts: list):
+        self.message = components
+        self.raw_message = {"message": raw_parts}
+
+
+def text_part(text: str) -> dict:
+    return {"type": "text", "data": {"text": text}}
+
+
+def image_part(url: str) -> dict:
+    return {"type": "image", "data": {"url": url, "file": "abc.image"}}
+
+
+def build_messages() -> dict[str, Message]:
+    url = "https://multimedia.nt.qq.com.cn/download?appid=1407&fileid=" + "x" * 120
+    chatter = "今天的活动大家记得准时参加，地点在三楼会议室，有问题随时在群里说"
+    return {
+        "short_text": Message([Component("Plain", text="哈哈哈")], [text_part("哈哈哈")]),
+        "long_text": Message([Component("Plain", text=chatter * 4)], [text_part(chatter * 4)]),
+        "text_image": Message(
+            [Component("Plain", text=chatter), Component("Image", file="abc.image", url=url)],
+            [text_part(chatter), image_part(url)],
+        ),
+        "multi_segment": Message(
+            [Component("At", qq="123456"), Component("Plain", text=chatter)] * 3
+            + [Component("Image", file="abc.image", url=url)] * 2,
+            [{"type": "at", "data": {"qq": "123456"}}, text_part(chatter)] * 3 + [image_part(url)] * 2,
+        ),
+    }
+
+
+def legacy_get_img_urls(message) -> list:
+    img_urls = []
+    for component_str in getattr(message, 'message', []):
+        if "type='Image'" in str(component_str):
+            url_match = re.search(r"url='([^']+)'", str(component_str))
+            if url_match:
+                img_urls.append(url_match.group(1))
+    raw_message = getattr(message, 'raw_message', '')
+    if isinstance(raw_message, dict) and "message" in raw_message:
+        for msg_part in raw_message.get("message", []):
+            if msg_part.get("type") == "image":
+                url = msg_part.get("data", {}).get("url", "")
+                if url and url not in img_urls:
+                    img_urls.append(url)
+    return img_urls
+
+
+def legacy(message, states: dict, user_id: str) -> bool:
+    message_text = get_message_text(message)
+    if message_text.strip().startswith("以图搜图"):
+        return True
+    legacy_get_img_urls(message)
+    return user_id in states
+
+
+def prefilter(message, store: SessionStore, user_id: str) -> bool:
+    if starts_with_trigger(message):
+        return True
+    return store.get(user_id) is not None
+
+
+async def run(number: int) -> None:
+    """
+    在事件循环中计时，与插件运行时一致(会话存储的过期定时器需要运行中的事件循环)
+    """
+    store = SessionStore()
+    states = {}
+    for i in range(1000):
+        store.set(f"user{i}", {"step": "waiting_both"}, 3600)
+        states[f"user{i}"] = {"step": "waiting_both"}
+    print(f"{'message':<16}{'legacy (ns)':>14}{'prefilter (ns)':>16}{'speedup':>10}")
+    for name, message in build_messages().items():
+        old = timeit.timeit(lambda: legacy(message, states, "stranger"), number=number)
+        new = timeit.timeit(lambda: prefilter(message, store, "stranger"), number=number)
+        print(f"{name:<16}{old / number * 1e9:>14.0f}{new / number * 1e9:>16.0f}{old / new:>9.1f}x")
+    store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200000, help="每类消息的执行次数")
+    args = parser.parse_args()
+    asyncio.run(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+解析结果内存占用基准测试
+
+为每个引擎构造离线样例响应，分别在三种模式下统计单个响应对象在调用show_result后仍然占用的内存：
+
+    debug    调用set_keep_origin(True)，响应和结果项都保留原始DOM/JSON（接近改动前的行为）
+    default  默认模式，不保留origin，未访问的结果项保持未解析状态
+    compact  默认模式下再调用compact()，解析剩余结果项并释放其引用的原始数据
+
+lxml的DOM树由libxml2直接分配内存，tracemalloc无法统计，因此同时记录进程RSS的增量，
+RSS中还包含DOM树与Python对象交错分配造成的碎片，仅供对比参考。
+每个引擎和模式都在独立的子进程中运行，避免相互影响。
+
+用法:
+    python benchmarks/parser_memory.py [--items 50] [--copies 20] [--engines google,ehentai]
+"""
+import argparse
+import ctypes
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ("debug", "default", "compact")
+
+
+def _padding(size: int) -> str:
+    return "x" * size
+
+
+def animetrace_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import AnimeTraceResponse
+    data = {
+        "code": 0,
+        "ai": False,
+        "trace_id": "trace",
+        "data": [
+            {
+                "box": [0.1, 0.2, 0.3, 0.4],
+                "box_id": f"box{i}",
+                "character": [{"character": f"角色{i}-{j}", "work": f"作品{j}"} for j in range(20)],
+            }
+            for i in range(n)
+        ],
+    }
+    text = json.dumps(data)
+    return lambda: AnimeTraceResponse(json.loads(text), "https://api.animetrace.com/v1/search")
+
+
+def baidu_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import BaiDuResponse
+    row = lambda i: {
+        "thumbUrl": f"https://mms.bdstatic.com/{i}.jpg",
+        "fromUrl": f"https://example.com/page/{i}",
+        "title": [f"标题{i}"],
+        "objURL": f"https://example.com/{i}.jpg",
+        "extra": _padding(400),
+    }
+    data = {
+        "same": {"list": [{**row(i), "url": row(i)["fromUrl"], "image_src": row(i)["thumbUrl"]} for i in range(10)]},
+        "data": {"list": [row(i) for i in range(n)]},
+    }
+    text = json.dumps(data)
+    return lambda: BaiDuResponse(json.loads(text), "https://graph.baidu.com/s")
+
+
+def bing_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import BingResponse
+    value = [
+        {
+            "name": f"Result {i}",
+            "thumbnailUrl": f"https://tse.mm.bing.net/th?id={i}",
+            "hostPageUrl": f"https://example.com/page/{i}",
+            "contentUrl": f"https://example.com/{i}.jpg",
+            "insightsMetadata": {"pagesIncludingCount": i, "availableSizesCount": i},
+            "encodingFormat": "jpeg",
+            "hostPageDisplayUrl": _padding(300),
+        }
+        for i in range(n)
+    ]
+    data = {
+        "tags": [
+            {
+                "actions": [
+                    {"actionType": "PagesIncluding", "data": {"value": value}},
+                    {"actionType": "VisualSearch", "data": {"value": value}},
+                    {"actionType": "BestRepresentativeQuery", "displayName": "best"},
+                ]
+            }
+        ]
+    }
+    text = json.dumps(data)
+    return lambda: BingResponse(json.loads(text), "https://www.bing.com/images/api/custom/knowledge")
+
+
+def copyseeker_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import CopyseekerResponse
+    data = {
+        "id": "discovery",
+        "imageUrl": "https://example.com/query.jpg",
+        "totalLinksFound": n,
+        "pages": [
+            {
+                "url": f"https://example.com/page/{i}",
+                "title": f"Page {i}",
+                "mainImage": f"https://example.com/{i}.jpg",
+                "otherImages": [f"https://example.com/{i}-{j}.jpg" for j in range(10)],
+                "rank": i / n,
+                "snippet": _padding(500),
+            }
+            for i in range(n)
+        ],
+        "visuallySimilarImages": [f"https://example.com/similar/{i}.jpg" for i in range(n)],
+    }
+    text = json.dumps(data)
+    return lambda: CopyseekerResponse(json.loads(text), "https://copyseeker.net/")
+
+
+def ehentai_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import EHentaiResponse
+    row = (
+        '<tr><td class="gl1c glcat"><div class="cn">Manga</div></td>'
+        '<td class="gl2c"><div class="glthumb"><img src="https://ehgt.org/t/{i}.jpg"></div>'
+        '<div id="posted_{i}">2024-01-01 00:00</div></td>'
+        '<td class="gl3c glname"><a href="https://e-hentai.org/g/{i}/token/">'
+        '<div class="glink">Gallery {i}</div><div>{tags}</div></a></td>'
+        '<td class="gl4c glhide"><div>uploader</div><div>{i} pages</div></td></tr>'
+    )
+    tags = "".join(f'<div class="gt" title="female:tag{j}">tag{j}</div>' for j in range(20))
+    rows = "".join(row.format(i=i, tags=tags) for i in range(n))
+    html = (
+        f"<html><head><style>{_padding(20000)}</style></head><body>"
+        f'<table class="itg gltc"><tr><th>Category</th></tr>{rows}</table></body></html>'
+    )
+    return lambda: EHentaiResponse(html, "https://e-hentai.org/")
+
+
+def _google_scripts(n: int) -> str:
+    ldi = ",".join(f"'dimg_{i}':'https://encrypted-tbn0.gstatic.com/images?q={i}'" for i in range(n))
+    ids = ",".join(f"'dimg_b{i}'" for i in range(n))
+    base64_image = "data:image/jpeg;base64," + "A" * 4000
+    return (
+        f"<script nonce=\"n\">google.ldi={{{ldi}}};</script>"
+        f"<script nonce=\"n\">var s='{base64_image}';var ii=[{ids}];_setImagesSrc(ii,s);</script>"
+    )
+
+
+def google_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import GoogleLensResponse
+    item = (
+        '<div class="vEWxFf RCxtQc my5z3d"><a class="LBcIee" href="https://example.com/{i}">'
+        '<div class="Yt787">Result {i}</div></a>'
+        '<div class="gdOPf q07dbf uhHOwf ez24Df"><img data-iid="dimg_{i}"></div></div>'
+    )
+    items = "".join(item.format(i=i) for i in range(n))
+    related = "".join(f'<a class="Kg0xqe" href="/search?q={i}"><div class="I9S4yc">q{i}</div></a>' for i in range(10))
+    html = f"<html><body>{items}{related}<div>{_padding(50000)}</div>{_google_scripts(n)}</body></html>"
+    return lambda: GoogleLensResponse(html, "https://lens.google.com/search")
+
+
+def google_exact_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import GoogleLensExactMatchesResponse
+    item = (
+        '<div class="YxbOwd"><a class="ngTNl" href="https://example.com/{i}"><div class="ZhosBf">Match {i}</div></a>'
+        '<div class="GmoL0c"><div class="zVq10e"><img data-iid="dimg_b{i}"></div></div>'
+        '<div class="oYQBg Zn52Me"><span>1920x1080</span></div></div>'
+    )
+    items = "".join(item.format(i=i) for i in range(n))
+    html = f"<html><body>{items}<div>{_padding(50000)}</div>{_google_scripts(n)}</body></html>"
+    return lambda: GoogleLensExactMatchesResponse(html, "https://lens.google.com/search")
+
+
+def saucenao_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import SauceNAOResponse
+    data = {
+        "status_code": 200,
+        "header": {"short_remaining": 3, "long_remaining": 99, "short_limit": "4", "long_limit": "100", "status": 0},
+        "results": [
+            {
+                "header": {
+                    "similarity": f"{90 - i / n:.2f}",
+                    "thumbnail": f"https://img3.saucenao.com/res/{i}.jpg",
+                    "index_id": 5,
+                    "index_name": f"Index #5: Pixiv Images - {i}.jpg",
+                },
+                "data": {
+                    "ext_urls": [f"https://www.pixiv.net/artworks/{i}"],
+                    "title": f"作品{i}",
+                    "pixiv_id": i,
+                    "member_name": f"作者{i}",
+                    "member_id": i,
+                    "caption": _padding(300),
+                },
+            }
+            for i in range(n)
+        ],
+    }
+    text = json.dumps(data)
+    return lambda: SauceNAOResponse(json.loads(text), "https://saucenao.com/search.php")
+
+
+def tineye_fixture(n: int) -> Callable[[], Any]:
+    from ImgRevSearcher.utils.response_parser import TineyeResponse
+    data = {
+        "query_hash": "hash",
+        "status_code": 200,
+        "total_pages": 1,
+        "matches": [
+            {
+                "image_url": f"https://img.tineye.com/result/{i}",
+                "domain": f"example{i}.com",
+                "width": 1920,
+                "height": 1080,
+                "backlinks": [
+                    {
+                        "url": f"https://example{i}.com/{j}.jpg",
+                        "backlink": f"https://example{i}.com/page/{j}",
+                        "crawl_date": "2024-01-01",
+                        "image_name": _padding(100),
+                    }
+                    for j in range(5)
+                ],
+            }
+            for i in range(n)
+        ],
+    }
+    text = json.dumps(data)
+    return lambda: TineyeResponse(json.loads(text), "https://tineye.com/search/hash", [])
+
+
+FIXTURES: dict[str, Callable[[int], Callable[[], Any]]] = {
+    "animetrace": animetrace_fixture,
+    "baidu": baidu_fixture,
+    "bing": bing_fixture,
+    "copyseeker": copyseeker_fixture,
+    "ehentai": ehentai_fixture,
+    "google": google_fixture,
+    "google_exact": google_exact_fixture,
+    "saucenao": saucenao_fixture,
+    "tineye": tineye_fixture,
+}
+
+
+def _rss() -> int:
+    """
+    读取当前进程的常驻内存大小(字节)，非Linux平台返回0
+
+    读取前先让glibc把空闲的堆内存归还给系统，否则已释放的DOM树仍会计入RSS
+    """
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def run_worker(engine: str, mode: str, items: int, copies: int) -> dict[str, Any]:
+    """
+    在当前进程中构造若干份响应对象并统计其占用的内存
+
+    参数:
+        engine: 引擎名称
+        mode: 统计模式
+        items: 每个响应包含的结果项数量
+        copies: 同时保留的响应对象数量
+
+    返回:
+        dict[str, Any]: 单个响应的Python堆占用和RSS增量
+    """
+    from ImgRevSearcher.utils.response_parser import set_keep_origin
+    set_keep_origin(mode == "debug")
+    build = FIXTURES[engine](items)
+    build().show_result()
+    gc.collect()
+    rss_before = _rss()
+    tracemalloc.start()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    kept = []
+    for _ in range(copies):
+        response = build()
+        response.show_result()
+        if mode == "compact":
+            response.compact()
+        kept.append(response)
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - traced_before
+    tracemalloc.stop()
+    rss = _rss() - rss_before
+    return {"engine": engine, "mode": mode, "heap": traced / copies, "rss": max(rss, 0) / copies}
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} MiB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="统计各引擎解析结果的内存占用")
+    parser.add_argument("--items", type=int, default=50, help="每个响应包含的结果项数量")
+    parser.add_argument("--copies", type=int, default=20, help="同时保留的响应对象数量")
+    parser.add_argument("--engines", default=",".join(FIXTURES), help="以逗号分隔的引擎列表")
+    parser.add_argument("--worker", nargs=2, metavar=("ENGINE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(run_worker(args.worker[0], args.worker[1], args.items, args.copies)))
+        return
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    print(f"每个响应 {args.items} 个结果项，同时保留 {args.copies} 个响应，数值为单个响应的平均占用")
+    header = f"{'engine':<14}" + "".join(f"{m + ' heap':>16}{m + ' rss':>16}" for m in MODES)
+    print(header)
+    print("-" * len(header))
+    for engine in engines:
+        row = f"{engine:<14}"
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--items", str(args.items), "--copies", str(args.copies),
+                 "--worker", engine, mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            row += f"{_format_size(result['heap']):>16}{_format_size(result['rss']):>16}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
 import asyncio
 import io
 import os
-import re
 import tempfile
-import time
-from typing import List
+from typing import List, Optional, Tuple, Union
 from pathlib import Path
 import httpx
 from PIL import Image, ImageDraw, ImageFont
@@ -12,12 +10,23 @@ from astrbot.api.event import AstrMessageEvent, filter
 from astrbot.api.message_components import Image as AstrImage, Nodes, Node, Plain
 from astrbot.api.star import Context, Star, register
 from .ImgRevSearcher.model import BaseSearchModel
+from .ImgRevSearcher.prewarm import prewarm
+from .ImgRevSearcher.utils.image_budget import ImageBudgetError
+from .ImgRevSearcher.utils.result_pages import RenderedPage
+from .ImgRevSearcher.utils.result_record import SearchResult, format_preview, split_records
+from .ImgRevSearcher.utils.session_store import SessionStore
+from .ImgRevSearcher.worker_pool import SearchWorkerPool, WorkerPoolFull
+from .message_utils import get_img_urls, get_message_text, is_image_url, starts_with_trigger
 
 # 支持的所有图像搜索引擎
 ALL_ENGINES = [
     "animetrace", "baidu", "bing", "copyseeker", "ehentai", "google", "saucenao", "tineye"
 ]
 
+# 会话有效期(秒)：等待引擎/图片输入，以及等待用户确认是否需要文本结果
+SESSION_TTL = 30
+TEXT_CONFIRM_TTL = 10
+
 # 各引擎基础信息
 ENGINE_INFO = {
     "animetrace": {"url": "https://www.animetrace.com/", "anime": True},
@@ -47,105 +56,6 @@ COLOR_THEME = {
     "hint": (100, 100, 100)
 }
 
-def is_image_url(text: str) -> bool:
-    """
-    判断文本是否为图片URL（http开头，常见图片扩展名结尾）
-
-    参数:
-        text (str): 待检测文本
-
-    返回:
-        bool: 是图片则True，否则False
-
-    异常:
-        无
-    """
-    return bool(re.match(r"^https://.*\.(jpg|jpeg|png|gif|webp|bmp)$", text, re.IGNORECASE))
-
-def split_text_by_length(text: str, max_length: int = 4000) -> List[str]:
-    """
-    按最大长度将长文本智能断行拆分，优先按50连字符切分
-
-    参数:
-        text (str): 待分割文本
-        max_length (int): 每段最大长度
-
-    返回:
-        List[str]: 拆分碎片
-
-    异常:
-        无
-    """
-    if len(text) <= max_length:
-        return [text]
-    separator = "-" * 50
-    result = []
-    while text:
-        if len(text) <= max_length:
-            result.append(text)
-            break
-        cut_index = max_length
-        separator_index = text.rfind(separator, 0, max_length)
-        if separator_index != -1 and separator_index > max_length // 2:
-            cut_index = separator_index + len(separator)
-        result.append(text[:cut_index])
-        text = text[cut_index:]
-    return result
-
-def get_img_urls(message) -> List[str]:
-    """
-    从消息对象中提取所有图片的URL
-
-    参数:
-        message: 消息体对象，可含message或raw_message属性
-
-    返回:
-        List[str]: 图片URL列表
-
-    异常:
-        无
-    """
-    img_urls = []
-    for component_str in getattr(message, 'message', []):
-        if "type='Image'" in str(component_str):
-            url_match = re.search(r"url='([^']+)'", str(component_str))
-            if url_match:
-                img_urls.append(url_match.group(1))
-    raw_message = getattr(message, 'raw_message', '')
-    if isinstance(raw_message, dict) and "message" in raw_message:
-        for msg_part in raw_message.get("message", []):
-            if msg_part.get("type") == "image":
-                data = msg_part.get("data", {})
-                url = data.get("url", "")
-                if url and url not in img_urls:
-                    img_urls.append(url)
-    return img_urls
-
-def get_message_text(message) -> str:
-    """
-    提取消息对象中的文本内容（忽略图片和其他非文本消息段落）
-
-    参数:
-        message: 消息体对象
-
-    返回:
-        str: 提取到的文本内容（去首尾空格）
-
-    异常:
-        无
-    """
-    raw_message = getattr(message, 'raw_message', '')
-    if isinstance(raw_message, str):
-        return raw_message.strip()
-    elif isinstance(raw_message, dict) and "message" in raw_message:
-        texts = [
-            msg_part.get("data", {}).get("text", "")
-            for msg_part in raw_message.get("message", [])
-            if msg_part.get("type") == "text"
-        ]
-        return " ".join(texts).strip()
-    return ''
-
 
 @register("astrbot_plugin_img_rev_searcher", "drdon1234", "以图搜图，找出处", "2.3")
 class ImgRevSearcherPlugin(Star):
@@ -165,10 +75,12 @@ class ImgRevSearcherPlugin(Star):
 
         变量:
             client: HTTP异步客户端
-            user_states: 用户状态字典
-            cleanup_task: 用户超时定时清理协程
+            user_states: 用户会话存储，到期自动清除
             available_engines: 实际启用的引擎列表
             search_model: 搜索执行模型
+            worker_pool: 进程外搜索工作池，未启用时为None
+            batch_config: 多图批量搜索配置
+            prewarm_task: 后台启动预热任务，未启用时为None
             state_handlers: 状态处理器方法字典
 
         返回:
@@ -179,17 +91,58 @@ class ImgRevSearcherPlugin(Star):
         """
         super().__init__(context)
         self.client = httpx.AsyncClient()
-        self.user_states = {}
-        self.cleanup_task = asyncio.create_task(self.cleanup_loop())
+        session_config = config.get("session_store", {})
+        self.user_states = SessionStore(
+            max_bytes=int(session_config.get("max_memory_mb", 64) * 1024 * 1024),
+            spill_threshold=int(session_config.get("spill_threshold_kb", 512) * 1024),
+            spill_dir=session_config.get("spill_dir") or None,
+            spill_max_bytes=int(session_config.get("spill_max_mb", 256) * 1024 * 1024),
+        )
         available_apis_config = config.get("available_apis", {})
         self.available_engines = [e for e in ALL_ENGINES if available_apis_config.get(e, True)]
-        self.search_model = BaseSearchModel(
+        model_kwargs = dict(
             proxies=config.get("proxies", ""),
             timeout=60,
             default_params=config.get("default_params", {}),
             default_cookies=config.get("default_cookies", {}),
-            auto_google_config=config.get("auto_google_cookie", {})
+            auto_google_config=config.get("auto_google_cookie", {}),
+            timeout_config=config.get("timeout", {}),
+            url_passthrough=config.get("url_passthrough", {}),
+            result_card=config.get("result_card", {}),
+            shared_backend=config.get("shared_backend", {}),
+            image_normalize=config.get("image_normalize", {}),
+            image_budget=config.get("image_budget", {}),
+            result_pages=config.get("result_pages", {}),
+            proxy_routing=config.get("proxy_routing", {}),
+            dns_cache=config.get("dns_cache", {}),
+            http2=config.get("http2", {})
         )
+        self.search_model = BaseSearchModel(**model_kwargs)
+        self.batch_config = {"enabled": True, "max_images": 9, "concurrency": 3, **config.get("batch_search", {})}
+        self.preview_config = {"enabled": True, "top_n": 3, **config.get("stream_preview", {})}
+        self.prewarm_config = {"enabled": True, "connect": True, "connect_timeout": 10, **config.get("prewarm", {})}
+        prewarm_kwargs = None
+        if self.prewarm_config.get("enabled", True) and self.available_engines:
+            prewarm_kwargs = dict(
+                engines=self.available_engines,
+                connect=self.prewarm_config.get("connect", True),
+                connect_timeout=float(self.prewarm_config.get("connect_timeout", 10)) or None
+            )
+        worker_config = config.get("worker_pool", {})
+        self.worker_pool = None
+        if worker_config.get("enabled", False):
+            self.worker_pool = SearchWorkerPool(
+                model_kwargs=model_kwargs,
+                workers=worker_config.get("workers", 2),
+                max_pending=worker_config.get("max_pending", 16),
+                prewarm_kwargs=prewarm_kwargs
+            )
+        self.prewarm_task = None
+        if prewarm_kwargs:
+            try:
+                self.prewarm_task = asyncio.get_running_loop().create_task(self._prewarm(prewarm_kwargs))
+            except RuntimeError:
+                print("没有运行中的事件循环，跳过启动预热")
         self.state_handlers = {
             "waiting_text_confirm": self._handle_waiting_text_confirm,
             "waiting_engine": self._handle_waiting_engine,
@@ -197,37 +150,42 @@ class ImgRevSearcherPlugin(Star):
             "waiting_image": self._handle_waiting_image,
         }
 
-    async def cleanup_loop(self):
+    async def _prewarm(self, prewarm_kwargs: dict):
         """
-        定时清理超时无响应的用户状态数据
+        后台启动预热：启用工作池时启动工作进程并在进程内预热，否则在当前事件循环中预热搜索模型
+
+        参数:
+            prewarm_kwargs: prewarm的参数(engines、connect、connect_timeout)
 
         异常:
-            无（彻底失效的用户会被字典剔除）
-        """
-        while True:
-            await asyncio.sleep(600)
-            now = time.time()
-            to_delete = [
-                user_id for user_id, state in list(self.user_states.items())
-                if now - state['timestamp'] > 30
-            ]
-            for user_id in to_delete:
-                del self.user_states[user_id]
+            无
+        """
+        try:
+            if self.worker_pool:
+                await self.worker_pool.start()
+                return
+            await prewarm(self.search_model, **prewarm_kwargs)
+        except Exception as e:
+            print(f"启动预热失败: {e}")
 
     async def terminate(self):
         """
-        插件关闭时收尾操作：关闭http连接与定时清理任务
+        插件关闭时收尾操作：取消预热任务，关闭http连接、搜索模型的缩略图客户端与共享后端、搜索工作池，清空会话存储
 
         异常:
             无
         """
+        if self.prewarm_task and not self.prewarm_task.done():
+            self.prewarm_task.cancel()
         await self.client.aclose()
-        if hasattr(self, 'cleanup_task'):
-            self.cleanup_task.cancel()
+        await self.search_model.close()
+        if self.worker_pool:
+            self.worker_pool.close()
+        self.user_states.close()
 
     async def _download_img(self, url: str):
         """
-        异步下载图片数据，转为BytesIO对象
+        异步下载图片数据，转为BytesIO对象，超过字节预算时中止下载
 
         参数:
             url (str): 图片URL
@@ -236,41 +194,101 @@ class ImgRevSearcherPlugin(Star):
             io.BytesIO or None: 成功则为图片数据流，否则None
 
         异常:
-            网络异常会吞掉，返回None
+            网络异常与超出预算会吞掉，返回None
         """
         try:
-            r = await self.client.get(url, timeout=15)
-            if r.status_code == 200:
-                return io.BytesIO(r.content)
+            async with self.client.stream("GET", url, timeout=15) as r:
+                if r.status_code != 200:
+                    return None
+                buffer = io.BytesIO()
+                async for chunk in r.aiter_bytes():
+                    buffer.write(chunk)
+                    self.search_model.budget.check_bytes(buffer.tell())
+                buffer.seek(0)
+                return buffer
+        except ImageBudgetError as e:
+            print(f"图片下载已中止: {e}")
         except Exception:
             pass
         return None
 
-    async def get_imgs(self, img_urls: List[str]) -> List[io.BytesIO]:
+    async def _preload_image(self, url: str) -> Tuple[Optional[io.BytesIO], Optional[str]]:
+        """
+        预加载用户提供的图片；启用URL透传时只记录URL，推迟到搜索时再按引擎决定是否下载
+
+        参数:
+            url (str): 图片URL
+
+        返回:
+            Tuple[Optional[io.BytesIO], Optional[str]]: 图片数据流与图片URL，均为None表示获取失败
+
+        异常:
+            无
+        """
+        if self.search_model.url_passthrough.get("enabled", False):
+            return None, url
+        img_buffer = await self._download_img(url)
+        return img_buffer, (url if img_buffer else None)
+
+    @staticmethod
+    def _has_image(state: dict) -> bool:
         """
-        批量并发下载多张图片
+        判断用户状态中是否已有待搜索的图片
+
+        参数:
+            state (dict): 用户状态
+
+        返回:
+            bool: 已有图片数据、图片URL或批量图片URL时返回True
+        """
+        return bool(state.get("preloaded_img") or state.get("img_url") or state.get("img_urls"))
+
+    def _batch_urls(self, img_urls: List[str]) -> Optional[List[str]]:
+        """
+        消息中包含多张图片且启用批量搜索时，返回参与批量搜索的图片URL
+
+        参数:
+            img_urls (List[str]): 消息中的图片URL
+
+        返回:
+            Optional[List[str]]: 最多max_images张图片的URL，不满足批量搜索条件时为None
+        """
+        if not self.batch_config.get("enabled", True) or len(img_urls) < 2:
+            return None
+        return img_urls[:max(2, int(self.batch_config.get("max_images", 9)))]
+
+    async def get_imgs(self, img_urls: List[str], concurrency: int = 3) -> List[Optional[io.BytesIO]]:
+        """
+        批量并发下载多张图片，同时进行的下载不超过concurrency个
 
         参数:
             img_urls (List[str]): 目标URL列表
+            concurrency (int): 最大并发下载数
 
         返回:
-            List[io.BytesIO]: 所有获取成功的图片流集合
+            List[Optional[io.BytesIO]]: 与img_urls顺序一致的图片流，下载失败的为None
 
         异常:
             无
         """
         if not img_urls:
             return []
-        imgs = await asyncio.gather(*[self._download_img(url) for url in img_urls])
-        return [img for img in imgs if img is not None]
+        limit = asyncio.Semaphore(max(1, concurrency))
+
+        async def download(url: str) -> Optional[io.BytesIO]:
+            async with limit:
+                return await self._download_img(url)
+
+        return list(await asyncio.gather(*[download(url) for url in img_urls]))
 
-    async def _send_image(self, event: AstrMessageEvent, content: bytes):
+    async def _send_image(self, event: AstrMessageEvent, content: bytes, suffix: str = ".jpg"):
         """
         以临时文件方式向目标事件发送图片消息
 
         参数:
             event: 事件对象
             content: 图片二进制内容
+            suffix: 临时文件扩展名，与图片的编码格式一致
 
         返回:
             yield消息发送结果
@@ -278,13 +296,30 @@ class ImgRevSearcherPlugin(Star):
         异常:
             无
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
             temp_file.write(content)
             temp_file_path = temp_file.name
         yield event.chain_result([AstrImage.fromFileSystem(temp_file_path)])
         if os.path.exists(temp_file_path):
             os.unlink(temp_file_path)
 
+    async def _send_pages(self, event: AstrMessageEvent, engine: str, pages: List[RenderedPage]):
+        """
+        依次发送结果图页面，并在日志中记录每页的编码格式与大小
+
+        参数:
+            event: 事件对象
+            engine: 引擎名称
+            pages: 编码后的结果图页面
+
+        返回:
+            yield消息发送结果
+        """
+        for index, page in enumerate(pages, 1):
+            print(f"{engine} 结果图 {index}/{len(pages)}: {page.describe()}")
+            async for result in self._send_image(event, page.data, page.suffix):
+                yield result
+
     async def _send_engine_intro(self, event: AstrMessageEvent):
         """
         绘制并发送引擎表格介绍图片，便于用户首次选择
@@ -384,14 +419,113 @@ class ImgRevSearcherPlugin(Star):
             async for result in self._send_image(event, output.getvalue()):
                 yield result
 
-    async def _perform_search(self, event: AstrMessageEvent, engine: str, img_buffer: io.BytesIO):
+    async def _perform_search(self, event: AstrMessageEvent, engine: str,
+                              img_buffer: Optional[io.BytesIO] = None, img_url: Optional[str] = None):
         """
         调用模型执行图片反向搜索（含异常提示图渲染）
 
+        仅有图片URL时，按URL透传策略决定直接发送URL或上传文件：透传时只在引擎无法访问URL、需要回退为上传时
+        才下载原图，结果图中不绘制原图；否则用于结果图的原图下载与搜索同时进行；启用文本预览时，搜索完成后先发送前几条结果的文本，
+        再获取缩略图并渲染结果图；启用搜索工作池时，搜索、解析与渲染都在工作进程中完成
+
         参数:
             event: 消息事件对象
             engine: 引擎名称
             img_buffer: 图片二进制流
+            img_url: 图片URL，img_buffer为空时使用
+
+        返回:
+            yield图片/提示
+
+        异常:
+            出错时生成错误提示图片
+        """
+        if self.worker_pool:
+            try:
+                search_result, pages = await self.worker_pool.search(
+                    engine, file=img_buffer.getvalue() if img_buffer is not None else None, url=img_url
+                )
+            except WorkerPoolFull as e:
+                yield event.plain_result(str(e))
+                return
+            except Exception as e:
+                error_page = self.search_model.encode_page(self.search_model.draw_error(engine, str(e)))
+                async for result in self._send_image(event, error_page.data, error_page.suffix):
+                    yield result
+                return
+            async for result in self._send_pages(event, engine, pages):
+                yield result
+            async for result in self._offer_text_result(event, search_result):
+                yield result
+            return
+        download_task = None
+        if img_buffer is not None:
+            stream = self.search_model.search_stream(engine, file=img_buffer.getvalue())
+        else:
+            if not self.search_model.can_pass_url(engine, img_url):
+                download_task = asyncio.create_task(self._download_img(img_url))
+
+            async def load_file():
+                nonlocal download_task
+                if download_task is None:
+                    download_task = asyncio.create_task(self._download_img(img_url))
+                buffer = await download_task
+                return buffer.getvalue() if buffer else None
+
+            stream = self.search_model.search_stream(engine, url=img_url, file_loader=load_file)
+        try:
+            async for search_result in stream:
+                if self.preview_config.get("enabled", True) and not search_result.error:
+                    preview = format_preview(search_result, int(self.preview_config.get("top_n", 3)))
+                    yield event.plain_result(f"{preview}\n结果图生成中，请稍候")
+        finally:
+            if download_task is not None:
+                img_buffer = await download_task
+        try:
+            source_image = None
+            if img_buffer is not None:
+                source_image = await self.search_model.budget.open_image(img_buffer.getvalue())
+            pages = await self.search_model.render_pages(search_result, source_image)
+        except Exception as e:
+            pages = [self.search_model.encode_page(self.search_model.draw_error(engine, str(e)))]
+        async for result in self._send_pages(event, engine, pages):
+            yield result
+        async for result in self._offer_text_result(event, search_result):
+            yield result
+
+    async def _search_state(self, event: AstrMessageEvent, engine: str, state: dict):
+        """
+        按用户状态中的图片执行搜索，有批量图片URL时执行批量搜索
+
+        参数:
+            event: 消息事件对象
+            engine: 引擎名称
+            state: 包含preloaded_img、img_url或img_urls的用户状态
+
+        返回:
+            yield图片/提示
+
+        异常:
+            无
+        """
+        if state.get("img_urls"):
+            async for result in self._perform_batch_search(event, engine, state["img_urls"]):
+                yield result
+        else:
+            async for result in self._perform_search(event, engine, state.get("preloaded_img"), state.get("img_url")):
+                yield result
+
+    async def _perform_batch_search(self, event: AstrMessageEvent, engine: str, img_urls: List[str]):
+        """
+        批量搜索一条消息中的多张图片，汇总为一张结果图
+
+        图片以有限并发下载，再以有限并发并行搜索；启用文本预览时每张图片搜索完成后立即发送其预览，
+        启用搜索工作池时每张图片作为一个任务提交；单张图片下载或搜索失败只影响该图片的结果
+
+        参数:
+            event: 消息事件对象
+            engine: 引擎名称
+            img_urls: 图片URL列表
 
         返回:
             yield图片/提示
@@ -399,26 +533,69 @@ class ImgRevSearcherPlugin(Star):
         异常:
             出错时生成错误提示图片
         """
-        file_bytes = img_buffer.getvalue()
-        result_text = await self.search_model.search(api=engine, file=file_bytes)
-        img_buffer.seek(0)
+        concurrency = max(1, int(self.batch_config.get("concurrency", 3)))
+        yield event.plain_result(f"正在使用 {engine} 搜索 {len(img_urls)} 张图片，请稍候")
+        buffers = await self.get_imgs(img_urls, concurrency)
+        sources = [buffer.getvalue() if buffer is not None else None for buffer in buffers]
+        if self.worker_pool:
+            limit = asyncio.Semaphore(concurrency)
+
+            async def search_in_worker(data: Optional[bytes]) -> SearchResult:
+                if data is None:
+                    return SearchResult(engine, error="图片下载失败")
+                async with limit:
+                    try:
+                        search_result, _ = await self.worker_pool.search(engine, file=data, render=False)
+                        return search_result
+                    except Exception as e:
+                        return SearchResult(engine, error=str(e))
+
+            results = list(await asyncio.gather(*[search_in_worker(data) for data in sources]))
+        else:
+            results = [None] * len(sources)
+            stream = self.search_model.search_batch_stream(engine, sources, concurrency)
+            async for index, search_result in stream:
+                results[index] = search_result
+                if self.preview_config.get("enabled", True) and not search_result.error:
+                    preview = format_preview(search_result, int(self.preview_config.get("top_n", 3)))
+                    yield event.plain_result(f"图片 #{index + 1} {preview}")
         try:
-            source_image = Image.open(img_buffer)
-            result_img = self.search_model.draw_results(engine, result_text, source_image)
+            source_images = []
+            for data in sources:
+                try:
+                    source_images.append(await self.search_model.budget.open_image(data) if data else None)
+                except Exception:
+                    source_images.append(None)
+            result_img = self.search_model.draw_batch(results, source_images)
         except Exception as e:
             result_img = self.search_model.draw_error(engine, str(e))
         with io.BytesIO() as output:
-            result_img.save(output, format="JPEG", quality=85)
-            output.seek(0)
+            result_img.convert("RGB").save(output, format="JPEG", quality=85)
             async for result in self._send_image(event, output.getvalue()):
                 yield result
+        async for result in self._offer_text_result(event, results):
+            yield result
+
+    async def _offer_text_result(self, event: AstrMessageEvent, search_result: Union[SearchResult, List[SearchResult]]):
+        """
+        询问用户是否需要文本格式的结果，并保存结果等待确认
+
+        参数:
+            event: 消息事件对象
+            search_result: 结构化搜索结果，批量搜索时为各图片的结果列表
+
+        返回:
+            yield文本提示
+
+        异常:
+            无
+        """
         yield event.plain_result("需要文本格式的结果吗？回复\"是\"以获取，10秒内有效")
         user_id = event.get_sender_id()
-        self.user_states[user_id] = {
+        self.user_states.set(user_id, {
             "step": "waiting_text_confirm",
-            "timestamp": time.time(),
-            "result_text": result_text
-        }
+            "search_result": search_result
+        }, TEXT_CONFIRM_TTL)
 
     async def _send_engine_prompt(self, event: AstrMessageEvent, state: dict):
         """
@@ -441,7 +618,9 @@ class ImgRevSearcherPlugin(Star):
         if not state.get('engine'):
             async for result in self._send_engine_intro(event):
                 yield result
-        if state.get('preloaded_img'):
+        if state.get("img_urls"):
+            yield event.plain_result(f"已接收 {len(state['img_urls'])} 张图片，请回复引擎名（如{example_engine}），30秒内有效")
+        elif self._has_image(state):
             yield event.plain_result(f"图片已接收，请回复引擎名（如{example_engine}），30秒内有效")
         elif state.get('engine'):
             yield event.plain_result(f"已选择引擎: {state['engine']}，请发送图片或图片URL，30秒内有效")
@@ -463,8 +642,7 @@ class ImgRevSearcherPlugin(Star):
             无
         """
         yield event.plain_result("等待超时，操作取消")
-        if user_id in self.user_states:
-            del self.user_states[user_id]
+        self.user_states.pop(user_id)
         event.stop_event()
 
     async def _handle_waiting_text_confirm(self, event: AstrMessageEvent, state: dict, user_id: str):
@@ -483,31 +661,51 @@ class ImgRevSearcherPlugin(Star):
             无
         """
         message_text = get_message_text(event.message_obj)
-        if time.time() - state["timestamp"] > 10:
-            del self.user_states[user_id]
+        if message_text.strip().lower() == "是":
+            async for result in self._send_forward_result(event, state["search_result"]):
+                yield result
+            self.user_states.pop(user_id)
             event.stop_event()
-            return
-        elif message_text.strip().lower() == "是":
-            text_parts = split_text_by_length(state["result_text"])
-            sender_name = "图片搜索bot"
-            sender_id = event.get_self_id()
+
+    async def _send_forward_result(self, event: AstrMessageEvent, result: Union[SearchResult, List[SearchResult]]):
+        """
+        将结构化搜索结果按结果边界分段，以合并转发消息发送
+
+        参数:
+            event: 事件对象
+            result: 结构化搜索结果，批量搜索时为各图片的结果列表，每张图片单独分段
+
+        返回:
+            yield发送失败时的文本提示
+
+        异常:
+            无
+        """
+        if isinstance(result, list):
+            text_parts = [
+                f"图片 #{index}\n{part}"
+                for index, item in enumerate(result, 1)
+                for part in split_records(item)
+            ]
+        else:
+            text_parts = split_records(result)
+        sender_name = "图片搜索bot"
+        sender_id = event.get_self_id()
+        try:
+            sender_id = int(sender_id)
+        except Exception:
+            sender_id = 10000
+        for i, part in enumerate(text_parts):
+            node = Node(
+                name=sender_name,
+                uin=sender_id,
+                content=[Plain(f"[  搜索结果 {i + 1} / {len(text_parts)}  ]\n\n{part}")]
+            )
+            nodes = Nodes([node])
             try:
-                sender_id = int(sender_id)
-            except Exception:
-                sender_id = 10000
-            for i, part in enumerate(text_parts):
-                node = Node(
-                    name=sender_name,
-                    uin=sender_id,
-                    content=[Plain(f"[  搜索结果 {i + 1} / {len(text_parts)}  ]\n\n{part}")]
-                )
-                nodes = Nodes([node])
-                try:
-                    await event.send(event.chain_result([nodes]))
-                except Exception as e:
-                    yield event.plain_result(f"发送搜索结果失败: {str(e)}")
-            del self.user_states[user_id]
-            event.stop_event()
+                await event.send(event.chain_result([nodes]))
+            except Exception as e:
+                yield event.plain_result(f"发送搜索结果失败: {str(e)}")
 
     async def _handle_waiting_engine(self, event: AstrMessageEvent, state: dict, user_id: str):
         """
@@ -528,25 +726,25 @@ class ImgRevSearcherPlugin(Star):
         message_text = get_message_text(event.message_obj).lower()
         if not message_text:
             yield event.plain_result(f"请回复有效的引擎名（如{example_engine}）")
-            state["timestamp"] = time.time()
+            self.user_states.touch(user_id)
             event.stop_event()
             return
         if message_text in self.available_engines:
             state["engine"] = message_text
-            if state.get("preloaded_img"):
+            if self._has_image(state):
                 try:
-                    async for result in self._perform_search(event, state["engine"], state["preloaded_img"]):
+                    async for result in self._search_state(event, state["engine"], state):
                         yield result
                 except Exception as e:
                     yield event.plain_result(f"搜索失败: {str(e)}")
             else:
                 state["step"] = "waiting_image"
-                state["timestamp"] = time.time()
+                self.user_states.touch(user_id)
                 yield event.plain_result(f"已选择引擎: {message_text}，请在30秒内发送一张图片，我会进行搜索")
         else:
             if message_text in ALL_ENGINES and message_text not in self.available_engines:
                 yield event.plain_result(f"引擎 '{message_text}' 已被禁用，请联系管理员在配置中启用或选择其他引擎（如{example_engine}）")
-                state["timestamp"] = time.time()
+                self.user_states.touch(user_id)
                 async for result in self._send_engine_prompt(event, state):
                     yield result
             else:
@@ -554,10 +752,10 @@ class ImgRevSearcherPlugin(Star):
                 state["invalid_attempts"] += 1
                 if state["invalid_attempts"] >= 2:
                     yield event.plain_result("连续两次输入错误的引擎名，已取消操作")
-                    del self.user_states[user_id]
+                    self.user_states.pop(user_id)
                 else:
                     yield event.plain_result(f"引擎 '{message_text}' 不存在，请回复有效的引擎名（如{example_engine}）")
-                    state["timestamp"] = time.time()
+                    self.user_states.touch(user_id)
                     async for result in self._send_engine_prompt(event, state):
                         yield result
         event.stop_event()
@@ -584,29 +782,34 @@ class ImgRevSearcherPlugin(Star):
         if message_text and message_text in self.available_engines and not state.get('engine'):
             state["engine"] = message_text
             updated = True
-        img_buffer = None
-        if img_urls:
-            img_buffer = await self._download_img(img_urls[0])
-        elif is_image_url(message_text):
-            img_buffer = await self._download_img(message_text)
-        if img_buffer and not state.get('preloaded_img'):
+        img_buffer, img_url = None, None
+        if not self._has_image(state):
+            if batch_urls := self._batch_urls(img_urls):
+                state["img_urls"] = batch_urls
+                updated = True
+            elif img_urls:
+                img_buffer, img_url = await self._preload_image(img_urls[0])
+            elif is_image_url(message_text):
+                img_buffer, img_url = await self._preload_image(message_text)
+        if img_url:
             state["preloaded_img"] = img_buffer
+            state["img_url"] = img_url
             updated = True
-        if state.get("engine") and state.get("preloaded_img"):
+        if state.get("engine") and self._has_image(state):
             try:
-                async for result in self._perform_search(event, state["engine"], state["preloaded_img"]):
+                async for result in self._search_state(event, state["engine"], state):
                     yield result
             except Exception as e:
                 yield event.plain_result(f"搜索失败: {str(e)}")
             event.stop_event()
             return
         if updated:
-            state["timestamp"] = time.time()
+            self.user_states.touch(user_id)
             async for result in self._send_engine_prompt(event, state):
                 yield result
             event.stop_event()
         else:
-            state["timestamp"] = time.time()
+            self.user_states.touch(user_id)
             is_invalid_engine_attempt = message_text and not is_image_url(message_text) and not state.get('engine')
             if is_invalid_engine_attempt:
                 if message_text in ALL_ENGINES and message_text not in self.available_engines:
@@ -620,7 +823,7 @@ class ImgRevSearcherPlugin(Star):
                     state["invalid_attempts"] += 1
                     if state["invalid_attempts"] >= 2:
                         yield event.plain_result("连续两次输入错误的引擎名，已取消操作")
-                        del self.user_states[user_id]
+                        self.user_states.pop(user_id)
                     else:
                         yield event.plain_result(
                             f"引擎 '{message_text}' 不存在，请回复有效的引擎名（如{example_engine}）"
@@ -628,11 +831,11 @@ class ImgRevSearcherPlugin(Star):
                         async for result in self._send_engine_prompt(event, state):
                             yield result
             else:
-                if not state.get('engine') and not state.get('preloaded_img'):
+                if not state.get('engine') and not self._has_image(state):
                     yield event.plain_result(f"请提供引擎名（如{example_engine}）和图片")
                 elif not state.get('engine'):
                     yield event.plain_result(f"请提供引擎名（如{example_engine}）")
-                elif not state.get('preloaded_img'):
+                elif not self._has_image(state):
                     yield event.plain_result("请提供图片")
             event.stop_event()
 
@@ -653,13 +856,18 @@ class ImgRevSearcherPlugin(Star):
         """
         img_urls = get_img_urls(event.message_obj)
         message_text = get_message_text(event.message_obj)
-        img_buffer = None
+        if batch_urls := self._batch_urls(img_urls):
+            async for result in self._perform_batch_search(event, state["engine"], batch_urls):
+                yield result
+            event.stop_event()
+            return
+        img_buffer, img_url = None, None
         if img_urls:
-            img_buffer = await self._download_img(img_urls[0])
+            img_buffer, img_url = await self._preload_image(img_urls[0])
         elif is_image_url(message_text):
-            img_buffer = await self._download_img(message_text)
-        if img_buffer:
-            async for result in self._perform_search(event, state["engine"], img_buffer):
+            img_buffer, img_url = await self._preload_image(message_text)
+        if img_url:
+            async for result in self._perform_search(event, state["engine"], img_buffer, img_url):
                 yield result
             event.stop_event()
         else:
@@ -687,8 +895,7 @@ class ImgRevSearcherPlugin(Star):
         message_text = get_message_text(event.message_obj)
         img_urls = get_img_urls(event.message_obj)
         parts = message_text.strip().split()
-        if user_id in self.user_states:
-            del self.user_states[user_id]
+        self.user_states.pop(user_id)
         engine = None
         url_from_text = None
         invalid_engine = False
@@ -707,19 +914,22 @@ class ImgRevSearcherPlugin(Star):
                     invalid_engine = True
                 if len(parts) > 2 and is_image_url(parts[2]):
                     url_from_text = parts[2]
-        preloaded_img = None
-        if img_urls:
-            preloaded_img = await self._download_img(img_urls[0])
-        elif url_from_text:
-            preloaded_img = await self._download_img(url_from_text)
+        preloaded_img, img_url = None, None
+        batch_urls = self._batch_urls(img_urls)
+        if batch_urls is None:
+            if img_urls:
+                preloaded_img, img_url = await self._preload_image(img_urls[0])
+            elif url_from_text:
+                preloaded_img, img_url = await self._preload_image(url_from_text)
         if disabled_engine:
             state = {
                 "step": "waiting_both",
-                "timestamp": time.time(),
                 "preloaded_img": preloaded_img,
+                "img_url": img_url,
+                "img_urls": batch_urls,
                 "engine": None
             }
-            self.user_states[user_id] = state
+            self.user_states.set(user_id, state, SESSION_TTL)
             yield event.plain_result(
                 f"引擎 '{potential_engine}' 已被禁用，请联系管理员在配置中启用或选择其他引擎（如{example_engine}）")
             async for result in self._send_engine_prompt(event, state):
@@ -729,33 +939,35 @@ class ImgRevSearcherPlugin(Star):
         if invalid_engine:
             state = {
                 "step": "waiting_both",
-                "timestamp": time.time(),
                 "preloaded_img": preloaded_img,
+                "img_url": img_url,
+                "img_urls": batch_urls,
                 "engine": None,
                 "invalid_attempts": 1
             }
-            self.user_states[user_id] = state
+            self.user_states.set(user_id, state, SESSION_TTL)
             yield event.plain_result(
                 f"引擎 '{potential_engine}' 不存在，请提供有效的引擎名（如{example_engine}）")
             async for result in self._send_engine_prompt(event, state):
                 yield result
             event.stop_event()
             return
-        if engine and preloaded_img:
+        state = {
+            "step": "waiting_both",
+            "preloaded_img": preloaded_img,
+            "img_url": img_url,
+            "img_urls": batch_urls,
+            "engine": engine
+        }
+        if engine and self._has_image(state):
             try:
-                async for result in self._perform_search(event, engine, preloaded_img):
+                async for result in self._search_state(event, engine, state):
                     yield result
             except Exception as e:
                 yield event.plain_result(f"搜索失败: {str(e)}")
             event.stop_event()
             return
-        state = {
-            "step": "waiting_both",
-            "timestamp": time.time(),
-            "preloaded_img": preloaded_img,
-            "engine": engine
-        }
-        self.user_states[user_id] = state
+        self.user_states.set(user_id, state, SESSION_TTL)
         async for result in self._send_engine_prompt(event, state):
             yield result
         event.stop_event()
@@ -765,6 +977,9 @@ class ImgRevSearcherPlugin(Star):
         """
         插件消息收发主入口，处理各种状态下用户输入分发
 
+        该过滤器接收所有消息，只先检查首个文本段是否为指令以及发送者是否有会话，
+        二者都不满足时直接返回，不提取完整文本和图片
+
         参数:
             event: AstrMessageEvent事件对象
 
@@ -775,21 +990,18 @@ class ImgRevSearcherPlugin(Star):
             无
         """
         user_id = event.get_sender_id()
-        message_text = get_message_text(event.message_obj)
-        if message_text.strip().startswith("以图搜图"):
+        if starts_with_trigger(event.message_obj):
             async for result in self._handle_initial_search_command(event, user_id):
                 yield result
             return
         state = self.user_states.get(user_id)
         if not state:
-            return
-        if state.get("step") == "waiting_text_confirm" and time.time() - state["timestamp"] > 10:
-            del self.user_states[user_id]
-            event.stop_event()
-            return
-        if time.time() - state["timestamp"] > 30:
-            async for result in self._handle_timeout(event, user_id):
-                yield result
+            expired_step = self.user_states.pop_expired(user_id)
+            if expired_step == "waiting_text_confirm":
+                event.stop_event()
+            elif expired_step:
+                async for result in self._handle_timeout(event, user_id):
+                    yield result
             return
         handler = self.state_handlers.get(state.get("step"))
         if handler:
@@ -0,0 +1,137 @@
+import re
+from typing import List, Optional
+
+# 触发插件的指令前缀
+TRIGGER = "以图搜图"
+
+IMAGE_URL_PATTERN = re.compile(r"^https://.*\.(jpg|jpeg|png|gif|webp|bmp)$", re.IGNORECASE)
+
+def is_image_url(text: str) -> bool:
+    """
+    判断文本是否为图片URL（http开头，常见图片扩展名结尾）
+    
+    参数:
+        text (str): 待检测文本
+    
+    返回:
+        bool: 是图片则True，否则False
+    
+    异常:
+        无
+    """
+    return bool(IMAGE_URL_PATTERN.match(text))
+
+def _is_image_component(component) -> bool:
+    """
+    根据消息段的type属性判断是否为图片，兼容枚举与字符串两种取值
+    
+    参数:
+        component: 消息段对象
+    
+    返回:
+        bool: 是图片消息段则True
+    """
+    component_type = getattr(component, "type", None)
+    return getattr(component_type, "value", component_type) == "Image"
+
+def get_img_urls(message) -> List[str]:
+    """
+    从消息对象中提取所有图片的URL
+    
+    直接读取消息段的type与url属性，不再将消息段转为字符串后正则匹配
+    
+    参数:
+        message: 消息体对象，可含message或raw_message属性
+    
+    返回:
+        List[str]: 图片URL列表
+    
+    异常:
+        无
+    """
+    img_urls = []
+    for component in getattr(message, 'message', None) or []:
+        if _is_image_component(component):
+            url = getattr(component, "url", None)
+            if url:
+                img_urls.append(url)
+    raw_message = getattr(message, 'raw_message', '')
+    if isinstance(raw_message, dict) and "message" in raw_message:
+        for msg_part in raw_message.get("message", []):
+            if msg_part.get("type") == "image":
+                data = msg_part.get("data", {})
+                url = data.get("url", "")
+                if url and url not in img_urls:
+                    img_urls.append(url)
+    return img_urls
+
+def get_message_text(message) -> str:
+    """
+    提取消息对象中的文本内容（忽略图片和其他非文本消息段落）
+    
+    参数:
+        message: 消息体对象
+    
+    返回:
+        str: 提取到的文本内容（去首尾空格）
+    
+    异常:
+        无
+    """
+    raw_message = getattr(message, 'raw_message', '')
+    if isinstance(raw_message, str):
+        return raw_message.strip()
+    elif isinstance(raw_message, dict) and "message" in raw_message:
+        texts = [
+            msg_part.get("data", {}).get("text", "")
+            for msg_part in raw_message.get("message", [])
+            if msg_part.get("type") == "text"
+        ]
+        return " ".join(texts).strip()
+    return ''
+
+def starts_with_trigger(message, trigger: str = TRIGGER) -> bool:
+    """
+    判断消息是否以触发指令开头，只检查第一个非空文本段，无需拼接全部文本
+    
+    与get_message_text(message).startswith(trigger)结果一致
+    
+    参数:
+        message: 消息体对象
+        trigger: 指令前缀
+    
+    返回:
+        bool: 以指令开头则True
+    
+    异常:
+        无
+    """
+    raw_message = getattr(message, 'raw_message', '')
+    if isinstance(raw_message, str):
+        return _text_starts_with(raw_message, trigger) is True
+    if isinstance(raw_message, dict):
+        for msg_part in raw_message.get("message", ()):
+            if msg_part.get("type") != "text":
+                continue
+            matched = _text_starts_with(msg_part.get("data", {}).get("text", ""), trigger)
+            if matched is not None:
+                return matched
+    return False
+
+def _text_starts_with(text: str, trigger: str) -> Optional[bool]:
+    """
+    判断文本去掉开头空白后是否以指令开头，只检查开头一小段，避免复制整段长文本
+    
+    参数:
+        text (str): 文本
+        trigger (str): 指令前缀
+    
+    返回:
+        Optional[bool]: 文本全为空白时为None
+    """
+    window = text[:64]
+    stripped = window.lstrip()
+    if stripped:
+        return text.startswith(trigger, len(window) - len(stripped))
+    stripped = text.lstrip()
+    return stripped.startswith(trigger) if stripped else None
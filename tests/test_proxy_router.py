@@ -0,0 +1,17 @@
+import asyncio
+
+from ImgRevSearcher.utils.proxy_router import ProxyRouter
+
+
+def test_select_falls_back_to_down_proxy_when_others_excluded():
+    router = ProxyRouter(routes={"bing": "http://a:1,http://b:2"}, failure_threshold=1, cooldown=60)
+    router.report_failure("http://b:2", ConnectionError("refused"))
+    chosen = asyncio.run(router.select("bing", exclude={"http://a:1"}))
+    assert chosen == "http://b:2"
+
+
+def test_select_falls_back_to_first_candidate_when_none_down():
+    router = ProxyRouter(routes={"bing": "direct,http://a:1"}, failure_threshold=2, cooldown=60)
+    router.report_failure("http://a:1", ConnectionError("refused"))
+    chosen = asyncio.run(router.select("bing", exclude={"direct", "http://a:1"}))
+    assert chosen == "direct"